@@ -0,0 +1,47 @@
+#!/bin/bash
+# Optional shared aria2c daemon. Sourced by the entrypoints when ARIA2_RPC=true; every job then
+# queues its downloads on it over JSON-RPC (--aria-rpc), so queueing, connection and bandwidth
+# limits are host-wide and unfinished downloads survive restarts through the saved session.
+#
+# Settings:
+#   ARIA2_RPC_PORT           RPC port (default 6800)
+#   ARIA2_RPC_SECRET         RPC secret (random per container start if unset)
+#   ARIA2_MAX_CONCURRENT     downloads running at once across all jobs (default 16)
+#   ARIA2_MAX_OVERALL_LIMIT  total bandwidth cap, e.g. 20M (default 0 = unlimited)
+#   ARIA_CONNECTIONS         connections per server (default 16)
+#   ARIA2_RUN_AS             user to run the daemon as
+
+if [ "${ARIA2_RPC:-false}" = "true" ] && command -v aria2c > /dev/null; then
+    ARIA2_RPC_PORT=${ARIA2_RPC_PORT:-6800}
+    export ARIA2_RPC_URL="http://localhost:${ARIA2_RPC_PORT}"
+    if [ -z "${ARIA2_RPC_SECRET:-}" ]; then
+        ARIA2_RPC_SECRET=$(head -c 16 /dev/urandom | od -An -tx1 | tr -d ' \n')
+    fi
+    export ARIA2_RPC_SECRET
+
+    ARIA2_DIR="${CONFIG_DIR:-/config}/aria2"
+    mkdir -p "$ARIA2_DIR"
+    touch "$ARIA2_DIR/session"
+    [ -n "${ARIA2_RUN_AS:-}" ] && chown -R "$ARIA2_RUN_AS" "$ARIA2_DIR"
+
+    ${ARIA2_RUN_AS:+runuser -u "$ARIA2_RUN_AS" --} aria2c \
+        --daemon=true \
+        --enable-rpc=true \
+        --rpc-listen-all=false \
+        --rpc-listen-port="$ARIA2_RPC_PORT" \
+        --rpc-secret="$ARIA2_RPC_SECRET" \
+        --input-file="$ARIA2_DIR/session" \
+        --save-session="$ARIA2_DIR/session" \
+        --save-session-interval=30 \
+        --max-concurrent-downloads="${ARIA2_MAX_CONCURRENT:-16}" \
+        --max-connection-per-server="${ARIA_CONNECTIONS:-16}" \
+        --max-overall-download-limit="${ARIA2_MAX_OVERALL_LIMIT:-0}" \
+        --max-download-result=10000 \
+        --continue=true \
+        --log="$ARIA2_DIR/aria2.log" \
+        --log-level=warn
+
+    echo "aria2 RPC daemon: $ARIA2_RPC_URL (max ${ARIA2_MAX_CONCURRENT:-16} downloads)"
+elif [ "${ARIA2_RPC:-false}" = "true" ]; then
+    echo "WARNING: ARIA2_RPC=true but aria2c is not installed"
+fi
@@ -36,6 +36,9 @@ case "$EXTRA" in *--remote-debugging-port=* ) :;; *) EXTRA="$EXTRA --remote-debu
 case "$EXTRA" in *--disk-cache-dir=* ) :;; *) EXTRA="$EXTRA --disk-cache-dir=/tmp/chrome-cache-$$";; esac
 export CHROME_EXTRA_ARGS="$EXTRA"
 
+# Shared aria2c daemon for --aria-rpc (only when ARIA2_RPC=true)
+. /app/docker/aria2-daemon.sh
+
 # If container was started with arguments, pass them straight to the app
 if [[ "$#" -gt 0 ]]; then
   exec python3 main.py "$@"
@@ -56,5 +59,6 @@ ARGS=()
 [[ -n "${SERVER:-}"    ]] && ARGS+=( --server "${SERVER}" )
 [[ "${NO_SUBTITLES:-false}" == "true" ]] && ARGS+=( --no-subtitles )
 [[ "${ARIA:-false}" == "true" ]] && ARGS+=( --aria )
+[[ "${ARIA2_RPC:-false}" == "true" ]] && ARGS+=( --aria-rpc )
 
 exec python3 main.py "${ARGS[@]}"
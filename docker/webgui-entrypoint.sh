@@ -41,6 +41,9 @@ else
     echo "Basic authentication: DISABLED"
 fi
 
+# Shared aria2c daemon for --aria-rpc (only when ARIA2_RPC=true)
+ARIA2_RUN_AS=app . /app/docker/aria2-daemon.sh
+
 echo "======================================"
 
 # Switch to app user and run the FastAPI application
@@ -1,6 +1,11 @@
 import os
+from typing import Any
+
 from yt_dlp import YoutubeDL
 
+from tools.aria2_rpc import Aria2RpcDownloader, Aria2RpcError
+from tools.ytdlp_options import downloader_options, tuning_options
+
 
 class GeneralExtractor:
     def __init__(self, args):
@@ -17,27 +22,49 @@ class GeneralExtractor:
             ),
         )
 
-    @staticmethod
-    def yt_dlp_download(url: str, location: str, name: str):
+    def yt_dlp_download(self, url: str, location: str, name: str):
         os.makedirs(location, exist_ok=True)
         yt_dlp_options = {
             "no_warnings": False,
             "quiet": False,
             "outtmpl": location + os.sep + name + ".mp4",
             "format": "bv*+ba/best",
-            "fragment_retries": 10,
-            "retries": 10,
-            "socket_timeout": 60,
-            "sleep_interval_requests": 1,
+            **tuning_options(self.args),
             "force_keyframes_at_cuts": True,
             # "allow_unplayable_formats": True,  # Disable this for now
             "merge_output_format": "mp4",
             "keepvideo": True,
+            **downloader_options(self.args),
         }
 
         if os.path.exists("cookies.txt"):
             print("Using local cookies")
             yt_dlp_options["cookies"] = "cookies.txt"
 
+        if getattr(self.args, "aria_rpc", False) and self.submit_to_aria2(url, yt_dlp_options):
+            return
+
         with YoutubeDL(yt_dlp_options) as ydl:
             ydl.download([url])
+
+    @staticmethod
+    def submit_to_aria2(url: str, yt_dlp_options: dict[str, Any]) -> bool:
+        """
+        Resolve ``url`` with yt-dlp and queue the file on the shared aria2 daemon.
+
+        The configured format is kept: only a single-file HTTP selection can be handed over, so
+        this returns ``False`` (download with yt-dlp) when it picked separate video and audio
+        streams to merge or a streaming protocol.
+        """
+        with YoutubeDL(yt_dlp_options) as ydl:
+            info = ydl.extract_info(url, download=False)
+            if not info or info.get("requested_formats") or info.get("protocol") not in ("http", "https"):
+                return False
+            location = ydl.prepare_filename(info)
+
+        try:
+            Aria2RpcDownloader(progress=print).download_file(info["url"], info.get("http_headers") or {}, location)
+        except Aria2RpcError as e:
+            print(f"{e}, downloading with yt-dlp")
+            return False
+        return True
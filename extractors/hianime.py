@@ -1,36 +1,123 @@
 import json
 import os
+import resource
 import sys
 import time
 import shlex
 import threading
 import tempfile
 from argparse import Namespace
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import asdict, dataclass
-from glob import glob
-from typing import Any
+from typing import Any, Callable
 from urllib.parse import urljoin
 
 import requests
 from bs4 import BeautifulSoup, Tag
 from colorama import Fore
-from langdetect import detect as detect_lang
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium import webdriver as selenium_webdriver
 from selenium_stealth import stealth
 from seleniumwire import webdriver
 from selenium.webdriver.chrome.service import Service
 from yt_dlp import YoutubeDL
 
-from tools.functions import get_conformation, get_int_in_range, safe_remove
+from extractors.hianime_resolver import HianimeHttpResolver, ResolverError
+from tools.aria2_rpc import Aria2RpcDownloader, Aria2RpcError
+from tools.browser_slots import BrowserSlots, RssSampler, process_tree_rss_mb
+from tools.capture import CapturePolicy, CaptureWindow, SnifferRequestFeed, WireRequestFeed
+from tools.blocklist import DEFAULT_BLOCKED_TYPES, Blocklist
+from tools.cdp import CdpConnection, CdpError, CdpNetworkSniffer, CdpRequestBlocker, CdpTab
+from tools.driver_pool import DriverPool
+from tools.functions import get_conformation, get_int_in_range
+from tools.hls import Variant, parse_master_playlist, select_variant
+from tools.hls_downloader import HlsDownloader, HlsDownloadError, format_size
+from tools.media_check import check_download
+from tools.pacing import shared_pacer, status_from_error
+from tools.http_client import shared_client
+from tools.journal import JobJournal
+from tools.pipeline import Pipeline, workers_for_memory
+from tools.resume import clear_state, discard_download, load_state, save_state
+from tools.retry import RetryPolicy, RetryScheduler
+from tools.stream_cache import CACHED_FIELDS, StreamCache
+from tools.subtitles import SubtitleLanguageCache
+from tools.tab_pool import TabPool
+from tools.temp_dirs import make_temp_dir, purge_stale_dirs, remove_temp_dir
 from tools.YTDLogger import YTDLogger
+from tools.ytdlp_options import describe_profile, downloader_options, tuning_options
 
 # Thread-safe print lock for parallel processing
 print_lock = threading.Lock()
 
+# Play controls of the players the site embeds, most specific first
+PLAY_SELECTORS = [
+    "button.jw-icon-play",
+    ".vjs-big-play-button",
+    ".plyr__control--overlaid",
+    "button[aria-label*='play' i]",
+    ".play-button",
+    "video",
+]
+
+# One round trip per poll: the first matching play control, scrolled into view, or null
+PROBE_PLAY_SCRIPT = """
+    for (const selector of arguments[0]) {
+        const element = document.querySelector(selector);
+        if (element) {
+            element.scrollIntoView({block: 'center'});
+            return [selector, element];
+        }
+    }
+    return null;
+"""
+
+PLAY_VIDEOS_SCRIPT = """
+    document.querySelectorAll('video').forEach(v => {
+        try {
+            v.muted = true;
+            v.play();
+        } catch(e) {}
+    });
+"""
+
+# The probe for tabs driven over DevTools: [selector, x, y] of the first play control, or null
+PROBE_PLAY_POINT_SCRIPT = """
+    (selectors => {
+        for (const selector of selectors) {
+            const element = document.querySelector(selector);
+            if (element) {
+                element.scrollIntoView({block: 'center'});
+                const rect = element.getBoundingClientRect();
+                return [selector, rect.left + rect.width / 2, rect.top + rect.height / 2];
+            }
+        }
+        return null;
+    })(%s)
+""" % json.dumps(PLAY_SELECTORS)
+
+# Where the player iframe sits in the page, to turn a point inside it into page coordinates
+FRAME_OFFSET_SCRIPT = """
+    (() => {
+        const frame = document.querySelector('iframe');
+        if (!frame) return null;
+        const rect = frame.getBoundingClientRect();
+        return [rect.left, rect.top];
+    })()
+"""
+
+# What chromedriver's options and execute_script set up in a driver, for tabs opened over DevTools
+TAB_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    window.alert = function() {};
+    window.confirm = function() { return true; };
+    window.prompt = function() { return null; };
+    window.open = function() { return null; };
+"""
+TAB_DEVICE_METRICS = {"width": 375, "height": 812, "deviceScaleFactor": 3, "mobile": True}
+
 # Whitelist of allowed Chrome arguments for CHROME_EXTRA_ARGS
 ALLOWED_CHROME_ARGS = {
     '--headless', '--disable-gpu', '--no-sandbox', '--disable-dev-shm-usage',
@@ -118,7 +205,7 @@ class HianimeExtractor:
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.11 (KHTML, like Gecko) Chrome/123 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Charset": "ISO-8859-1,utf-8;q=0.7,*;q=0.3",
-            "Accept-Encoding": "identity",
+            "Accept-Encoding": "gzip, deflate, br",
             "Accept-Language": "en-US,en;q=0.8",
             "Connection": "keep-alive",
         }
@@ -134,6 +221,25 @@ class HianimeExtractor:
         # make it a little more patient
         self.DOWNLOAD_ATTEMPT_CAP: int = 60
         self.DOWNLOAD_REFRESH: tuple[int, int] = (20, 40)
+        # recycle pooled drivers after this many episode pages
+        self.DRIVER_MAX_PAGES: int = 10
+        # with --resolve-mode tabs: tabs at a time by default, tabs per browser before it is
+        # recycled, and how long a tab may take to reach DOMContentLoaded
+        self.TAB_WORKERS: int = 8
+        self.TAB_BROWSER_MAX_TABS: int = 50
+        self.TAB_LOAD_TIMEOUT: float = 30
+        # when the capture of an episode page gives up, stops waiting for subtitles or refreshes
+        self.capture_policy = CapturePolicy(
+            deadline=getattr(self.args, "capture_deadline", None) or 60.0,
+            subtitle_grace=getattr(self.args, "subtitle_grace", 5.0),
+            idle_refresh=getattr(self.args, "capture_idle_refresh", None) or 15.0,
+        )
+        # longest wait for the player iframe and for its play control, and how often they are checked
+        self.PLAYER_TIMEOUT: float = 10
+        self.PLAYER_POLL: float = 0.2
+        # selenium-wire only records manifests and subtitles, in memory and at most this many
+        self.CAPTURE_SCOPES: list[str] = [r"(?i)\.m3u8", r"(?i)\.vtt"]
+        self.CAPTURE_STORAGE_MAX: int = 200
         self.BAD_TITLE_CHARS: list[str] = [
             "-", ".", "/", "\\", "?", "%", "*", "<", ">", "|", '"', "[", "]", ":",
         ]
@@ -142,25 +248,110 @@ class HianimeExtractor:
         # holders
         self.captured_video_urls: list[str] = []
         self.captured_subtitle_urls: list[str] = []
+        self.driver_pool: DriverPool | None = None
+        self.tab_pool: TabPool | None = None
+        self.pipeline: Pipeline | None = None
+        # per-season journal of episode results, the season JSON is rebuilt from it
+        self.journal: JobJournal | None = None
+        self.summary: tuple[str, dict[str, Any], list[dict]] | None = None  # (path, header, episodes)
+        # failed episodes go back to the end of the queue with exponential backoff
+        self.retries = RetryScheduler(
+            RetryPolicy(
+                attempts=1 + getattr(self.args, "episode_retries", 2),
+                backoff=getattr(self.args, "retry_backoff", 30.0),
+                deadline=getattr(self.args, "episode_deadline", 3600.0),
+                budget=getattr(self.args, "retry_budget", 20),
+            )
+        )
+        # browsers of every job on this host share one limit derived from the available memory
+        self.browser_slots = BrowserSlots(capacity=getattr(self.args, "browser_slots", None))
+        # episode a resolver thread is starting a browser for, named while it waits for a slot
+        self.resolving = threading.local()
+        # pooled keep-alive client shared by every non-browser request
+        self.http = shared_client()
+        # per-host request rate shared by the HTTP client, yt-dlp and the browser workers
+        self.pacer = shared_pacer()
+        # every subtitle URI is downloaded and language-checked once per run
+        self.subtitle_languages = SubtitleLanguageCache(self.fetch_subtitle, self.ENCODING)
+
+        # "drivers" gives every resolver a browser of its own, "tabs" runs the resolvers as
+        # isolated tabs of one shared browser
+        self.resolve_mode: str = getattr(self.args, "resolve_mode", None) or "drivers"
+
+        # "wire" captures through the selenium-wire proxy, "cdp" streams DevTools network events;
+        # tabs always capture over DevTools, the proxy cannot tell which tab a request came from
+        self.capture_backend: str = (
+            "cdp" if self.resolve_mode == "tabs" else getattr(self.args, "capture_backend", None) or "wire"
+        )
+        self.sniffers: dict[str, CdpNetworkSniffer] = {}
+        self.sniffers_lock = threading.Lock()
+        # browsers of this job that are running, and what they cost, to compare the resolve modes
+        self.browsers: list[webdriver.Chrome] = []
+        self.browser_rss = RssSampler(self.browser_pids)
+        # (started, finished) of every episode resolved in a browser
+        self.browser_resolves: list[tuple[float, float]] = []
+
+        # ads, trackers, images and fonts are never requested by the browsers
+        block_types = getattr(self.args, "block_types", None)
+        self.blocklist: Blocklist | None = (
+            Blocklist(
+                patterns=getattr(self.args, "block_patterns", None) or (),
+                resource_types=DEFAULT_BLOCKED_TYPES if block_types is None else block_types,
+            )
+            if getattr(self.args, "block_requests", True)
+            else None
+        )
+        self.blockers: dict[str, CdpRequestBlocker] = {}
+        # blocked requests per host of browsers that already quit
+        self.blocked_by_host: dict[str, int] = {}
+
+        # "browser" always loads the episode page, "http" only uses the AJAX endpoints,
+        # "auto" tries HTTP first and falls back to the browser
+        self.resolver: str = getattr(self.args, "resolver", None) or "auto"
+        self.http_resolver = HianimeHttpResolver(self.URL, self.HEADERS, self.http)
+
+        # variant selection policy for HLS master playlists
+        self.quality: str = getattr(self.args, "quality", None) or "best"
+        max_bitrate = getattr(self.args, "max_bitrate", None)
+        self.max_bitrate: int | None = max_bitrate * 1000 if max_bitrate else None
+
+        # "yt-dlp" downloads through hlsnative, "native" fetches segments concurrently with HlsDownloader
+        self.engine: str = getattr(self.args, "engine", None) or "yt-dlp"
+        self.hls_downloader = HlsDownloader(
+            self.http,
+            workers=getattr(self.args, "hls_concurrency", None) or 8,
+            progress=self.print_hls_progress,
+            quality=self.quality,
+            max_bitrate=self.max_bitrate,
+        )
 
-    def process_single_episode(self, episode: dict, anime: Anime, folder: str) -> dict:
+        # with --aria-rpc every download is queued on the shared aria2c daemon instead
+        self.aria2: Aria2RpcDownloader | None = (
+            Aria2RpcDownloader(progress=self.print_hls_progress) if getattr(self.args, "aria_rpc", False) else None
+        )
+
+        # resolved streams are reused across runs until they expire or stop working
+        cache_ttl = getattr(self.args, "stream_cache_ttl", None)
+        cache_ttl = 6 * 3600 if cache_ttl is None else cache_ttl
+        self.stream_cache: StreamCache | None = StreamCache(ttl=cache_ttl) if cache_ttl > 0 else None
+
+    def resolve_episode(self, episode: dict, anime: Anime, folder: str) -> bool:
         """
-        Process a single episode: find stream, download video and subtitles.
-        Designed for parallel execution - each episode runs in its own thread with its own driver.
+        Resolver stage: find the stream of an episode from an interrupted download, the cache,
+        over HTTP or in a pooled browser.
 
         Args:
-            episode: Episode dict with url, number, title
+            episode: Episode dict with url, number, title; updated with the media URLs and status
             anime: Anime metadata
             folder: Output folder path
 
         Returns:
-            Updated episode dict with media URLs and download status
+            ``True`` when a stream was found and the episode should be downloaded
         """
         url = episode["url"]
         number = episode["number"]
         title = episode["title"]
 
-        driver = None
         try:
             # Thread-safe output
             with print_lock:
@@ -172,92 +363,58 @@ class HianimeExtractor:
                     + Fore.LIGHTWHITE_EX
                 )
 
-            # Create dedicated driver for this episode
-            driver = self.create_driver()
-
-            # Navigate and find stream
-            driver.requests.clear()
-            driver.get(url)
-            driver.execute_script("window.focus();")
-
-            # Aggressive player initialization to trigger stream loading
-            time.sleep(2)
+            media_requests = self.interrupted_stream(episode, f"{folder}{self.episode_name(anime, episode)}.mp4")
+            if media_requests is None:
+                media_requests = self.cached_stream(episode, anime)
+            from_cache = media_requests is not None
 
-            # Scroll to trigger lazy-loaded players
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-            time.sleep(0.5)
+            if media_requests is None and self.resolver in ("http", "auto"):
+                media_requests = self.resolve_over_http(episode, anime)
 
-            try:
-                # Try multiple times with delays to handle async player loading
-                for attempt in range(3):
-                    iframes = driver.find_elements(By.TAG_NAME, "iframe")
-                    if iframes:
-                        driver.switch_to.frame(iframes[0])
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight / 2);")
-
-                    # Extended selector list for different player types
-                    selectors = [
-                        "button.jw-icon-play",
-                        ".vjs-big-play-button",
-                        ".plyr__control--overlaid",
-                        "button[aria-label*='play' i]",
-                        "button[aria-label*='Play' i]",
-                        ".play-button",
-                        "video"
-                    ]
-
-                    clicked = False
-                    for sel in selectors:
-                        els = driver.find_elements(By.CSS_SELECTOR, sel)
-                        if els:
-                            try:
-                                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", els[0])
-                                time.sleep(0.3)
-                                els[0].click()
-                                clicked = True
-                                with print_lock:
-                                    print(f"{Fore.LIGHTYELLOW_EX}Clicked play button: {sel}")
-                                break
-                            except Exception:
-                                try:
-                                    driver.execute_script("arguments[0].click();", els[0])
-                                    clicked = True
-                                    with print_lock:
-                                        print(f"{Fore.LIGHTYELLOW_EX}JS clicked play button: {sel}")
-                                    break
-                                except Exception:
-                                    pass
-
-                    # Always try to programmatically play video too
-                    driver.execute_script("""
-                        const videos = document.querySelectorAll('video');
-                        videos.forEach(v => {
-                            try {
-                                v.muted = true;
-                                v.play();
-                            } catch(e) {}
-                        });
-                    """)
-
-                    if clicked or attempt > 0:
-                        break
-
-                    time.sleep(1)
-
-            finally:
-                driver.switch_to.default_content()
-
-            # Capture media requests using driver-specific method
-            media_requests = self.capture_media_requests_from_driver(driver)
+            if media_requests is None and self.resolver != "http":
+                wait_start = time.monotonic()
+                self.resolving.number = number
+                if self.tab_pool:
+                    # A fresh tab in the shared browser (started on first use), closed afterwards
+                    with self.tab_pool.tab() as tab:
+                        with print_lock:
+                            print(
+                                f"{Fore.LIGHTCYAN_EX}Episode {number}: Browser ready in "
+                                f"{time.monotonic() - wait_start:.2f}s (new tab)"
+                            )
+                        media_requests = self.find_stream_in_tab(tab, url, number)
+                else:
+                    # Borrow a warm driver from the pool (created on a miss, reset and returned afterwards)
+                    with self.driver_pool.driver() as driver:
+                        with print_lock:
+                            print(
+                                f"{Fore.LIGHTCYAN_EX}Episode {number}: Browser ready in "
+                                f"{time.monotonic() - wait_start:.2f}s"
+                            )
+                        media_requests = self.find_stream(driver, url, number)
+
+                if media_requests:
+                    with self.sniffers_lock:
+                        self.browser_resolves.append((wait_start, time.monotonic()))
+                    with print_lock:
+                        print(
+                            f"{Fore.LIGHTCYAN_EX}Episode {number}: m3u8 captured after "
+                            f"{media_requests.get('time_to_m3u8', 0):.2f}s ({self.capture_backend} backend, "
+                            f"{media_requests.get('requests_examined', 0)} requests examined)"
+                        )
 
             if not media_requests:
                 with print_lock:
                     print(f"{Fore.LIGHTRED_EX}Episode {number}: No m3u8 file found, skipping download")
                 episode["status"] = "failed"
                 episode["error"] = "No stream found"
-                return episode
+                return False
+
+            if self.stream_cache and not from_cache:
+                self.stream_cache.put(url, self.args.server, anime.download_type, media_requests)
 
             episode.update(media_requests)
+            episode["from_cache"] = from_cache
             episode["status"] = "stream_found"
 
         except Exception as e:
@@ -265,18 +422,29 @@ class HianimeExtractor:
                 print(f"{Fore.LIGHTRED_EX}Episode {number}: Error finding stream: {e}")
             episode["status"] = "failed"
             episode["error"] = str(e)
-            return episode
-        finally:
-            # Clean up driver
-            if driver:
-                try:
-                    driver.quit()
-                except Exception:
-                    pass
+            return False
+
+        with print_lock:
+            print(f"{Fore.LIGHTCYAN_EX}Episode {number}: Stream found, queued for download")
+        return True
+
+    def download_episode(self, episode: dict, anime: Anime, folder: str) -> bool:
+        """
+        Downloader stage: download the video and subtitles of a resolved episode into ``folder``.
+
+        Args:
+            episode: Episode dict updated by :meth:`resolve_episode`; its status is set here
+            anime: Anime metadata
+            folder: Output folder path
+
+        Returns:
+            ``False`` when the video could not be downloaded
+        """
+        number = episode["number"]
+        from_cache = episode.pop("from_cache", False)
 
-        # Download video immediately after finding stream
         try:
-            name = f"{anime.name} - s{anime.season_number:02}e{number:02} - {title}"
+            name = self.episode_name(anime, episode)
             m3u8_url = episode.get("m3u8")
             headers = episode.get("headers") or {}
 
@@ -284,26 +452,46 @@ class HianimeExtractor:
                 with print_lock:
                     print(f"{Fore.LIGHTRED_EX}Episode {number}: No M3U8 URL found")
                 episode["status"] = "failed"
-                return episode
+                episode["error"] = "No M3U8 URL found"
+                return False
+
+            # the resolved stream is kept with the download checkpoint, so a restarted job can resume
+            location = f"{folder}{name}.mp4"
+            save_state(
+                location,
+                url=episode["url"],
+                **{key: episode[key] for key in CACHED_FIELDS if episode.get(key) is not None},
+            )
 
+            stream = self.look_for_variants(m3u8_url, headers)
             with print_lock:
+                if isinstance(stream, dict) and stream.get("format_note"):
+                    print(f"{Fore.LIGHTCYAN_EX}Episode {number}: Selected variant {stream['format_note']}")
                 print(f"{Fore.LIGHTCYAN_EX}Episode {number}: Starting download...")
 
-            result = self.yt_dlp_download(
-                self.look_for_variants(m3u8_url, headers),
-                headers,
-                f"{folder}{name}.mp4",
-            )
+            stats = self.download_video(stream, headers, f"{folder}{name}.mp4")
 
-            if not result:
+            if stats is None:
+                if from_cache:
+                    # the cached stream no longer works, resolve it again on the next run
+                    self.stream_cache.evict(episode["url"], self.args.server, anime.download_type)
                 episode["status"] = "failed"
                 episode["error"] = "Download failed"
-                return episode
+                return False
+
+            clear_state(location)
+
+            # recorded in the season JSON so --skip-existing can verify the file on later runs
+            if os.path.exists(f"{folder}{name}.mp4"):
+                episode["filesize"] = os.path.getsize(f"{folder}{name}.mp4")
+            episode["duration"] = (
+                round(stats["duration"], 3) if "duration" in stats else self.playlist_duration(stream, headers)
+            )
 
             # Download subtitles if available
             vtt_url = episode.get("vtt")
             if vtt_url:
-                self.yt_dlp_download(vtt_url, headers, f"{folder}{name}.vtt")
+                self.download_subtitle(vtt_url, headers, f"{folder}{name}.vtt")
             elif not self.args.no_subtitles:
                 with print_lock:
                     print(f"{Fore.LIGHTYELLOW_EX}Episode {number}: No VTT stream found")
@@ -311,16 +499,230 @@ class HianimeExtractor:
             episode["status"] = "completed"
             with print_lock:
                 print(f"{Fore.LIGHTGREEN_EX}Episode {number}: Download completed!")
+            return True
 
         except Exception as e:
             with print_lock:
                 print(f"{Fore.LIGHTRED_EX}Episode {number}: Download error: {e}")
             episode["status"] = "failed"
             episode["error"] = str(e)
+            return False
+
+    def interrupted_stream(self, episode: dict, location: str) -> dict[str, Any] | None:
+        """Stream saved with the checkpoint of an interrupted download of this episode, if it still works."""
+        state = load_state(location)
+        if not state or state.get("url") != episode["url"] or not state.get("m3u8"):
+            return None
+
+        number = episode["number"]
+        stream = {key: state[key] for key in CACHED_FIELDS if key in state}
+        problem = self.validate_stream(stream)
+        if problem:
+            with print_lock:
+                print(f"{Fore.LIGHTYELLOW_EX}Episode {number}: Saved stream no longer usable ({problem})")
+            return None
+
+        if self.args.no_subtitles:
+            stream.pop("vtt", None)
+        progress = f" at fragment {state['completed']}/{state['segments']}" if state.get("segments") else ""
+        with print_lock:
+            print(f"{Fore.LIGHTCYAN_EX}Episode {number}: Resuming interrupted download{progress}")
+        return stream
+
+    def cached_stream(self, episode: dict, anime: Anime) -> dict[str, Any] | None:
+        """Stream cached by an earlier run for this episode, if it is still fresh and playable."""
+        if not self.stream_cache:
+            return None
+
+        number = episode["number"]
+        cached = self.stream_cache.get(episode["url"], self.args.server, anime.download_type)
+        if not cached:
+            return None
+
+        problem = self.validate_stream(cached)
+        if problem:
+            self.stream_cache.evict(episode["url"], self.args.server, anime.download_type)
+            with print_lock:
+                print(f"{Fore.LIGHTYELLOW_EX}Episode {number}: Cached stream discarded ({problem})")
+            return None
+
+        if self.args.no_subtitles:
+            cached.pop("vtt", None)
+        with print_lock:
+            print(f"{Fore.LIGHTCYAN_EX}Episode {number}: Reusing cached stream")
+        return cached
+
+    def validate_stream(self, streams: dict[str, Any]) -> str | None:
+        """Check that a cached manifest still answers with a playlist; returns the problem, if any."""
+        try:
+            response = self.http.get(streams["m3u8"], headers=streams.get("headers") or {}, timeout=10)
+        except requests.RequestException as e:
+            return f"request failed: {e}"
+        if response.status_code in (403, 410):
+            return f"HTTP {response.status_code}, link expired"
+        if not response.ok:
+            return f"HTTP {response.status_code}"
+        if not response.text.lstrip().startswith("#EXTM3U"):
+            return "response is not an HLS playlist"
+        return None
+
+    def resolve_over_http(self, episode: dict, anime: Anime) -> dict[str, Any] | None:
+        """Resolve an episode through the site's AJAX endpoints; ``None`` when the browser is needed."""
+        number = episode["number"]
+        started = time.monotonic()
+        try:
+            media_requests = self.http_resolver.resolve(episode["url"], anime.download_type, self.args.server)
+        except ResolverError as e:
+            with print_lock:
+                fallback = ", falling back to browser" if self.resolver == "auto" else ""
+                print(f"{Fore.LIGHTYELLOW_EX}Episode {number}: HTTP resolver failed ({e}){fallback}")
+            return None
+
+        if self.args.no_subtitles:
+            media_requests.pop("vtt", None)
+        media_requests["time_to_m3u8"] = round(time.monotonic() - started, 2)
+        with print_lock:
+            print(
+                f"{Fore.LIGHTCYAN_EX}Episode {number}: m3u8 resolved over HTTP in "
+                f"{media_requests['time_to_m3u8']:.2f}s (server {media_requests['server']})"
+            )
+        return media_requests
+
+    def find_stream(self, driver: webdriver.Chrome, url: str, number: int | None = None) -> dict[str, Any] | None:
+        """Load an episode page in ``driver``, start the player and capture its media requests."""
+        self.clear_captured_requests(driver)
+        self.pacer.wait(url)
+        blocked_before = self.blocked_requests(driver)
+        started = time.monotonic()
+        # returns at DOMContentLoaded (eager page load strategy), the player is waited for below
+        driver.get(url)
+        page_loaded = time.monotonic()
+        driver.execute_script("window.focus(); window.scrollTo(0, document.body.scrollHeight / 2);")
+
+        selector = None
+        try:
+            selector = self.trigger_player(driver)
+        finally:
+            driver.switch_to.default_content()
+
+        played = time.monotonic()
+        blocked = self.blocked_requests(driver) - blocked_before
+        self.print_page_loaded(number, page_loaded - started, selector, played - page_loaded, blocked)
+
+        media_requests = self.capture_media_requests_from_driver(driver, started, number)
+        return self.add_page_timings(url, media_requests, page_loaded - started, played - page_loaded, blocked)
+
+    def find_stream_in_tab(self, tab: CdpTab, url: str, number: int | None = None) -> dict[str, Any] | None:
+        """:meth:`find_stream` in a fresh tab of the shared browser."""
+        self.pacer.wait(url)
+        started = time.monotonic()
+        tab.navigate(url, timeout=self.TAB_LOAD_TIMEOUT)
+        page_loaded = time.monotonic()
+        tab.evaluate("window.focus(); window.scrollTo(0, document.body.scrollHeight / 2);")
+
+        selector = self.trigger_player_in_tab(tab)
+        played = time.monotonic()
+        self.print_page_loaded(number, page_loaded - started, selector, played - page_loaded, tab.blocked)
+
+        media_requests = self.capture_media(SnifferRequestFeed(tab), tab.reload, started, number)
+        return self.add_page_timings(url, media_requests, page_loaded - started, played - page_loaded, tab.blocked)
+
+    def print_page_loaded(
+        self, number: int | None, load_seconds: float, selector: str | None, play_seconds: float, blocked: int
+    ) -> None:
+        with print_lock:
+            print(
+                f"{Fore.LIGHTCYAN_EX}Episode {number}: Page loaded in {load_seconds:.2f}s, "
+                + (f"play clicked ({selector})" if selector else "no play button found")
+                + f" {play_seconds:.2f}s later"
+                + (f", {blocked} requests blocked" if self.blocklist else "")
+            )
+
+    def add_page_timings(
+        self,
+        url: str,
+        media_requests: dict[str, Any] | None,
+        load_seconds: float,
+        play_seconds: float,
+        blocked: int,
+    ) -> dict[str, Any] | None:
+        if media_requests:
+            # the page answered normally, only a working stream is a reliable sign of that
+            self.pacer.observe(url, 200)
+            media_requests["page_load"] = round(load_seconds, 2)
+            media_requests["time_to_play"] = round(play_seconds, 2)
+            if self.blocklist:
+                media_requests["requests_blocked"] = blocked
+        return media_requests
+
+    def trigger_player(self, driver: webdriver.Chrome) -> str | None:
+        """
+        Wait for the player, click its play control and start every video; returns the selector clicked.
+
+        All selectors are probed in one script per poll instead of a ``find_elements`` round trip
+        (and implicit wait) each. Both waits give up after ``PLAYER_TIMEOUT`` seconds.
+        """
+        wait = WebDriverWait(driver, self.PLAYER_TIMEOUT, poll_frequency=self.PLAYER_POLL)
+        try:
+            wait.until(EC.frame_to_be_available_and_switch_to_it((By.TAG_NAME, "iframe")))
+        except TimeoutException:
+            pass  # the player may sit in the page itself
+
+        try:
+            selector, element = wait.until(lambda d: d.execute_script(PROBE_PLAY_SCRIPT, PLAY_SELECTORS))
+        except TimeoutException:
+            selector = element = None
+
+        if element is not None:
+            try:
+                element.click()
+            except WebDriverException:
+                try:
+                    driver.execute_script("arguments[0].click();", element)
+                except WebDriverException:
+                    selector = None
 
-        return episode
+        # Always try to programmatically play video too
+        driver.execute_script(PLAY_VIDEOS_SCRIPT)
+        return selector
+
+    def trigger_player_in_tab(self, tab: CdpTab) -> str | None:
+        """
+        :meth:`trigger_player` for a tab: the play control is probed in the player iframe's own
+        DevTools session and clicked with a real mouse event at its position in the page.
+        """
+        deadline = time.monotonic() + self.PLAYER_TIMEOUT
+        while not tab.frames() and time.monotonic() < deadline:
+            time.sleep(self.PLAYER_POLL)
+        # the player may sit in the page itself
+        frame = next(iter(tab.frames()), None)
+
+        deadline = time.monotonic() + self.PLAYER_TIMEOUT
+        hit = None
+        while True:
+            try:
+                hit = tab.evaluate(PROBE_PLAY_POINT_SCRIPT, frame)
+            except CdpError:
+                hit = None  # the frame is still being set up
+            if hit or time.monotonic() >= deadline:
+                break
+            time.sleep(self.PLAYER_POLL)
+
+        selector = None
+        if hit:
+            selector, x, y = hit
+            offset = tab.evaluate(FRAME_OFFSET_SCRIPT) if frame else [0, 0]
+            if offset:
+                tab.click(offset[0] + x, offset[1] + y)
+            else:
+                tab.evaluate(f"document.querySelector({json.dumps(selector)}).click()", frame)
+
+        # Always try to programmatically play video too
+        tab.evaluate(PLAY_VIDEOS_SCRIPT, frame)
+        return selector
 
     def run(self):
+        self.purge_browser_leftovers()
         anime: Anime | None = (
             self.get_anime_from_link(self.link)
             if self.link
@@ -407,19 +809,38 @@ class HianimeExtractor:
             anime.season_number = 1
             print(f"Defaulting to season number: {anime.season_number}")
 
-        # Create temporary driver to get episode URLs and server button
-        print(f"{Fore.LIGHTCYAN_EX}Initializing browser to fetch episode list...")
-        self.configure_driver()
-        self.driver.get(anime.url)
-        button: WebElement = self.find_server_button(anime)  # type: ignore
+        list_start = time.monotonic()
+        episode_list: list[dict] | None = None
+        if self.args.server:
+            # The server is already known, so the episode list can come straight from the AJAX endpoint
+            try:
+                episode_list = self.http_resolver.get_episode_list(anime.url, start_ep, end_ep)
+            except ResolverError as e:
+                print(f"{Fore.LIGHTYELLOW_EX}Could not fetch episode list over HTTP ({e}), using browser")
+
+        if episode_list is None:
+            # One browser session for server discovery, selection and the episode list
+            print(f"{Fore.LIGHTCYAN_EX}Initializing browser to fetch episode list...")
+            with self.browser_slots.slot(self.slot_owner(), on_wait=self.print_browser_queued):
+                self.configure_driver()
+                try:
+                    self.driver.get(anime.url)
+                    button = self.find_server_button(anime)
+
+                    if button:
+                        try:
+                            button.click()
+                        except Exception as e:
+                            print(f"{Fore.LIGHTRED_EX}Error clicking server button:\n\n{Fore.LIGHTWHITE_EX}{e}")
 
-        try:
-            button.click()
-        except Exception as e:
-            print(f"{Fore.LIGHTRED_EX}Error clicking server button:\n\n{Fore.LIGHTWHITE_EX}{e}")
+                    episode_list = self.get_episode_urls(self.driver.page_source, start_ep, end_ep)
+                finally:
+                    self.quit_driver(self.driver)  # Close listing driver, episode workers use the driver pool
 
-        episode_list: list[dict] = self.get_episode_urls(self.driver.page_source, start_ep, end_ep)
-        self.driver.quit()  # Close initial driver, parallel processing will create new ones
+        print(
+            f"{Fore.LIGHTCYAN_EX}Time to episode list: {time.monotonic() - list_start:.2f}s "
+            f"({len(episode_list)} episodes)"
+        )
 
         # Create output folder
         folder = (
@@ -430,51 +851,489 @@ class HianimeExtractor:
         )
         os.makedirs(folder, exist_ok=True)
 
-        print(f"\n{Fore.LIGHTGREEN_EX}Starting parallel processing of {len(episode_list)} episodes...")
-        print(f"{Fore.LIGHTCYAN_EX}Max concurrent operations: 3")
-        print()
+        season_file = f"{folder}{anime.name} (Season {anime.season_number})"
+        self.journal = JobJournal(f"{season_file}.journal.jsonl")
+        self.summary = (f"{season_file}.json", asdict(anime), episode_list)
 
-        # Process episodes in parallel with limit of 3 concurrent operations
-        max_workers = 3
-        completed_episodes = []
+        queued_episodes = self.skip_existing(episode_list, anime, folder) if self.args.skip_existing else episode_list
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all episodes for processing
-            future_to_episode = {
-                executor.submit(self.process_single_episode, episode, anime, folder): episode
-                for episode in episode_list
-            }
+        resolve_workers = self.resolve_workers()
+        download_workers = getattr(self.args, "download_workers", None) or 3
+        print(f"\n{Fore.LIGHTGREEN_EX}Starting parallel processing of {len(queued_episodes)} episodes...")
+        print(
+            f"{Fore.LIGHTCYAN_EX}Resolvers: {resolve_workers}"
+            + (" tabs in one browser" if self.resolve_mode == "tabs" else "")
+            + f", downloaders: {download_workers}"
+        )
+        if self.engine == "yt-dlp" and not self.aria2:
+            print(f"{Fore.LIGHTCYAN_EX}{describe_profile(self.args)}")
+        if self.pacer.enabled:
+            print(
+                f"{Fore.LIGHTCYAN_EX}Adaptive pacing: starting at {self.pacer.for_host(self.URL).rate:.1f} "
+                f"requests/s per host, at most {self.pacer.for_host(self.URL).max_rate:.1f}/s"
+            )
+        print()
 
-            # Process results as they complete
-            for future in as_completed(future_to_episode):
-                episode = future_to_episode[future]
-                try:
-                    result = future.result()
-                    completed_episodes.append(result)
-                except Exception as e:
-                    with print_lock:
-                        print(f"{Fore.LIGHTRED_EX}Episode {episode['number']} failed with exception: {e}")
-                    episode["status"] = "failed"
-                    episode["error"] = str(e)
-                    completed_episodes.append(episode)
+        if self.resolve_mode == "tabs":
+            # One browser hosts a tab per resolver, every episode gets a fresh isolated tab
+            self.tab_pool = TabPool(
+                factory=self.start_tab_browser,
+                open_tab=self.open_tab,
+                close_tab=self.close_tab,
+                dispose=self.quit_tab_browser,
+                tabs=resolve_workers,
+                max_uses=self.TAB_BROWSER_MAX_TABS,
+            )
+        else:
+            # Warm drivers are shared across episodes instead of cold-starting Chrome per episode
+            self.driver_pool = DriverPool(
+                factory=self.start_browser,
+                reset=self.reset_driver,
+                dispose=self.quit_driver,
+                max_size=resolve_workers,
+                max_uses=self.DRIVER_MAX_PAGES,
+            )
 
-        # Save metadata JSON with results
-        with open(f"{folder}{anime.name} (Season {anime.season_number}).json", "w") as json_file:
-            json.dump({**asdict(anime), "episodes": completed_episodes}, json_file, indent=4)
+        # Resolvers (browser/HTTP) and downloaders (network) run as separate stages, so
+        # the next episodes are resolved while earlier ones download
+        self.pipeline = Pipeline(
+            resolve=lambda episode: self.journaled("resolve", episode, self.resolve_episode, anime, folder),
+            download=lambda episode: self.journaled("download", episode, self.download_episode, anime, folder),
+            resolvers=resolve_workers,
+            downloaders=download_workers,
+            on_error=self.episode_failed,
+            retry=lambda episode, stage: self.retry_episode(episode, stage, anime, folder),
+            progress=self.print_pipeline_status,
+        )
+        self.browser_rss.start()
+        try:
+            self.pipeline.run(queued_episodes)
+        finally:
+            self.browser_rss.stop()
+            (self.tab_pool or self.driver_pool).close()
+            # on pause or cancel resolvers still hold drivers, which the pools cannot quit
+            self.quit_browsers()
+        completed_episodes = episode_list
+        self.write_summary()
 
         # Summary
         success_count = sum(1 for ep in completed_episodes if ep.get("status") == "completed")
-        failed_count = len(completed_episodes) - success_count
+        skipped_count = sum(1 for ep in completed_episodes if ep.get("status") == "skipped")
+        failed_count = len(completed_episodes) - success_count - skipped_count
 
         print()
         print(f"{Fore.LIGHTGREEN_EX}{'='*60}")
         print(f"{Fore.LIGHTGREEN_EX}Download Summary:")
         print(f"{Fore.LIGHTGREEN_EX}  Total episodes: {len(completed_episodes)}")
         print(f"{Fore.LIGHTGREEN_EX}  Successful: {success_count}")
+        if skipped_count > 0:
+            print(f"{Fore.LIGHTGREEN_EX}  Already downloaded: {skipped_count}")
         if failed_count > 0:
             print(f"{Fore.LIGHTRED_EX}  Failed: {failed_count}")
+        self.print_pipeline_stats()
+        self.print_driver_pool_stats()
+        self.print_tab_pool_stats()
+        self.print_resolve_benchmark()
+        if self.browser_slots.waits:
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Browser slots: waited {self.browser_slots.waits} times for "
+                f"{self.browser_slots.wait_seconds:.0f}s, {self.browser_slots.browser_mb():.0f} MiB per browser"
+            )
+        self.print_capture_stats(completed_episodes)
         print(f"{Fore.LIGHTGREEN_EX}{'='*60}")
 
+    def skip_existing(self, episodes: list[dict], anime: Anime, folder: str) -> list[dict]:
+        """
+        Mark episodes whose video is already in ``folder`` as skipped; returns the episodes still to do.
+
+        Existing files are checked against the size and playlist duration recorded by the run that
+        downloaded them (see :func:`check_download`); files that fail are deleted and downloaded again.
+        """
+        # season JSON of runs from before the journal existed, then the journal
+        recorded: dict[int, dict] = {}
+        try:
+            with open(f"{folder}{anime.name} (Season {anime.season_number}).json") as json_file:
+                recorded = {ep["number"]: ep for ep in json.load(json_file).get("episodes", []) if "number" in ep}
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        if self.journal:
+            recorded.update(self.journal.episodes())
+
+        queued = []
+        for episode in episodes:
+            location = f"{folder}{self.episode_name(anime, episode)}.mp4"
+            if not os.path.exists(location):
+                queued.append(episode)
+                continue
+
+            previous = recorded.get(episode["number"], {})
+            problem = check_download(location, previous.get("filesize"), previous.get("duration"))
+            if problem:
+                print(
+                    f"{Fore.LIGHTYELLOW_EX}Episode {episode['number']}: Existing file failed verification "
+                    f"({problem}), downloading again"
+                )
+                # yt-dlp would report the bad file as "already downloaded" and fetch nothing
+                try:
+                    os.remove(location)
+                except OSError:
+                    pass
+                queued.append(episode)
+                continue
+
+            for key in ("filesize", "duration"):
+                if key in previous:
+                    episode[key] = previous[key]
+            episode["status"] = "skipped"
+            if self.journal:
+                self.journal.record("skipped", episode["number"])
+            print(f"{Fore.LIGHTGREEN_EX}Skipping Episode {episode['number']} - {episode['title']}: already downloaded")
+
+        if len(queued) < len(episodes):
+            print(f"{Fore.LIGHTCYAN_EX}{len(episodes) - len(queued)} of {len(episodes)} episodes already downloaded")
+        return queued
+
+    def journaled(self, stage: str, episode: dict, work: Callable[..., Any], *args: Any) -> Any:
+        """Run a pipeline stage for ``episode`` and journal its result and timing right away."""
+        if stage == "resolve":
+            self.retries.start(episode["number"])
+        started = time.monotonic()
+        try:
+            return work(episode, *args)
+        finally:
+            self.record_episode(stage, episode, time.monotonic() - started)
+
+    def retry_episode(self, episode: dict, stage: str, anime: Anime, folder: str) -> float | None:
+        """
+        Decide whether a failed episode goes back to the end of the queue.
+
+        Returns the backoff delay before it is resolved again, or ``None`` when it stays failed
+        because its attempts, the job's retry budget or its deadline are used up.
+        """
+        number = episode["number"]
+        error = episode.get("error") or "unknown error"
+        location = f"{folder}{self.episode_name(anime, episode)}.mp4"
+        delay, reason = self.retries.schedule(number)
+        if delay is None:
+            with print_lock:
+                print(f"{Fore.LIGHTRED_EX}Episode {number}: Giving up ({reason})")
+            # nothing will resume it, so the partial download would only take up space
+            discard_download(location)
+            return None
+
+        attempt = self.retries.attempts(number)
+        with print_lock:
+            print(
+                f"{Fore.LIGHTYELLOW_EX}Episode {number}: {stage.capitalize()} failed ({error}), retrying in "
+                f"{delay:.0f}s (attempt {attempt + 1}/{self.retries.policy.attempts})"
+            )
+
+        # the stream may be what failed, so the retry resolves it from scratch
+        if self.stream_cache:
+            self.stream_cache.evict(episode["url"], self.args.server, anime.download_type)
+        if load_state(location):
+            save_state(location, m3u8=None)
+
+        episode["status"] = "retrying"
+        if self.journal:
+            self.journal.record(
+                "retry_scheduled", number, attempt=attempt, stage=stage, error=error, delay=round(delay, 1)
+            )
+        return delay
+
+    def record_episode(self, stage: str, episode: dict, seconds: float) -> None:
+        if not self.journal:
+            return
+        number = episode["number"]
+
+        if stage == "resolve" and episode.get("status") == "stream_found":
+            fields = {key: episode[key] for key in CACHED_FIELDS if episode.get(key) is not None}
+            self.journal.record(
+                "resolved",
+                number,
+                time_to_m3u8=episode.get("time_to_m3u8"),
+                capture_seconds=episode.get("capture_seconds"),
+                resolve_seconds=round(seconds, 2),
+                **fields,
+            )
+            return
+
+        if stage == "download" and episode.get("status") == "completed":
+            self.journal.record(
+                "downloaded",
+                number,
+                filesize=episode.get("filesize"),
+                duration=episode.get("duration"),
+                download_seconds=round(seconds, 2),
+            )
+        else:
+            self.journal.record(
+                f"{stage}_failed",
+                number,
+                error=episode.get("error") or "unknown error",
+                **{f"{stage}_seconds": round(seconds, 2)},
+            )
+        self.write_summary()
+
+    def write_summary(self) -> None:
+        """Rebuild the season JSON from the journal."""
+        if self.journal and self.summary:
+            path, header, episodes = self.summary
+            self.journal.write_summary(path, header, episodes)
+
+    @staticmethod
+    def episode_name(anime: Anime, episode: dict) -> str:
+        return f"{anime.name} - s{anime.season_number:02}e{episode['number']:02} - {episode['title']}"
+
+    def playlist_duration(self, stream: str | dict[str, Any], headers: dict[str, str]) -> float | None:
+        """
+        Duration of the media playlist that was downloaded, recorded for later verification; only
+        needed after yt-dlp downloads, the other engines report the duration they read.
+        """
+        url = stream["formats"][0]["url"] if isinstance(stream, dict) else stream
+        try:
+            return round(self.hls_downloader.load_playlist(url, headers).duration, 3)
+        except (HlsDownloadError, requests.RequestException):
+            return None
+
+    def resolve_workers(self) -> int:
+        """
+        ``--resolve-workers``, or as many browsers as fit into the available memory (at most 4);
+        in tabs mode :attr:`TAB_WORKERS` tabs.
+        """
+        configured = getattr(self.args, "resolve_workers", None)
+        if configured:
+            return configured
+        if self.resolver == "http":
+            return 4
+        if self.resolve_mode == "tabs":
+            return self.TAB_WORKERS
+        return workers_for_memory(int(self.browser_slots.browser_mb()), maximum=4)
+
+    @staticmethod
+    def episode_failed(episode: dict, error: Exception) -> None:
+        with print_lock:
+            print(f"{Fore.LIGHTRED_EX}Episode {episode['number']} failed with exception: {error}")
+        episode["status"] = "failed"
+        episode["error"] = str(error)
+
+    def slot_owner(self) -> str:
+        return f"{os.getpid()} {self.link or self.name or ''}".strip()
+
+    def start_browser(self) -> webdriver.Chrome:
+        """Driver pool factory: wait for a host-wide browser slot, then start a driver holding it."""
+        slot = self.browser_slots.acquire(self.slot_owner(), on_wait=self.print_browser_queued)
+        try:
+            driver = self.create_driver()
+        except BaseException:
+            self.browser_slots.release(slot)
+            raise
+        driver.browser_slot = slot
+        with self.sniffers_lock:
+            self.browsers.append(driver)
+        return driver
+
+    def start_tab_browser(self) -> webdriver.Chrome:
+        """Tab pool factory: a browser like :meth:`start_browser` plus the DevTools connection its tabs share."""
+        driver = self.start_browser()
+        try:
+            driver.tab_connection = CdpConnection.for_driver(driver)
+            # the user agent chromedriver's mobile emulation set up, tabs opened over DevTools lack it
+            driver.tab_user_agent = driver.execute_script("return navigator.userAgent")
+        except BaseException:
+            self.quit_driver(driver)
+            raise
+        return driver
+
+    def open_tab(self, driver: webdriver.Chrome) -> CdpTab:
+        return CdpTab(
+            driver.tab_connection,
+            self.is_media_url,
+            blocked_patterns=self.blocklist.url_patterns() if self.blocklist else None,
+            user_agent=driver.tab_user_agent,
+            device_metrics=TAB_DEVICE_METRICS,
+            init_script=TAB_INIT_SCRIPT,
+        )
+
+    def close_tab(self, tab: CdpTab) -> None:
+        with self.sniffers_lock:
+            for host, count in tab.counts().items():
+                self.blocked_by_host[host] = self.blocked_by_host.get(host, 0) + count
+        tab.close()
+
+    def quit_tab_browser(self, driver: webdriver.Chrome) -> None:
+        driver.tab_connection.close()
+        self.quit_driver(driver)
+
+    def quit_browsers(self) -> None:
+        """Quit every browser of this job, including those a resolver thread still borrows."""
+        with self.sniffers_lock:
+            drivers = list(self.browsers)
+        for driver in drivers:
+            connection = getattr(driver, "tab_connection", None)
+            if connection:
+                connection.close()
+            self.quit_driver(driver)
+
+    def browser_pids(self) -> list[int]:
+        """chromedriver pids of the browsers running for this job."""
+        with self.sniffers_lock:
+            drivers = list(self.browsers)
+        pids = []
+        for driver in drivers:
+            try:
+                pids.append(driver.service.process.pid)
+            except AttributeError:
+                continue
+        return pids
+
+    def measure_browser(self, driver: webdriver.Chrome) -> None:
+        """Record the resident size of a browser that has served a page, so slot capacity follows reality."""
+        try:
+            rss = process_tree_rss_mb(driver.service.process.pid)
+        except AttributeError:
+            return
+        if rss:
+            self.browser_slots.record_rss(rss)
+
+    def print_browser_queued(self, in_use: int, capacity: int) -> None:
+        number = getattr(self.resolving, "number", None)
+        subject = f"Episode {number}: Queued" if number is not None else "Episode list queued"
+        with print_lock:
+            print(
+                f"{Fore.LIGHTYELLOW_EX}{subject}, waiting for a browser slot "
+                f"({in_use}/{capacity} in use on this host)"
+            )
+
+    def print_pipeline_status(self, status: str) -> None:
+        with print_lock:
+            print(f"{Fore.LIGHTCYAN_EX}Pipeline: {status}")
+            if self.pacer.rates():
+                print(f"{Fore.LIGHTCYAN_EX}Request pacing: {self.pacer.describe()}")
+
+    def print_pipeline_stats(self) -> None:
+        if not self.pipeline:
+            return
+        for name, stats in self.pipeline.stats().items():
+            print(
+                f"{Fore.LIGHTCYAN_EX}  {name.capitalize()} stage: {stats['processed']} episodes on "
+                f"{stats['workers']} workers, {stats['utilisation']:.0%} utilised, "
+                f"queue avg {stats['avg_queue']:.1f} / peak {stats['peak_queue']}"
+            )
+        if self.retries.retries or self.retries.given_up:
+            given_up = ", ".join(f"{count} out of {kind}" for kind, count in sorted(self.retries.given_up.items()))
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Retries: {self.retries.retries} of {self.retries.policy.budget} budget used"
+                + (f"; gave up on {given_up}" if given_up else "")
+            )
+
+    def print_driver_pool_stats(self) -> None:
+        if not self.driver_pool:
+            return
+        stats = self.driver_pool.stats()
+        print(
+            f"{Fore.LIGHTCYAN_EX}  Driver pool: {stats['hits']} hits / {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} warm), {stats['recycled']} recycled"
+        )
+        startup_times = ", ".join(f"#{serial}: {secs:.2f}s" for serial, secs in stats["startup_times"].items())
+        if startup_times:
+            print(f"{Fore.LIGHTCYAN_EX}  Driver startup: avg {stats['avg_startup_time']:.2f}s ({startup_times})")
+
+    def print_tab_pool_stats(self) -> None:
+        if not self.tab_pool:
+            return
+        stats = self.tab_pool.stats()
+        print(
+            f"{Fore.LIGHTCYAN_EX}  Tab pool: {stats['tabs_opened']} tabs opened, at most {stats['peak_tabs']} "
+            f"of {stats['tabs']} at once, {stats['browsers_started']} browsers started "
+            f"(avg startup {stats['avg_startup_time']:.2f}s), {stats['recycled']} recycled"
+        )
+
+    def print_resolve_benchmark(self) -> None:
+        """Episodes resolved in a browser per minute and the memory of the browsers, to compare resolve modes."""
+        if not self.browser_resolves:
+            return
+        first = min(started for started, _ in self.browser_resolves)
+        last = max(finished for _, finished in self.browser_resolves)
+        resolved = len(self.browser_resolves)
+        per_minute = resolved / ((last - first) / 60) if last > first else 0.0
+        workers = self.pipeline.resolve_stage.workers if self.pipeline else 0
+        print(
+            f"{Fore.LIGHTCYAN_EX}  Browser resolve ({self.resolve_mode}, {workers} at once): "
+            f"{resolved} episodes in {last - first:.0f}s, {per_minute:.1f} episodes/min"
+            + (
+                f"; browser RSS peak {self.browser_rss.peak_mb:.0f} MiB, avg {self.browser_rss.average_mb:.0f} MiB"
+                if self.browser_rss.samples
+                else ""
+            )
+        )
+
+    def blocked_by_host_total(self) -> dict[str, int]:
+        """Blocked requests per host of every browser of this job, running or already quit."""
+        with self.sniffers_lock:
+            totals = dict(self.blocked_by_host)
+            for blocker in self.blockers.values():
+                for host, count in blocker.counts().items():
+                    totals[host] = totals.get(host, 0) + count
+        return totals
+
+    def print_capture_stats(self, episodes: list[dict[str, Any]]) -> None:
+        """Print time-to-m3u8 and process resource usage so capture backends can be compared."""
+        timings = [ep["time_to_m3u8"] for ep in episodes if "time_to_m3u8" in ep]
+        if timings:
+            examined = sum(ep.get("requests_examined", 0) for ep in episodes)
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Capture ({self.capture_backend}): avg time-to-m3u8 "
+                f"{sum(timings) / len(timings):.2f}s, max {max(timings):.2f}s, "
+                f"{examined / len(timings):.0f} requests examined per episode"
+            )
+        captures = [ep["capture_seconds"] for ep in episodes if "capture_seconds" in ep]
+        if captures:
+            refreshes = sum(ep.get("capture_refreshes", 0) for ep in episodes)
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Capture duration: avg {sum(captures) / len(captures):.2f}s, "
+                f"max {max(captures):.2f}s, {refreshes} idle refreshes"
+            )
+        page_loads = [ep["page_load"] for ep in episodes if "page_load" in ep]
+        if page_loads:
+            to_play = [ep["time_to_play"] for ep in episodes if "time_to_play" in ep]
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Player: avg page load {sum(page_loads) / len(page_loads):.2f}s, "
+                f"avg page load to play clicked {sum(to_play) / len(to_play):.2f}s"
+            )
+        blocked_by_host = self.blocked_by_host_total()
+        if blocked_by_host:
+            top = sorted(blocked_by_host.items(), key=lambda item: item[1], reverse=True)[:5]
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Request blocklist: {sum(blocked_by_host.values())} requests blocked "
+                f"(top hosts: {', '.join(f'{host} {count}' for host, count in top)})"
+            )
+        if self.stream_cache and (self.stream_cache.hits or self.stream_cache.evictions):
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Stream cache: {self.stream_cache.hits} reused, "
+                f"{self.stream_cache.evictions} evicted"
+            )
+        http = self.http.stats()
+        if http["requests"]:
+            print(
+                f"{Fore.LIGHTCYAN_EX}  HTTP client: {http['requests']} requests over {http['connections']} connections "
+                f"({http['reused']} reused{', HTTP/2' if http['http2'] else ''})"
+            )
+        if self.pacer.rates():
+            print(f"{Fore.LIGHTCYAN_EX}  Request pacing: {self.pacer.describe()}")
+        if self.subtitle_languages.fetches:
+            print(
+                f"{Fore.LIGHTCYAN_EX}  Subtitle probes: {self.subtitle_languages.fetches} fetched, "
+                f"{self.subtitle_languages.hits} served from cache"
+            )
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        print(
+            f"{Fore.LIGHTCYAN_EX}  CPU time: {own.ru_utime + own.ru_stime:.1f}s self, "
+            f"{children.ru_utime + children.ru_stime:.1f}s browsers; "
+            f"peak RSS {own.ru_maxrss // 1024} MiB self, {children.ru_maxrss // 1024} MiB largest browser process"
+        )
+
     def download_streams(self, anime: Anime, episodes: list[dict[str, Any]]):
         folder = (
             os.path.abspath(self.args.output_dir)
@@ -495,17 +1354,17 @@ class HianimeExtractor:
                 print(f"Skipping {name} (No M3U8 Stream Found)")
                 continue
 
-            result = self.yt_dlp_download(
+            result = self.download_video(
                 self.look_for_variants(m3u8_url, headers),
                 headers,
                 f"{folder}{name}.mp4",
             )
-            if not result:
+            if result is None:
                 break
 
             vtt_url = episode.get("vtt")
             if vtt_url:
-                self.yt_dlp_download(vtt_url, headers, f"{folder}{name}.vtt")
+                self.download_subtitle(vtt_url, headers, f"{folder}{name}.vtt")
             elif not self.args.no_subtitles:
                 print(f"Skipping {name}.vtt (No VTT Stream Found)")
 
@@ -526,6 +1385,15 @@ class HianimeExtractor:
         print(f"{Fore.LIGHTRED_EX}Invalid response, please respond with either 'sub' or 'dub'.")
         return HianimeExtractor.get_download_type()
 
+    @staticmethod
+    def purge_browser_leftovers() -> None:
+        """Delete profiles and capture stores of browsers from runs that crashed or were killed."""
+        # older versions kept the listing profile in XDG_CONFIG_HOME
+        roots = [tempfile.gettempdir(), os.environ.get("XDG_CONFIG_HOME", "/config")]
+        removed, freed = purge_stale_dirs(roots)
+        if removed:
+            print(f"{Fore.LIGHTCYAN_EX}Removed {removed} leftover browser temp dirs ({format_size(freed)})")
+
     def configure_driver(self) -> None:
         mobile_emulation: dict[str, str] = {"deviceName": "iPhone X"}
 
@@ -559,15 +1427,10 @@ class HianimeExtractor:
             options.add_argument(arg)
 
         has_ud = any(str(a).startswith("--user-data-dir=") for a in getattr(options, "arguments", []))
+        profile_dir = None
         if not has_ud:
-            xdg = os.environ.get("XDG_CONFIG_HOME", "/config")
-            profile_dir = os.path.join(xdg, f"chrome-profile-{int(time.time())}-{os.getpid()}")
-            try:
-                os.makedirs(profile_dir, exist_ok=True)
-            except PermissionError:
-                xdg = "/tmp"
-                profile_dir = os.path.join(xdg, f"chrome-profile-{int(time.time())}-{os.getpid()}")
-                os.makedirs(profile_dir, exist_ok=True)
+            # removed again in quit_driver, purge_stale_dirs catches it if this process dies first
+            profile_dir = make_temp_dir("chrome-profile-")
             options.add_argument(f"--user-data-dir={profile_dir}")
 
         def ensure(arg: str):
@@ -582,17 +1445,7 @@ class HianimeExtractor:
             options.add_argument("--headless=new")
         # ------------------------------------------------------------------------------------
 
-        # Configure selenium-wire storage to use writable directory
-        # Use /tmp/seleniumwire-{pid} to ensure app user has write access
-        import tempfile
-        seleniumwire_storage = os.path.join(tempfile.gettempdir(), f"seleniumwire-{os.getpid()}")
-        os.makedirs(seleniumwire_storage, mode=0o755, exist_ok=True)
-
-        seleniumwire_options: dict[str, Any] = {
-            "verify_ssl": False,
-            "disable_encoding": True,
-            "request_storage_base_dir": seleniumwire_storage,
-        }
+        seleniumwire_options = self.seleniumwire_options()
 
         # Try Chrome first, fall back to Chromium (for ARM64 systems)
         try:
@@ -622,7 +1475,12 @@ class HianimeExtractor:
             fix_hairline=True,
         )
 
-        self.driver.implicitly_wait(10)
+        self.driver.temp_dirs = [profile_dir]
+        self.driver.scopes = self.CAPTURE_SCOPES
+
+        # no implicit wait, get_server_options waits explicitly for the server list
+        self.driver.implicitly_wait(0)
+        self.block_requests(self.driver)
 
         self.driver.execute_script(
             """
@@ -662,6 +1520,8 @@ class HianimeExtractor:
         options.add_argument("--autoplay-policy=no-user-gesture-required")
         options.add_argument("--disable-features=PreloadMediaEngagementData,MediaEngagementBypassAutoplayPolicies")
         options.add_experimental_option("excludeSwitches", ["enable-logging"])
+        # driver.get() returns at DOMContentLoaded, find_stream waits for the player explicitly
+        options.page_load_strategy = "eager"
 
         # Merge CHROME_EXTRA_ARGS (validated) + ensure unique/writable user-data-dir
         extra = os.environ.get("CHROME_EXTRA_ARGS", "")
@@ -670,9 +1530,10 @@ class HianimeExtractor:
             options.add_argument(arg)
 
         has_ud = any(str(a).startswith("--user-data-dir=") for a in getattr(options, "arguments", []))
+        profile_dir = None
         if not has_ud:
-            # Use thread-safe unique profile directory for each driver
-            profile_dir = tempfile.mkdtemp(prefix=f"chrome-profile-{threading.current_thread().ident}-")
+            # unique per driver; removed again in quit_driver, purge_stale_dirs catches it after a crash
+            profile_dir = make_temp_dir("chrome-profile-")
             options.add_argument(f"--user-data-dir={profile_dir}")
 
         def ensure(arg: str):
@@ -686,15 +1547,11 @@ class HianimeExtractor:
         if not any("--headless" in str(a) for a in getattr(options, "arguments", [])):
             options.add_argument("--headless=new")
 
-        # Configure selenium-wire storage with thread-safe unique directory
-        seleniumwire_storage = tempfile.mkdtemp(prefix=f"seleniumwire-{threading.current_thread().ident}-")
-        os.chmod(seleniumwire_storage, 0o755)
-
-        seleniumwire_options: dict[str, Any] = {
-            "verify_ssl": False,
-            "disable_encoding": True,
-            "request_storage_base_dir": seleniumwire_storage,
-        }
+        # The cdp backend sniffs DevTools network events, so it needs neither the selenium-wire proxy nor its storage
+        chrome_cls = selenium_webdriver.Chrome if self.capture_backend == "cdp" else webdriver.Chrome
+        wire_kwargs: dict[str, Any] = {}
+        if self.capture_backend != "cdp":
+            wire_kwargs["seleniumwire_options"] = self.seleniumwire_options()
 
         # Detect architecture and use appropriate browser
         import platform
@@ -706,21 +1563,22 @@ class HianimeExtractor:
             try:
                 options.binary_location = "/usr/bin/chromium"
                 service = Service(executable_path="/usr/bin/chromedriver")
-                driver = webdriver.Chrome(
+                driver = chrome_cls(
                     service=service,
                     options=options,
-                    seleniumwire_options=seleniumwire_options,
+                    **wire_kwargs,
                 )
             except Exception as e:
                 with print_lock:
                     print(f"{Fore.LIGHTRED_EX}Failed to create Chromium driver: {e}")
+                remove_temp_dir(profile_dir)
                 raise
         else:
             # x64: Try Chrome first, fall back to Chromium
             try:
-                driver = webdriver.Chrome(
+                driver = chrome_cls(
                     options=options,
-                    seleniumwire_options=seleniumwire_options,
+                    **wire_kwargs,
                 )
             except Exception as e:
                 with print_lock:
@@ -728,14 +1586,15 @@ class HianimeExtractor:
                 try:
                     options.binary_location = "/usr/bin/chromium"
                     service = Service(executable_path="/usr/bin/chromedriver")
-                    driver = webdriver.Chrome(
+                    driver = chrome_cls(
                         service=service,
                         options=options,
-                        seleniumwire_options=seleniumwire_options,
+                        **wire_kwargs,
                     )
                 except Exception as e2:
                     with print_lock:
                         print(f"{Fore.LIGHTRED_EX}Failed to create Chromium driver: {e2}")
+                    remove_temp_dir(profile_dir)
                     raise
 
         stealth(
@@ -748,7 +1607,15 @@ class HianimeExtractor:
             fix_hairline=True,
         )
 
-        driver.implicitly_wait(10)
+        driver.temp_dirs = [profile_dir]
+        if self.capture_backend != "cdp":
+            driver.scopes = self.CAPTURE_SCOPES
+
+        # no implicit wait: absent elements must not stall, waits are explicit and short
+        driver.implicitly_wait(0)
+        if self.resolve_mode != "tabs":
+            # a tab host's own page stays blank, its tabs block and capture for themselves
+            self.block_requests(driver)
 
         driver.execute_script(
             """
@@ -762,10 +1629,97 @@ class HianimeExtractor:
             """
         )
 
+        if self.capture_backend == "cdp" and self.resolve_mode != "tabs":
+            sniffer = CdpNetworkSniffer(driver, self.is_media_url)
+            with self.sniffers_lock:
+                self.sniffers[driver.session_id] = sniffer
+
         return driver
 
+    def seleniumwire_options(self) -> dict[str, Any]:
+        """
+        Proxy options for both drivers: requests are kept in memory instead of a temp dir per driver.
+
+        Together with ``driver.scopes`` = :attr:`CAPTURE_SCOPES` only manifests and subtitles are
+        recorded, so HLS segments and other response bodies are never stored.
+        """
+        return {
+            "verify_ssl": False,
+            "disable_encoding": True,
+            "request_storage": "memory",
+            "request_storage_max_size": self.CAPTURE_STORAGE_MAX,
+        }
+
+    @staticmethod
+    def is_media_url(uri: str) -> bool:
+        return ".m3u8" in uri or ".vtt" in uri
+
+    def clear_captured_requests(self, driver: webdriver.Chrome) -> None:
+        sniffer = self.sniffers.get(driver.session_id)
+        if sniffer:
+            sniffer.clear()
+        else:
+            del driver.requests
+
+    def reset_driver(self, driver: webdriver.Chrome) -> None:
+        """Bring a pooled driver back to a blank state before it serves the next episode."""
+        # measured while the episode page is still loaded, that is what a browser needs
+        self.measure_browser(driver)
+        driver.switch_to.default_content()
+        driver.get("about:blank")
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        self.clear_captured_requests(driver)
+
+    def block_requests(self, driver: webdriver.Chrome) -> None:
+        """Install the request blocklist in a new browser, before it opens its first page."""
+        if not self.blocklist:
+            return
+        try:
+            blocker = CdpRequestBlocker.for_driver(driver, self.blocklist.url_patterns())
+        except Exception as e:
+            with print_lock:
+                print(f"{Fore.LIGHTYELLOW_EX}Could not install request blocklist, loading pages unfiltered: {e}")
+            return
+        with self.sniffers_lock:
+            self.blockers[driver.session_id] = blocker
+
+    def blocked_requests(self, driver: webdriver.Chrome) -> int:
+        blocker = self.blockers.get(driver.session_id)
+        return blocker.blocked if blocker else 0
+
+    def stop_blocker(self, driver: webdriver.Chrome) -> None:
+        with self.sniffers_lock:
+            blocker = self.blockers.pop(driver.session_id, None)
+            if blocker:
+                for host, count in blocker.counts().items():
+                    self.blocked_by_host[host] = self.blocked_by_host.get(host, 0) + count
+        if blocker:
+            blocker.stop()
+
+    def quit_driver(self, driver: webdriver.Chrome) -> None:
+        with self.sniffers_lock:
+            sniffer = self.sniffers.pop(driver.session_id, None)
+        if sniffer:
+            sniffer.stop()
+        self.stop_blocker(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        finally:
+            for path in getattr(driver, "temp_dirs", ()):
+                remove_temp_dir(path)
+            with self.sniffers_lock:
+                if driver in self.browsers:
+                    self.browsers.remove(driver)
+            slot = getattr(driver, "browser_slot", None)
+            if slot is not None:
+                self.browser_slots.release(slot)
+
     def get_server_options(self, download_type: str) -> list[WebElement]:
-        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "servers-content")))
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "#servers-content .ps_-block .ps__-list a"))
+        )
         options = [
             _type.find_element(By.CLASS_NAME, "ps__-list").find_elements(By.TAG_NAME, "a")
             for _type in self.driver.find_element(By.ID, "servers-content").find_elements(
@@ -789,9 +1743,6 @@ class HianimeExtractor:
                 server_names.append(option.text)
                 print(f"{Fore.LIGHTRED_EX} {i + 1}: {Fore.LIGHTCYAN_EX}{option.text}")
 
-            self.driver.requests.clear()
-            self.driver.quit()
-
             # Check if running in interactive mode (terminal available)
             if sys.stdin.isatty():
                 if self.args.server:
@@ -804,16 +1755,12 @@ class HianimeExtractor:
                 # Non-interactive mode (background job): default to first server
                 selection = server_names[0]
                 print(f"{Fore.LIGHTYELLOW_EX}No server specified, defaulting to first available: {selection}")
-        else:
-            self.driver.requests.clear()
-            self.driver.quit()
 
         print(f"\n{Fore.LIGHTGREEN_EX}You chose: {Fore.LIGHTCYAN_EX}{selection}")
+        # episode workers resolve against the same server
+        self.args.server = selection
 
-        self.configure_driver()
-        self.driver.get(anime.url)
-
-        options = self.get_server_options(anime.download_type)
+        # the session that listed the servers is still open, so the chosen button can be clicked directly
         for option in options:
             if option.text == selection:
                 return option
@@ -835,15 +1782,25 @@ class HianimeExtractor:
                 episodes.append(episode_info)
         return episodes
 
+    def request_feed(self, driver: webdriver.Chrome, url_filter=None) -> WireRequestFeed | SnifferRequestFeed:
+        """Incremental source of completed requests for ``driver``'s capture backend."""
+        sniffer = self.sniffers.get(driver.session_id)
+        if sniffer:
+            return SnifferRequestFeed(sniffer)
+        # selenium-wire only records CAPTURE_SCOPES, the blocker sees every request of the page
+        blocker = self.blockers.get(driver.session_id)
+        return WireRequestFeed(driver, url_filter, activity=(lambda: blocker.requests_sent) if blocker else None)
+
     def capture_media_requests(self) -> dict[str, str] | None:
         found_m3u8: bool = False
         found_vtt: bool = self.args.no_subtitles
         attempt: int = 0
         urls: dict[str, Any] = {"all-vtt": []}
-        previously_found_vtt: int = 0
+        new_vtt_in_pass: bool = False
 
         candidate_m3u8: tuple[str, dict[str, str]] | None = None
-        all_urls: list[str] = []
+        checked_vtt: set[str] = set()
+        feed = self.request_feed(self.driver)
 
         while (not found_m3u8 or not found_vtt) and self.DOWNLOAD_ATTEMPT_CAP >= attempt:
             sys.stdout.write(
@@ -851,32 +1808,33 @@ class HianimeExtractor:
             )
             sys.stdout.flush()
 
-            # Debug: Log request count per attempt
-            total_requests = len(self.driver.requests)
-            requests_with_response = sum(1 for r in self.driver.requests if r.response)
-            print(f"\n{Fore.LIGHTYELLOW_EX}DEBUG Attempt #{attempt}: Total requests={total_requests}, with_response={requests_with_response}")
+            seen_before = len(feed.seen_urls)
+            responses = feed.poll()
 
-            for request in self.driver.requests:
-                if not request.response:
-                    continue
+            # Debug: Log request count per attempt
+            print(
+                f"\n{Fore.LIGHTYELLOW_EX}DEBUG Attempt #{attempt}: Total requests={feed.total}, "
+                f"with_response={feed.completed}"
+            )
+            # Debug: Log new URLs as they're discovered
+            for uri in feed.seen_urls[seen_before:]:
+                if ".m3u8" in uri or "master" in uri or "playlist" in uri:
+                    print(f"{Fore.LIGHTMAGENTA_EX}DEBUG: New potential video URL: {uri[:150]}")
 
-                uri = request.url.lower()
-                if uri not in all_urls:
-                    all_urls.append(uri)
-                    # Debug: Log new URLs as they're discovered
-                    if ".m3u8" in uri or "master" in uri or "playlist" in uri:
-                        print(f"{Fore.LIGHTMAGENTA_EX}DEBUG: New potential video URL: {uri[:150]}")
+            new_vtt_in_pass = False
+            for request_url, request_headers in responses:
+                uri = request_url.lower()
 
                 # --- HLS detection: accept any .m3u8 (prefer "master" if seen) ---
                 if ".m3u8" in uri and "thumbnail" not in uri and "iframe" not in uri:
                     if "master" in uri and uri not in self.captured_video_urls and not found_m3u8:
                         print(f"{Fore.LIGHTGREEN_EX}DEBUG: Found MASTER m3u8: {uri[:150]}")
                         urls["m3u8"] = uri
-                        urls["headers"] = dict(request.headers)
+                        urls["headers"] = request_headers
                         found_m3u8 = True
                     elif candidate_m3u8 is None and uri not in self.captured_video_urls:
                         print(f"{Fore.LIGHTCYAN_EX}DEBUG: Found candidate m3u8: {uri[:150]}")
-                        candidate_m3u8 = (uri, dict(request.headers))
+                        candidate_m3u8 = (uri, request_headers)
                     elif uri in self.captured_video_urls:
                         print(f"{Fore.LIGHTRED_EX}DEBUG: Skipping already captured m3u8: {uri[:80]}...")
 
@@ -885,23 +1843,22 @@ class HianimeExtractor:
                     not found_vtt
                     and ".vtt" in uri
                     and "thumbnail" not in uri
+                    and uri not in checked_vtt
                     and uri not in self.captured_subtitle_urls
                     and not any(lang in uri for lang in self.OTHER_LANGS)
                 ):
+                    checked_vtt.add(uri)
                     try:
-                        text = requests.get(uri, headers=dict(request.headers), timeout=10).content.decode(
-                            self.ENCODING, errors="ignore"
-                        )
-                        if detect_lang(text) == self.SUBTITLE_LANG:
-                            if uri in urls["all-vtt"]:
-                                previously_found_vtt += 1
-                                if previously_found_vtt >= len(urls["all-vtt"]):
-                                    found_vtt = True
-                            else:
-                                urls["all-vtt"].append(uri)
+                        if self.subtitle_languages.language(uri, request_headers) == self.SUBTITLE_LANG:
+                            urls["all-vtt"].append(uri)
+                            new_vtt_in_pass = True
                     except Exception:
                         pass
 
+            # subtitles are settled once a pass after the last new english track brought no other one
+            if urls["all-vtt"] and not new_vtt_in_pass:
+                found_vtt = True
+
             # adopt first candidate if no master seen
             if not found_m3u8 and candidate_m3u8:
                 urls["m3u8"], urls["headers"] = candidate_m3u8
@@ -910,10 +1867,13 @@ class HianimeExtractor:
             attempt += 1
             if attempt in self.DOWNLOAD_REFRESH:
                 self.driver.refresh()
-            time.sleep(1)
+            if isinstance(feed, WireRequestFeed):
+                time.sleep(1)
 
         print()
+        urls["requests_examined"] = feed.examined
         if not found_m3u8:
+            all_urls = feed.seen_urls
             print(f"{Fore.LIGHTRED_EX}No .m3u8 streams found.")
             print(f"{Fore.LIGHTYELLOW_EX}Debug: Captured {len(all_urls)} total requests")
             print(f"{Fore.LIGHTYELLOW_EX}Debug: Sample URLs (first 10):")
@@ -951,28 +1911,43 @@ class HianimeExtractor:
 
         return urls
 
-    def capture_media_requests_from_driver(self, driver: webdriver.Chrome) -> dict[str, str] | None:
+    def capture_media_requests_from_driver(
+        self, driver: webdriver.Chrome, started: float | None = None, number: int | None = None
+    ) -> dict[str, str] | None:
         """
         Capture media requests from a specific driver instance (for parallel processing).
         Simplified version without interactive prompts.
         """
+        return self.capture_media(self.request_feed(driver, self.is_media_url), driver.refresh, started, number)
+
+    def capture_media(
+        self,
+        feed: WireRequestFeed | SnifferRequestFeed,
+        refresh: Callable[[], None],
+        started: float | None = None,
+        number: int | None = None,
+    ) -> dict[str, str] | None:
+        """
+        Pick the stream and subtitles out of the requests ``feed`` delivers; ``refresh`` reloads the page.
+
+        ``started`` is the ``time.monotonic()`` of the page navigation, used for the
+        ``time_to_m3u8`` measurement and the capture deadline (defaults to the start of the
+        capture). When to stop or refresh the page is decided by ``self.capture_policy``.
+        """
         found_m3u8: bool = False
         found_vtt: bool = self.args.no_subtitles
-        attempt: int = 0
         urls: dict[str, Any] = {"all-vtt": []}
-        previously_found_vtt: int = 0
+        new_vtt_in_pass: bool = False
 
         candidate_m3u8: tuple[str, dict[str, str]] | None = None
-        all_urls: list[str] = []
-
-        while (not found_m3u8 or not found_vtt) and self.DOWNLOAD_ATTEMPT_CAP >= attempt:
-            for request in driver.requests:
-                if not request.response:
-                    continue
+        checked_vtt: set[str] = set()
+        capture_start = started or time.monotonic()
+        window = CaptureWindow(self.capture_policy, capture_start)
 
-                uri = request.url.lower()
-                if uri not in all_urls:
-                    all_urls.append(uri)
+        while True:
+            new_vtt_in_pass = False
+            for request_url, request_headers in feed.poll():
+                uri = request_url.lower()
 
                 # HLS detection: accept any .m3u8 (prefer "master" if seen)
                 if ".m3u8" in uri and "thumbnail" not in uri and "iframe" not in uri:
@@ -980,66 +1955,188 @@ class HianimeExtractor:
                         with print_lock:
                             print(f"{Fore.LIGHTGREEN_EX}Found MASTER m3u8: {uri[:150]}")
                         urls["m3u8"] = uri
-                        urls["headers"] = dict(request.headers)
+                        urls["headers"] = request_headers
                         found_m3u8 = True
                     elif candidate_m3u8 is None:
-                        candidate_m3u8 = (uri, dict(request.headers))
+                        candidate_m3u8 = (uri, request_headers)
 
                 # Subtitle detection (language-filtered)
                 if (
                     not found_vtt
                     and ".vtt" in uri
                     and "thumbnail" not in uri
+                    and uri not in checked_vtt
                     and not any(lang in uri for lang in self.OTHER_LANGS)
                 ):
+                    checked_vtt.add(uri)
                     try:
-                        text = requests.get(uri, headers=dict(request.headers), timeout=10).content.decode(
-                            self.ENCODING, errors="ignore"
-                        )
-                        if detect_lang(text) == self.SUBTITLE_LANG:
-                            if uri in urls["all-vtt"]:
-                                previously_found_vtt += 1
-                                if previously_found_vtt >= len(urls["all-vtt"]):
-                                    found_vtt = True
-                            else:
-                                urls["all-vtt"].append(uri)
+                        if self.subtitle_languages.language(uri, request_headers) == self.SUBTITLE_LANG:
+                            urls["all-vtt"].append(uri)
+                            new_vtt_in_pass = True
                     except Exception:
                         pass
 
+            # Subtitles are settled once a pass after the last new english track brought no other one
+            if urls["all-vtt"] and not new_vtt_in_pass:
+                found_vtt = True
+
             # Adopt first candidate if no master seen
             if not found_m3u8 and candidate_m3u8:
                 urls["m3u8"], urls["headers"] = candidate_m3u8
                 found_m3u8 = True
 
-            attempt += 1
-            if attempt in self.DOWNLOAD_REFRESH:
-                driver.refresh()
-            time.sleep(1)
+            if found_m3u8 and "time_to_m3u8" not in urls:
+                urls["time_to_m3u8"] = round(time.monotonic() - capture_start, 2)
+
+            action = window.next_action(found_m3u8, found_vtt, feed.activity)
+            if action in ("done", "timeout"):
+                break
+            if action == "refresh":
+                with print_lock:
+                    print(
+                        f"{Fore.LIGHTYELLOW_EX}Episode {number}: No network activity for "
+                        f"{self.capture_policy.idle_refresh:.0f}s, refreshing page"
+                    )
+                refresh()
+            if isinstance(feed, WireRequestFeed):
+                time.sleep(self.capture_policy.poll_interval)
 
+        with print_lock:
+            print(
+                f"{Fore.LIGHTCYAN_EX}Episode {number}: Capture finished after {window.elapsed:.2f}s "
+                f"({window.outcome}, {window.refreshes} refreshes)"
+            )
         if not found_m3u8:
             return None
 
+        urls["capture_seconds"] = round(window.elapsed, 2)
+        urls["capture_refreshes"] = window.refreshes
+
+        urls["requests_examined"] = feed.examined
+
         # For parallel processing, just take the first subtitle if available
         if not self.args.no_subtitles and urls["all-vtt"]:
             urls["vtt"] = urls["all-vtt"][0]
 
         return urls
 
-    @staticmethod
-    def look_for_variants(m3u8_url: str, m3u8_headers: dict[str, Any]) -> str:
+    def fetch_subtitle(self, uri: str, headers: dict[str, str]) -> bytes:
+        response = self.http.get(uri, headers=headers, timeout=10)
+        response.raise_for_status()
+        return response.content
+
+    def look_for_variants(self, m3u8_url: str, m3u8_headers: dict[str, Any]) -> str | dict[str, Any]:
+        """
+        Fetch the master playlist and pick a variant by ``--quality``/``--max-bitrate``.
+
+        Returns a prebuilt yt-dlp info dict for the chosen media playlist, so yt-dlp does not fetch
+        the master playlist again. Falls back to the plain URL when the playlist cannot be read or
+        the chosen variant carries its audio in a separate rendition that yt-dlp has to merge.
+        """
         try:
-            response = requests.get(m3u8_url, headers=m3u8_headers, timeout=15)
+            response = self.http.get(m3u8_url, headers=m3u8_headers, timeout=15)
             response.raise_for_status()
-            lines = response.text.splitlines()
-            for line in lines:
-                s = line.strip()
-                if s.endswith(".m3u8") and "iframe" not in s:
-                    return urljoin(m3u8_url, s)
         except Exception:
-            pass
-        return m3u8_url
+            return m3u8_url
+
+        playlist = parse_master_playlist(response.text, m3u8_url)
+        if not playlist.variants:
+            # already a media playlist
+            return self.hls_info(m3u8_url, m3u8_url, m3u8_headers)
 
-    def yt_dlp_download(self, url: str, headers: dict[str, str], location: str) -> bool:
+        variant = select_variant(playlist.variants, self.quality, self.max_bitrate)
+        if variant is None or playlist.has_separate_audio(variant):
+            return m3u8_url
+        return self.hls_info(variant.uri, m3u8_url, m3u8_headers, variant)
+
+    @staticmethod
+    def hls_info(
+        url: str, manifest_url: str, headers: dict[str, Any], variant: Variant | None = None
+    ) -> dict[str, Any]:
+        """yt-dlp info dict with a single native HLS format for ``url``."""
+        stream_format: dict[str, Any] = {
+            "format_id": f"hls-{variant.height}p" if variant and variant.height else "hls",
+            "url": url,
+            "manifest_url": manifest_url,
+            "ext": "mp4",
+            "protocol": "m3u8_native",
+            "http_headers": headers,
+        }
+        if variant:
+            stream_format.update(
+                {
+                    "tbr": variant.bitrate / 1000,
+                    "width": variant.width,
+                    "height": variant.height,
+                    "fps": variant.frame_rate,
+                    "format_note": variant.describe(),
+                }
+            )
+        return {
+            "id": "stream",
+            "title": "stream",
+            "formats": [stream_format],
+            "http_headers": headers,
+            "webpage_url": manifest_url,
+            "extractor": "generic",
+            "extractor_key": "Generic",
+            "format_note": stream_format.get("format_note"),
+        }
+
+    def download_video(
+        self, stream: str | dict[str, Any], headers: dict[str, str], location: str
+    ) -> dict[str, float] | None:
+        """
+        Download an episode video through the aria2 daemon (``--aria-rpc``) or the engine chosen by
+        ``--engine``, falling back to yt-dlp.
+
+        Returns the download stats, with the ``duration`` of the playlist when it was read for the
+        download (not for yt-dlp), or ``None`` when the video could not be downloaded.
+        """
+        if self.aria2:
+            url = stream["formats"][0]["url"] if isinstance(stream, dict) else stream
+            try:
+                stats = self.aria2.download_hls(self.hls_downloader.load_playlist(url, headers), headers, location)
+            except (Aria2RpcError, HlsDownloadError) as e:
+                self.print_hls_progress(f"{e}, not using aria2 RPC for this episode")
+            else:
+                self.print_hls_progress(
+                    f"Downloaded {format_size(stats['bytes'])} ({stats['segments']} segments) via aria2 in "
+                    f"{stats['seconds']:.1f}s at {format_size(stats['throughput'])}/s"
+                )
+                return stats
+
+        if self.engine == "native":
+            url = stream["formats"][0]["url"] if isinstance(stream, dict) else stream
+            try:
+                stats = self.hls_downloader.download(url, headers, location)
+            except HlsDownloadError as e:
+                self.print_hls_progress(f"{e}, falling back to yt-dlp")
+            else:
+                self.print_hls_progress(
+                    f"Downloaded {format_size(stats['bytes'])} ({stats['segments']} segments) in "
+                    f"{stats['seconds']:.1f}s at {format_size(stats['throughput'])}/s"
+                )
+                return stats
+        return {} if self.yt_dlp_download(stream, headers, location) else None
+
+    def download_subtitle(self, url: str, headers: dict[str, str], location: str) -> bool:
+        if self.aria2:
+            try:
+                self.aria2.download_file(url, headers, location)
+                return True
+            except Aria2RpcError as e:
+                self.print_hls_progress(f"{e}, downloading subtitle with yt-dlp")
+        return self.yt_dlp_download(url, headers, location)
+
+    @staticmethod
+    def print_hls_progress(message: str) -> None:
+        with print_lock:
+            print(f"{Fore.LIGHTCYAN_EX}[HLS] {message}")
+
+    def yt_dlp_download(self, url: str | dict[str, Any], headers: dict[str, str], location: str) -> bool:
+        """Download ``url``, or the prebuilt info dict from :meth:`look_for_variants`, to ``location``."""
+        stream_url = url["formats"][0]["url"] if isinstance(url, dict) else url
         yt_dlp_options: dict[str, Any] = {
             "no_warnings": False,
             "quiet": False,
@@ -1047,30 +2144,34 @@ class HianimeExtractor:
             "format": "best",
             "http_headers": headers,
             "logger": YTDLogger(),
-            "fragment_retries": 10,
-            "retries": 10,
-            "socket_timeout": 60,
-            "sleep_interval_requests": 1,
+            **tuning_options(self.args),
+            "continuedl": True,
             "force_keyframes_at_cuts": True,
             "allow_unplayable_formats": True,
+            **downloader_options(self.args),
         }
 
         _return = True
         with YoutubeDL(yt_dlp_options) as ydl:
             try:
-                ydl.download([url])
+                if isinstance(url, dict):
+                    ydl.process_ie_result(url, download=True)
+                else:
+                    ydl.download([url])
             except KeyboardInterrupt:
+                # .part and .ytdl files stay, yt-dlp continues from the last fragment on the next run
                 print(
-                    f"\n\n{Fore.LIGHTCYAN_EX}Canceling Downloads...\nRemoving Temp Files for "
-                    f"{location[location.rfind(os.sep) + 1:-4]}"
+                    f"\n\n{Fore.LIGHTCYAN_EX}Canceling Downloads...\nKeeping partial files of "
+                    f"{location[location.rfind(os.sep) + 1:-4]} to resume later"
                 )
                 _return = False
                 ydl.close()
+            except Exception as e:
+                self.pacer.observe(stream_url, status_from_error(str(e)))
+                raise
 
-        if not _return:
-            for file in [f for f in glob(location[:-4] + ".*") if not f.endswith((".mp4", ".vtt"))]:
-                safe_remove(file)
-
+        if _return:
+            self.pacer.observe(stream_url, 200)
         return _return
 
     def get_anime(self, name: str | None = None) -> Anime | None:
@@ -1081,7 +2182,7 @@ class HianimeExtractor:
         search_name: str = name if name else input("Enter Name of Anime: ")
 
         url: str = urljoin(self.URL, "/search?keyword=" + search_name)
-        search_page_response: requests.Response = requests.get(url, headers=self.HEADERS)
+        search_page_response = self.http.get(url, headers=self.HEADERS)
         search_page_soup: BeautifulSoup = BeautifulSoup(search_page_response.content, "html.parser")
 
         main_content: Tag = search_page_soup.find("div", id="main-content")  # type: ignore
@@ -1144,7 +2245,7 @@ class HianimeExtractor:
         ]
 
     def get_anime_from_link(self, link: str) -> Anime:
-        link_page: requests.Response = requests.get(link, headers=self.HEADERS)
+        link_page = self.http.get(link, headers=self.HEADERS)
         link_page_soup = BeautifulSoup(link_page.content, "html.parser")
         main_div: Tag = link_page_soup.find("div", "anisc-detail")  # type: ignore
 
@@ -0,0 +1,137 @@
+import re
+from typing import Any
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import requests
+from bs4 import BeautifulSoup, Tag
+
+from tools.http_client import HttpClient, shared_client
+
+
+class ResolverError(Exception):
+    pass
+
+
+class HianimeHttpResolver:
+    """
+    Resolves HiAnime episodes to their HLS stream through the site's AJAX endpoints.
+
+    Walks episode list -> server list -> sources -> embed player ``getSources`` with plain HTTP
+    requests on the shared pooled client, so no browser is needed. Raises :class:`ResolverError` whenever
+    the chain cannot be followed (e.g. the embed returns encrypted sources) so callers can fall
+    back to the browser.
+    """
+
+    def __init__(
+        self, base_url: str, headers: dict[str, str], http: HttpClient | None = None, timeout: float | None = None
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.http = http or shared_client()
+        self.timeout = timeout
+
+    def _get_json(self, url: str, referer: str | None = None) -> dict[str, Any]:
+        headers = {
+            **self.headers,
+            "Accept": "application/json, text/javascript, */*; q=0.01",
+            "X-Requested-With": "XMLHttpRequest",
+        }
+        if referer:
+            headers["Referer"] = referer
+        try:
+            response = self.http.get(url, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            raise ResolverError(f"Request to {url} failed: {e}") from e
+
+    @staticmethod
+    def anime_id(url: str) -> str:
+        """Numeric anime id from a watch/detail URL such as ``/watch/one-piece-100``."""
+        match = re.search(r"-(\d+)(?:$|[/?#])", urlparse(url).path + "/")
+        if not match:
+            raise ResolverError(f"No anime id in {url}")
+        return match.group(1)
+
+    @staticmethod
+    def episode_id(url: str) -> str:
+        episode_ids = parse_qs(urlparse(url).query).get("ep")
+        if not episode_ids:
+            raise ResolverError(f"No episode id in {url}")
+        return episode_ids[0]
+
+    def get_episode_list(self, anime_url: str, start_episode: int, end_episode: int) -> list[dict[str, Any]]:
+        data = self._get_json(f"{self.base_url}/ajax/v2/episode/list/{self.anime_id(anime_url)}", anime_url)
+        soup = BeautifulSoup(data.get("html", ""), "html.parser")
+
+        episodes: list[dict[str, Any]] = []
+        links: list[Tag] = soup.find_all("a", attrs={"data-number": True})  # type: ignore
+        for link in links:
+            number = int(str(link.get("data-number")))
+            if start_episode <= number <= end_episode:
+                episodes.append(
+                    {"url": urljoin(self.base_url, str(link["href"])), "number": number, "title": link.get("title")}
+                )
+        if not episodes:
+            raise ResolverError("Episode list is empty")
+        return episodes
+
+    def get_servers(self, episode_url: str) -> list[dict[str, str]]:
+        data = self._get_json(
+            f"{self.base_url}/ajax/v2/episode/servers?episodeId={self.episode_id(episode_url)}", episode_url
+        )
+        soup = BeautifulSoup(data.get("html", ""), "html.parser")
+        return [
+            {"id": str(item["data-id"]), "type": str(item.get("data-type", "")), "name": item.get_text(strip=True)}
+            for item in soup.select(".server-item[data-id]")
+        ]
+
+    def pick_server(self, servers: list[dict[str, str]], download_type: str, server: str | None) -> dict[str, str]:
+        candidates = [s for s in servers if s["type"] == download_type] or servers
+        if not candidates:
+            raise ResolverError("No servers listed for episode")
+        if server:
+            for candidate in candidates:
+                if candidate["name"].lower() == server.lower().strip():
+                    return candidate
+            raise ResolverError(f"Server {server} not listed for episode")
+        return candidates[0]
+
+    def get_sources(self, server_id: str, episode_url: str) -> dict[str, Any]:
+        data = self._get_json(f"{self.base_url}/ajax/v2/episode/sources?id={server_id}", episode_url)
+        link = data.get("link")
+        if not link:
+            raise ResolverError("Sources response has no embed link")
+
+        # the player fetches its sources from ".../e-1/getSources?id=<embed id>" next to the embed page
+        embed = urlparse(link)
+        embed_id = embed.path.rstrip("/").rsplit("/", 1)[-1]
+        sources_url = urljoin(f"{embed.scheme}://{embed.netloc}{embed.path}", f"getSources?id={embed_id}")
+        player = self._get_json(sources_url, link)
+        player["embed_origin"] = f"{embed.scheme}://{embed.netloc}"
+        return player
+
+    def resolve(self, episode_url: str, download_type: str, server: str | None = None) -> dict[str, Any]:
+        """
+        Resolve an episode page URL to the same structure the browser capture returns:
+        ``m3u8``, ``headers``, ``all-vtt`` and (when an English track exists) ``vtt``.
+        """
+        chosen = self.pick_server(self.get_servers(episode_url), download_type, server)
+        player = self.get_sources(chosen["id"], episode_url)
+
+        sources = player.get("sources")
+        if not isinstance(sources, list):
+            raise ResolverError("Embed player returned encrypted sources")
+        m3u8 = next((s.get("file") for s in sources if ".m3u8" in str(s.get("file", ""))), None)
+        if not m3u8:
+            raise ResolverError("Embed player returned no HLS source")
+
+        origin = player["embed_origin"]
+        headers = {"User-Agent": self.headers.get("User-Agent", ""), "Referer": f"{origin}/", "Origin": origin}
+
+        tracks = [t for t in player.get("tracks", []) if t.get("kind") in ("captions", "subtitles")]
+        english = [t["file"] for t in tracks if str(t.get("label", "")).lower().startswith("english")]
+        urls: dict[str, Any] = {"m3u8": m3u8, "headers": headers, "all-vtt": english, "server": chosen["name"]}
+        if english:
+            urls["vtt"] = english[0]
+        return urls
@@ -1,10 +1,10 @@
 import os
 
-import requests
 from bs4 import BeautifulSoup
 from gallery_dl import config, job
 
 from extractors.general import GeneralExtractor
+from tools.http_client import shared_client
 
 
 class InstagramExtractor(GeneralExtractor):
@@ -16,7 +16,7 @@ class InstagramExtractor(GeneralExtractor):
             "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.11 (KHTML, like Gecko) Chrome/23.0.1271.64 Safari/537.11",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Charset": "ISO-8859-1,utf-8;q=0.7,*;q=0.3",
-            "Accept-Encoding": "none",
+            "Accept-Encoding": "gzip, deflate, br",
             "Accept-Language": "en-US,en;q=0.8",
             "Connection": "keep-alive",
         }
@@ -55,7 +55,7 @@ class InstagramExtractor(GeneralExtractor):
             )
 
     def get_post_title(self):
-        response = requests.get(self.args.link, headers=self.HEADERS)
+        response = shared_client().get(self.args.link, headers=self.HEADERS)
         page_soup = BeautifulSoup(response.content, "html.parser")
         url: str = page_soup.find("meta", property="og:url").get("content")  # type: ignore
         return url[url.find(self.URL) + len(self.URL) : -1].replace("/reel/", " - ")
@@ -1,5 +1,6 @@
 import argparse
 import os
+import signal
 import sys
 import time
 
@@ -8,11 +9,22 @@ from colorama import Fore
 from extractors.general import GeneralExtractor
 from extractors.hianime import HianimeExtractor
 from extractors.instagram import InstagramExtractor
+from tools import http_client, pacing
+from tools.blocklist import resource_types, split_list
+from tools.ytdlp_options import DEFAULT_PROFILE, TUNING_PROFILES, aria_size, byte_size
 
 
 class Main:
     def __init__(self):
         self.args = self.parse_args()
+        http_client.configure(
+            # room for the segment workers of every parallel download
+            pool_size=max(10, self.args.hls_concurrency * max(1, self.args.download_workers)),
+            timeout=self.args.http_timeout,
+            retries=self.args.http_retries,
+            http2=self.args.http2,
+            pacer=pacing.configure(enabled=self.args.adaptive_pacing, max_rate=self.args.max_request_rate),
+        )
         extractor = self.get_extractor()
         extractor.run()
 
@@ -89,6 +101,70 @@ class Main:
             help="Use aria2c as external downloader (enabled by default)",
         )
 
+        parser.add_argument(
+            "--aria-rpc",
+            action="store_true",
+            default=(os.environ.get("ARIA2_RPC", "false").lower() == "true"),
+            help="Queue downloads on the shared aria2c daemon (ARIA2_RPC_URL / ARIA2_RPC_SECRET) over JSON-RPC",
+        )
+
+        parser.add_argument(
+            "--aria-connections",
+            type=int,
+            default=int(os.environ.get("ARIA_CONNECTIONS", 16)),
+            help="aria2c connections per server (1-16)",
+        )
+
+        parser.add_argument(
+            "--aria-split",
+            type=int,
+            default=int(os.environ.get("ARIA_SPLIT", 16)),
+            help="aria2c pieces per file and fragments fetched in parallel",
+        )
+
+        parser.add_argument(
+            "--aria-min-split-size",
+            type=aria_size,
+            default=os.environ.get("ARIA_MIN_SPLIT_SIZE", "1M"),
+            help="Smallest piece aria2c splits a file into, e.g. 1M or 512K",
+        )
+
+        parser.add_argument(
+            "--ytdlp-profile",
+            type=str,
+            choices=tuple(TUNING_PROFILES),
+            default=os.environ.get("YTDLP_PROFILE", DEFAULT_PROFILE),
+            help="yt-dlp download tuning preset: polite, balanced (default) or fast-lan",
+        )
+
+        parser.add_argument(
+            "--fragment-concurrency",
+            type=int,
+            default=int(os.environ["FRAGMENT_CONCURRENCY"]) if os.environ.get("FRAGMENT_CONCURRENCY") else None,
+            help="HLS/DASH fragments yt-dlp downloads in parallel (overrides the profile)",
+        )
+
+        parser.add_argument(
+            "--rate-limit",
+            type=byte_size,
+            default=byte_size(os.environ["RATE_LIMIT"]) if os.environ.get("RATE_LIMIT") else None,
+            help="Download speed cap per yt-dlp download in bytes/s, e.g. 2M (overrides the profile)",
+        )
+
+        parser.add_argument(
+            "--buffer-size",
+            type=byte_size,
+            default=byte_size(os.environ["BUFFER_SIZE"]) if os.environ.get("BUFFER_SIZE") else None,
+            help="yt-dlp download buffer size, e.g. 1M (overrides the profile)",
+        )
+
+        parser.add_argument(
+            "--http-chunk-size",
+            type=byte_size,
+            default=byte_size(os.environ["HTTP_CHUNK_SIZE"]) if os.environ.get("HTTP_CHUNK_SIZE") else None,
+            help="Download plain files in ranged chunks of this size, e.g. 10M (overrides the profile)",
+        )
+
         parser.add_argument(
             "-l",
             "--link",
@@ -131,12 +207,220 @@ class Main:
             help="Season number to skip prompt",
         )
 
+        parser.add_argument(
+            "--capture-backend",
+            type=str,
+            choices=("wire", "cdp"),
+            default=os.environ.get("CAPTURE_BACKEND", "wire"),
+            help="How episode media requests are captured: selenium-wire proxy (wire) or DevTools events (cdp)",
+        )
+
+        parser.add_argument(
+            "--block-requests",
+            action=argparse.BooleanOptionalAction,
+            default=(os.environ.get("BLOCK_REQUESTS", "true").lower() == "true"),
+            help="Keep the headless browsers from loading ads, trackers and the resource types in --block-types "
+            "(default: on)",
+        )
+
+        parser.add_argument(
+            "--block-types",
+            type=resource_types,
+            default=os.environ.get("BLOCK_TYPES", "image,font"),
+            help="Comma-separated resource types the browsers do not load: image, font, stylesheet or none",
+        )
+
+        parser.add_argument(
+            "--block-patterns",
+            type=split_list,
+            default=os.environ.get("BLOCK_PATTERNS", ""),
+            help="Extra comma-separated URL patterns (with * wildcards) the browsers do not load",
+        )
+
+        parser.add_argument(
+            "--capture-deadline",
+            type=float,
+            default=float(os.environ.get("CAPTURE_DEADLINE", 60)),
+            help="Seconds after opening an episode page before the browser capture gives up on finding a stream",
+        )
+
+        parser.add_argument(
+            "--subtitle-grace",
+            type=float,
+            default=float(os.environ.get("SUBTITLE_GRACE", 5)),
+            help="Seconds the capture keeps waiting for subtitles once the stream was found",
+        )
+
+        parser.add_argument(
+            "--capture-idle-refresh",
+            type=float,
+            default=float(os.environ.get("CAPTURE_IDLE_REFRESH", 15)),
+            help="Refresh the episode page after this many seconds without network activity (at most twice)",
+        )
+
+        parser.add_argument(
+            "--resolver",
+            type=str,
+            choices=("auto", "http", "browser"),
+            default=os.environ.get("RESOLVER", "auto"),
+            help="How episode streams are resolved: AJAX endpoints (http), headless Chrome (browser) "
+            "or HTTP with browser fallback (auto, default)",
+        )
+
+        parser.add_argument(
+            "--stream-cache-ttl",
+            type=int,
+            default=int(os.environ.get("STREAM_CACHE_TTL", 6 * 3600)),
+            help="Seconds a resolved episode stream is reused by later runs (0 disables the cache)",
+        )
+
+        parser.add_argument(
+            "--quality",
+            type=str,
+            default=os.environ.get("QUALITY", "best"),
+            help="HLS variant to download: best, worst, or a target height such as 720 or 1080p",
+        )
+
+        parser.add_argument(
+            "--max-bitrate",
+            type=int,
+            default=int(os.environ.get("MAX_BITRATE", 0)),
+            help="Skip HLS variants above this bitrate in kbps (0 = no cap)",
+        )
+
+        parser.add_argument(
+            "--engine",
+            type=str,
+            choices=("yt-dlp", "native"),
+            default=os.environ.get("DOWNLOAD_ENGINE", "yt-dlp"),
+            help="Video download engine: yt-dlp (default) or the built-in concurrent HLS downloader (native)",
+        )
+
+        parser.add_argument(
+            "--hls-concurrency",
+            type=int,
+            default=int(os.environ.get("HLS_CONCURRENCY", 8)),
+            help="Segments fetched in parallel per episode by the native engine",
+        )
+
+        parser.add_argument(
+            "--skip-existing",
+            action=argparse.BooleanOptionalAction,
+            default=(os.environ.get("SKIP_EXISTING", "true").lower() == "true"),
+            help="Skip episodes whose video is already in the output folder and passes verification (default: on)",
+        )
+
+        parser.add_argument(
+            "--resolve-mode",
+            type=str,
+            choices=("drivers", "tabs"),
+            default=os.environ.get("RESOLVE_MODE", "drivers"),
+            help="Resolve episodes in a browser each (drivers) or as isolated tabs of one shared browser (tabs)",
+        )
+
+        parser.add_argument(
+            "--resolve-workers",
+            type=int,
+            default=int(os.environ["RESOLVE_WORKERS"]) if os.environ.get("RESOLVE_WORKERS") else None,
+            help="Episodes resolved in parallel (browsers, or tabs with --resolve-mode tabs); defaults to what fits "
+            "into available memory, at most 4, or 8 tabs",
+        )
+
+        parser.add_argument(
+            "--download-workers",
+            type=int,
+            default=int(os.environ.get("DOWNLOAD_WORKERS", 3)),
+            help="Episodes downloaded in parallel",
+        )
+
+        parser.add_argument(
+            "--browser-slots",
+            type=int,
+            default=int(os.environ["BROWSER_SLOTS"]) if os.environ.get("BROWSER_SLOTS") else None,
+            help="Browsers allowed at once across all jobs on this host; defaults to what fits into memory",
+        )
+
+        parser.add_argument(
+            "--episode-retries",
+            type=int,
+            default=int(os.environ.get("EPISODE_RETRIES", 2)),
+            help="Times a failed episode is re-queued before it is given up (0 disables retries)",
+        )
+
+        parser.add_argument(
+            "--retry-backoff",
+            type=float,
+            default=float(os.environ.get("RETRY_BACKOFF", 30)),
+            help="Seconds before the first retry of an episode; doubled for every further retry",
+        )
+
+        parser.add_argument(
+            "--episode-deadline",
+            type=float,
+            default=float(os.environ.get("EPISODE_DEADLINE", 3600)),
+            help="Seconds after its first attempt during which an episode may still be retried",
+        )
+
+        parser.add_argument(
+            "--retry-budget",
+            type=int,
+            default=int(os.environ.get("RETRY_BUDGET", 20)),
+            help="Retries allowed per job over all episodes",
+        )
+
+        parser.add_argument(
+            "--http-timeout",
+            type=float,
+            default=float(os.environ.get("HTTP_TIMEOUT", 15)),
+            help="Timeout in seconds for page, API, playlist and subtitle requests made outside the browser",
+        )
+
+        parser.add_argument(
+            "--http-retries",
+            type=int,
+            default=int(os.environ.get("HTTP_RETRIES", 3)),
+            help="Retries for failed connections and 429/5xx answers on those requests",
+        )
+
+        parser.add_argument(
+            "--adaptive-pacing",
+            action=argparse.BooleanOptionalAction,
+            default=(os.environ.get("ADAPTIVE_PACING", "true").lower() == "true"),
+            help="Adapt the request rate per host to 403/429/5xx answers (default: on)",
+        )
+
+        parser.add_argument(
+            "--max-request-rate",
+            type=float,
+            default=float(os.environ.get("MAX_REQUEST_RATE", 20)),
+            help="Highest requests per second per host that adaptive pacing ramps up to",
+        )
+
+        parser.add_argument(
+            "--http2",
+            action="store_true",
+            default=(os.environ.get("HTTP2", "false").lower() == "true"),
+            help="Use HTTP/2 for those requests when httpx is installed",
+        )
+
         return parser.parse_args()
 
 
+def interrupt(signum, frame):
+    # stop on SIGTERM (WebGUI pause/cancel, container stop) the same way as on Ctrl+C
+    raise KeyboardInterrupt
+
+
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, interrupt)
     start = time.time()
-    Main()
+    try:
+        Main()
+    except KeyboardInterrupt:
+        print(f"\n{Fore.LIGHTYELLOW_EX}Interrupted, partial downloads are kept and resume on the next run")
+        sys.stdout.flush()
+        # download threads are not waited for; their checkpoints are already on disk
+        os._exit(130)
     elapsed = time.time() - start
     mm = int(elapsed // 60)
     ss = int(elapsed % 60)
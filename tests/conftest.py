@@ -0,0 +1,74 @@
+"""
+Shared fixtures: a local stand-in HTTP server serving canned responses.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class StandInServer:
+    """
+    Serves ``routes`` (path with query -> (status, body, content type)) and records requests.
+
+    ``delay`` adds latency to every response; ``failures`` maps a path to the number of 503
+    answers given before the route is served.
+    """
+
+    def __init__(self):
+        self.routes: dict[str, tuple[int, bytes, str]] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.failures: dict[str, int] = {}
+        self.delay = 0.0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    failing = server.failures.get(self.path, 0) > 0
+                    if failing:
+                        server.failures[self.path] -= 1
+                if server.delay:
+                    time.sleep(server.delay)
+
+                status, body, content_type = server.routes.get(self.path, (404, b"not found", "text/plain"))
+                if failing:
+                    status, body, content_type = 503, b"unavailable", "text/plain"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def add(self, path: str, body: bytes | str, status: int = 200, content_type: str = "application/json"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.routes[path] = (status, body, content_type)
+
+    def hits(self, path: str) -> int:
+        return sum(1 for p, _ in self.requests if p == path)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stand_in_server():
+    server = StandInServer()
+    yield server
+    server.close()
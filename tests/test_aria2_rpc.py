@@ -0,0 +1,160 @@
+"""
+Tests for queueing downloads on the aria2 daemon, against an in-process stand-in for its RPC client.
+"""
+
+import os
+
+import pytest
+
+from extractors import general
+from extractors.general import GeneralExtractor
+from tools.aria2_rpc import Aria2RpcDownloader, Aria2RpcError, fragment_dir
+from tools.hls_downloader import parse_media_playlist
+
+
+class FakeAria2Client:
+    """Completes every download immediately; URLs in ``failing`` error that many times first."""
+
+    def __init__(self, files: dict[str, bytes], failing: dict[str, int] | None = None):
+        self.files = files
+        self.failing = failing or {}
+        self.statuses: dict[str, dict] = {}
+        self.added: list[tuple[str, dict]] = []
+
+    def add_uri(self, uris, options):
+        url = uris[0]
+        gid = f"{len(self.added):016x}"
+        self.added.append((url, options))
+        if self.failing.get(url, 0) > 0:
+            self.failing[url] -= 1
+            self.statuses[gid] = {"gid": gid, "status": "error", "dir": options["dir"], "errorMessage": "boom"}
+        else:
+            with open(os.path.join(options["dir"], options["out"]), "wb") as file:
+                file.write(self.files[url])
+            self.statuses[gid] = {"gid": gid, "status": "complete", "dir": options["dir"]}
+        return gid
+
+    def tell_active(self, keys=None):
+        return []
+
+    def tell_waiting(self, offset, num, keys=None):
+        return []
+
+    def tell_stopped(self, offset, num, keys=None):
+        return list(self.statuses.values())
+
+    def remove_download_result(self, gid):
+        self.statuses.pop(gid, None)
+        return "OK"
+
+
+def playlist(count: int):
+    text = "#EXTM3U\n" + "".join(f"#EXTINF:4,\nseg{i}.ts\n" for i in range(count)) + "#EXT-X-ENDLIST\n"
+    return parse_media_playlist(text, "https://cdn.example/hls/index.m3u8")
+
+
+def segment(i: int) -> bytes:
+    return bytes([0x47, i]) * 94
+
+
+def test_hls_segments_are_joined_in_order(tmp_path):
+    files = {f"https://cdn.example/hls/seg{i}.ts": segment(i) for i in range(5)}
+    client = FakeAria2Client(files)
+    location = str(tmp_path / "Show - s01e02 - Title.ts")
+
+    stats = Aria2RpcDownloader(client, poll_interval=0).download_hls(playlist(5), {"Referer": "r"}, location)
+
+    assert open(location, "rb").read() == b"".join(segment(i) for i in range(5))
+    assert stats["segments"] == 5
+    assert stats["duration"] == 20
+    assert not os.path.exists(fragment_dir(location))
+    assert all(options["header"] == ["Referer: r"] for _, options in client.added)
+    assert client.statuses == {}  # finished results are removed from the daemon
+
+
+def test_finished_segments_are_not_requested_again(tmp_path):
+    """Segments completed by an earlier run (no .aria2 control file) are reused."""
+    files = {f"https://cdn.example/hls/seg{i}.ts": segment(i) for i in range(3)}
+    client = FakeAria2Client(files)
+    location = str(tmp_path / "ep.ts")
+    os.makedirs(fragment_dir(location))
+    with open(os.path.join(fragment_dir(location), "frag00000"), "wb") as file:
+        file.write(segment(0))
+    with open(os.path.join(fragment_dir(location), "frag00001"), "wb") as file:
+        file.write(b"partial")
+    with open(os.path.join(fragment_dir(location), "frag00001.aria2"), "wb") as file:
+        file.write(b"control")
+
+    Aria2RpcDownloader(client, poll_interval=0).download_hls(playlist(3), {}, location)
+
+    assert [url for url, _ in client.added] == [
+        "https://cdn.example/hls/seg1.ts",
+        "https://cdn.example/hls/seg2.ts",
+    ]
+    assert open(location, "rb").read() == b"".join(segment(i) for i in range(3))
+
+
+def test_failed_downloads_are_re_added(tmp_path):
+    url = "https://cdn.example/subs/eng.vtt"
+    client = FakeAria2Client({url: b"WEBVTT\n"}, failing={url: 2})
+
+    Aria2RpcDownloader(client, poll_interval=0, retries=2).download_file(url, {}, str(tmp_path / "ep.vtt"))
+
+    assert (tmp_path / "ep.vtt").read_bytes() == b"WEBVTT\n"
+    assert len(client.added) == 3
+
+
+def test_gives_up_after_retries(tmp_path):
+    url = "https://cdn.example/subs/eng.vtt"
+    client = FakeAria2Client({url: b""}, failing={url: 5})
+
+    with pytest.raises(Aria2RpcError, match="boom"):
+        Aria2RpcDownloader(client, poll_interval=0, retries=1).download_file(url, {}, str(tmp_path / "ep.vtt"))
+
+
+def test_encrypted_playlists_are_rejected(tmp_path):
+    encrypted = parse_media_playlist(
+        '#EXTM3U\n#EXT-X-KEY:METHOD=AES-128,URI="k"\n#EXTINF:4,\nseg0.ts\n', "https://cdn.example/index.m3u8"
+    )
+    with pytest.raises(Aria2RpcError):
+        Aria2RpcDownloader(FakeAria2Client({}), poll_interval=0).download_hls(encrypted, {}, str(tmp_path / "ep.ts"))
+
+
+class FakeYoutubeDL:
+    """Resolves every URL to ``info``; records the options it was created with."""
+
+    info: dict = {}
+    options: list[dict] = []
+
+    def __init__(self, options):
+        self.options.append(options)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=False):
+        return self.info
+
+    def prepare_filename(self, info):
+        return self.options[-1]["outtmpl"]
+
+
+def test_split_formats_are_left_to_yt_dlp(monkeypatch, tmp_path):
+    split = {
+        "protocol": "https+https",
+        "requested_formats": [
+            {"url": "https://cdn.example/video.mp4", "protocol": "https"},
+            {"url": "https://cdn.example/audio.m4a", "protocol": "https"},
+        ],
+    }
+    monkeypatch.setattr(FakeYoutubeDL, "info", split)
+    monkeypatch.setattr(FakeYoutubeDL, "options", [])
+    monkeypatch.setattr(general, "YoutubeDL", FakeYoutubeDL)
+    monkeypatch.setattr(general, "Aria2RpcDownloader", lambda **kwargs: pytest.fail("queued on aria2"))
+
+    options = {"format": "bv*+ba/best", "outtmpl": str(tmp_path / "ep.mp4")}
+    assert GeneralExtractor.submit_to_aria2("https://video.example/watch/1", options) is False
+    assert FakeYoutubeDL.options[0]["format"] == "bv*+ba/best"
@@ -0,0 +1,80 @@
+"""
+Tests for the browser request blocklist and the DevTools blocker that applies it.
+"""
+
+import argparse
+
+import pytest
+
+from tools.blocklist import Blocklist, resource_types
+from tools.cdp import CdpRequestBlocker
+
+
+class FakeConnection:
+    """Records sent DevTools commands; events are delivered by calling the listener."""
+
+    def __init__(self):
+        self.sent = []
+        self.listeners = []
+        self.closed = False
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def send(self, method, params=None, session_id=None, wait=True, timeout=10):
+        self.sent.append((method, params, session_id))
+        if method == "Target.getTargets":
+            return {"targetInfos": [{"type": "iframe", "targetId": "f"}, {"type": "page", "targetId": "p"}]}
+        if method == "Target.attachToTarget":
+            return {"sessionId": "page-session"}
+        return {}
+
+    def emit(self, method, params, session_id):
+        for listener in self.listeners:
+            listener(method, params, session_id)
+
+    def close(self):
+        self.closed = True
+
+
+def test_url_patterns_cover_types_domains_and_extra_patterns():
+    patterns = Blocklist(patterns=("*/banner/*",), resource_types=("font",), domains=("ads.example",)).url_patterns()
+
+    assert patterns[0] == "*/banner/*"
+    assert "*.woff2" in patterns and "*.woff2?*" in patterns
+    assert "*://*ads.example/*" in patterns
+    assert not any("png" in pattern for pattern in patterns)
+
+
+def test_default_blocklist_keeps_stylesheets_and_manifests():
+    patterns = Blocklist().url_patterns()
+    assert "*.png" in patterns
+    assert not any(pattern.startswith("*.css") or "m3u8" in pattern or "vtt" in pattern for pattern in patterns)
+
+
+def test_resource_type_argument():
+    assert resource_types("image, font") == ("image", "font")
+    assert resource_types("none") == ()
+    with pytest.raises(argparse.ArgumentTypeError):
+        resource_types("image,video")
+
+
+def test_blocker_applies_to_page_and_iframes_and_counts_blocked_requests():
+    connection = FakeConnection()
+    blocker = CdpRequestBlocker(connection, ["*.png"])
+    assert ("Network.setBlockedURLs", {"urls": ["*.png"]}, "page-session") in connection.sent
+
+    connection.emit("Target.attachedToTarget", {"sessionId": "iframe-session"}, "page-session")
+    assert ("Network.setBlockedURLs", {"urls": ["*.png"]}, "iframe-session") in connection.sent
+
+    connection.emit("Network.requestWillBeSent", {"requestId": "1", "request": {"url": "https://ads.example/a.png"}}, "s")
+    connection.emit("Network.loadingFailed", {"requestId": "1", "blockedReason": "inspector"}, "s")
+    connection.emit("Network.requestWillBeSent", {"requestId": "2", "request": {"url": "https://cdn.example/x"}}, "s")
+    connection.emit("Network.loadingFailed", {"requestId": "2", "errorText": "net::ERR_FAILED"}, "s")
+    connection.emit("Network.requestWillBeSent", {"requestId": "3", "request": {"url": "https://cdn.example/y"}}, "s")
+    connection.emit("Network.loadingFinished", {"requestId": "3"}, "s")
+
+    assert blocker.blocked == 1
+    assert blocker.counts() == {"ads.example": 1}
+    blocker.stop()
+    assert connection.closed
@@ -0,0 +1,153 @@
+"""
+Tests for the host-wide browser slot limit and the memory measurements behind it.
+"""
+
+import os
+import threading
+import time
+
+from tools.browser_slots import (
+    BROWSER_WARMUP,
+    DEFAULT_BROWSER_MB,
+    BrowserSlots,
+    RssSampler,
+    available_memory_mb,
+    process_started_at,
+    process_tree_rss_mb,
+)
+
+
+def test_fixed_capacity_blocks_until_a_slot_is_released(tmp_path):
+    slots = BrowserSlots(str(tmp_path / "slots.db"), capacity=1, poll_interval=0.01)
+    first = slots.acquire("job 1")
+    queued = []
+    acquired = threading.Event()
+
+    def second():
+        slots.acquire("job 2", on_wait=lambda in_use, capacity: queued.append((in_use, capacity)))
+        acquired.set()
+
+    thread = threading.Thread(target=second)
+    thread.start()
+    assert not acquired.wait(0.2)
+
+    slots.release(first)
+    assert acquired.wait(2)
+    thread.join()
+    assert queued == [(1, 1)]
+    assert slots.waits == 1
+
+
+def test_slots_are_shared_through_the_database(tmp_path):
+    path = str(tmp_path / "slots.db")
+    job_a = BrowserSlots(path, capacity=2)
+    job_b = BrowserSlots(path, capacity=2)
+
+    with job_a.slot("a"), job_b.slot("b"):
+        assert job_a.in_use() == 2
+    assert job_b.in_use() == 0
+
+
+def test_slots_of_dead_processes_are_reclaimed(tmp_path):
+    slots = BrowserSlots(str(tmp_path / "slots.db"), capacity=1, poll_interval=0.01)
+    with slots._connect() as conn:
+        # a pid far above pid_max never belongs to a running process
+        conn.execute("INSERT INTO slots (pid, owner, acquired_at) VALUES (?, 'crashed', 0)", (2**31 - 1,))
+
+    slot = slots.acquire("job")
+
+    assert slots.in_use() == 1
+    slots.release(slot)
+
+
+def test_slots_of_a_reused_pid_are_reclaimed(tmp_path):
+    # after a container restart this process can have the pid of a crashed one that held a slot
+    started = 1_000_000.0
+    slots = BrowserSlots(str(tmp_path / "slots.db"), capacity=1, poll_interval=0.01, started_at=lambda pid: started)
+    with slots._connect() as conn:
+        conn.execute("INSERT INTO slots (pid, owner, acquired_at) VALUES (?, 'crashed', ?)", (os.getpid(), started - 60))
+
+    slot = slots.acquire("job")
+    with slots._connect() as conn:
+        assert conn.execute("SELECT owner FROM slots").fetchall() == [("job",)]
+
+    # a slot taken after the process started is its own and stays
+    with slots._connect() as conn:
+        conn.execute("UPDATE slots SET acquired_at = ?", (started + 60,))
+    assert slots._try_acquire("other", DEFAULT_BROWSER_MB)[0] is None
+    slots.release(slot)
+
+
+def test_capacity_follows_memory_and_measured_browser_size(tmp_path):
+    slots = BrowserSlots(str(tmp_path / "slots.db"), memory=lambda: 4000)
+    assert slots.browser_mb() == DEFAULT_BROWSER_MB
+    # 75% of 4000 MB at 600 MB per browser
+    assert slots._capacity(0, slots.browser_mb()) == 5
+
+    slots.record_rss(1000)
+    slots.record_rss(500)
+    assert slots.browser_mb() == 900
+    # two running browsers already use part of the memory counted against them
+    assert slots._capacity(2, 900) == 4
+
+
+def test_a_startup_burst_stops_at_what_the_memory_holds(tmp_path):
+    """Browsers just admitted have not used their memory yet, so they must not raise the capacity."""
+    now = [time.time()]
+    slots = BrowserSlots(str(tmp_path / "slots.db"), memory=lambda: 6000, clock=lambda: now[0])
+
+    admitted = 0
+    while slots._try_acquire("burst", DEFAULT_BROWSER_MB)[0] is not None:
+        admitted += 1
+        assert admitted < 20
+    # 75% of 6000 MB at 600 MB per browser
+    assert admitted == 7
+
+    # once they settled the available memory reflects them; here it did not drop, so more fit
+    now[0] += BROWSER_WARMUP
+    assert slots._try_acquire("later", DEFAULT_BROWSER_MB)[0] is not None
+
+
+def test_memory_uses_the_tighter_of_meminfo_and_cgroup(tmp_path):
+    meminfo = tmp_path / "meminfo"
+    meminfo.write_text("MemTotal: 8000000 kB\nMemAvailable: 4194304 kB\n")
+    cgroup = tmp_path / "cgroup"
+    cgroup.mkdir()
+    assert available_memory_mb(str(cgroup), str(meminfo)) == 4096
+
+    (cgroup / "memory.max").write_text(str(3 * 1024**3))
+    (cgroup / "memory.current").write_text(str(1024**3))
+    assert available_memory_mb(str(cgroup), str(meminfo)) == 2048
+
+    (cgroup / "memory.max").write_text("max")
+    assert available_memory_mb(str(cgroup), str(meminfo)) == 4096
+
+
+def test_process_tree_rss_includes_this_process():
+    rss = process_tree_rss_mb(os.getpid())
+    assert rss is not None and rss > 1
+
+
+def test_rss_sampler_sums_running_browsers():
+    running = [[], [1, 2], [2]]
+    sizes = {1: 300.0, 2: 500.0}
+    sampler = RssSampler(lambda: running.pop(0), measure=sizes.get)
+
+    assert sampler.sample() == 0
+    assert sampler.sample() == 800
+    assert sampler.sample() == 500
+    # stretches without a browser do not count towards the average
+    assert sampler.samples == 2
+    assert sampler.peak_mb == 800
+    assert sampler.average_mb == 650
+
+
+def test_process_started_at_reads_proc(tmp_path):
+    (tmp_path / "42").mkdir()
+    ticks = os.sysconf("SC_CLK_TCK")
+    fields = ["S"] + ["0"] * 18 + [str(50 * ticks)]
+    (tmp_path / "42" / "stat").write_text(f"42 (chrome (renderer)) {' '.join(fields)} 0 0\n")
+    (tmp_path / "stat").write_text("cpu  1 2 3\nbtime 1000\n")
+
+    assert process_started_at(42, proc=str(tmp_path)) == 1050
+    assert process_started_at(43, proc=str(tmp_path)) is None
@@ -0,0 +1,161 @@
+"""
+Tests for incremental request scanning.
+"""
+
+import threading
+from types import SimpleNamespace
+
+from tools.capture import CapturePolicy, CaptureWindow, WireRequestFeed
+
+
+class FakeDiskStorage:
+    """Mimics selenium-wire's on-disk RequestStorage index."""
+
+    def __init__(self):
+        self._index = []
+        self._lock = threading.Lock()
+        self.loaded = []
+
+    def add(self, request_id, url, has_response=True):
+        entry = SimpleNamespace(id=request_id, url=url, has_response=has_response)
+        self._index.append(entry)
+        return entry
+
+    def _load_request(self, request_id):
+        self.loaded.append(request_id)
+        entry = next(e for e in self._index if e.id == request_id)
+        return SimpleNamespace(url=entry.url, headers={"Referer": "https://example.com"})
+
+
+def make_feed(url_filter=None, activity=None):
+    storage = FakeDiskStorage()
+    driver = SimpleNamespace(backend=SimpleNamespace(storage=storage))
+    return WireRequestFeed(driver, url_filter, activity), storage
+
+
+def test_each_request_is_examined_once():
+    """Requests from previous polls are not scanned again."""
+    feed, storage = make_feed()
+    storage.add("1", "https://cdn/a.m3u8")
+    assert [url for url, _ in feed.poll()] == ["https://cdn/a.m3u8"]
+
+    storage.add("2", "https://cdn/b.vtt")
+    assert [url for url, _ in feed.poll()] == ["https://cdn/b.vtt"]
+    assert feed.poll() == []
+    assert feed.examined == 2
+    assert storage.loaded == ["1", "2"]
+
+
+def test_request_without_response_is_revisited():
+    """A request is yielded once its response arrives."""
+    feed, storage = make_feed()
+    entry = storage.add("1", "https://cdn/a.m3u8", has_response=False)
+    assert feed.poll() == []
+
+    entry.has_response = True
+    assert len(feed.poll()) == 1
+    assert feed.poll() == []
+
+
+def test_filtered_requests_are_not_loaded():
+    """Non-matching requests are skipped using the index URL only."""
+    feed, storage = make_feed(lambda uri: ".m3u8" in uri)
+    storage.add("1", "https://ads/banner.png")
+    storage.add("2", "https://cdn/master.m3u8")
+
+    assert [url for url, _ in feed.poll()] == ["https://cdn/master.m3u8"]
+    assert storage.loaded == ["2"]
+    assert feed.total == 2
+    assert feed.examined == 1
+
+
+def test_activity_comes_from_the_unscoped_source():
+    """The scoped store misses the page's other requests, the blocker's connection sees them all."""
+    sent = [0]
+    feed, storage = make_feed(lambda uri: ".m3u8" in uri, activity=lambda: sent[0])
+    sent[0] = 12
+    assert feed.poll() == []
+    assert feed.activity == 12
+
+    storage.add("1", "https://cdn/master.m3u8")
+    sent[0] = 13
+    feed.poll()
+    assert feed.activity == 13
+
+
+def test_without_an_unscoped_source_only_recorded_requests_count():
+    feed, storage = make_feed()
+    storage.add("1", "https://cdn/master.m3u8")
+    storage.add("2", "https://cdn/eng.vtt")
+    feed.poll()
+    assert feed.activity == 2
+
+
+def test_cleared_storage_resets_cursor():
+    """Clearing the driver's requests starts the scan from the beginning again."""
+    feed, storage = make_feed()
+    storage.add("1", "https://cdn/a.m3u8")
+    storage.add("2", "https://cdn/b.m3u8")
+    feed.poll()
+
+    storage._index.clear()
+    storage.add("3", "https://cdn/c.m3u8")
+    assert [url for url, _ in feed.poll()] == ["https://cdn/c.m3u8"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_window(**policy):
+    clock = FakeClock()
+    return CaptureWindow(CapturePolicy(**policy), clock=clock), clock
+
+
+def test_subtitle_grace_starts_with_the_stream():
+    window, clock = make_window(subtitle_grace=5)
+    clock.now = 3
+    assert window.next_action(True, False, 10) == "wait"
+    clock.now = 7.9
+    assert window.next_action(True, False, 10) == "wait"
+    clock.now = 8
+    assert window.next_action(True, False, 10) == "done"
+    assert window.outcome == "no subtitles within the grace window"
+
+
+def test_done_as_soon_as_both_are_found():
+    window, clock = make_window()
+    clock.now = 2
+    assert window.next_action(True, True, 4) == "done"
+    assert window.elapsed == 2
+
+
+def test_idle_page_is_refreshed_a_limited_number_of_times():
+    window, clock = make_window(idle_refresh=10, max_refreshes=1, deadline=100)
+    clock.now = 5
+    assert window.next_action(False, False, 3) == "wait"
+    clock.now = 14
+    assert window.next_action(False, False, 3) == "wait"
+    clock.now = 15
+    assert window.next_action(False, False, 3) == "refresh"
+    clock.now = 40
+    assert window.next_action(False, False, 3) == "wait"
+    assert window.refreshes == 1
+
+
+def test_network_activity_postpones_the_refresh():
+    window, clock = make_window(idle_refresh=10)
+    for second, seen in ((8, 1), (16, 2), (24, 3)):
+        clock.now = second
+        assert window.next_action(False, False, seen) == "wait"
+
+
+def test_deadline_without_a_stream():
+    window, clock = make_window(deadline=30, idle_refresh=100)
+    clock.now = 30
+    assert window.next_action(False, False, 0) == "timeout"
+    assert window.outcome == "no stream within 30s"
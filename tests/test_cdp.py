@@ -0,0 +1,146 @@
+"""
+Tests for DevTools tabs: isolation per browser context and per-tab attribution of captured requests.
+"""
+
+import itertools
+
+from tools.capture import CapturePolicy, CaptureWindow, SnifferRequestFeed
+from tools.cdp import CdpTab
+
+
+class FakeConnection:
+    """Answers the commands a tab sends; events are delivered by calling the listeners."""
+
+    def __init__(self):
+        self.sent = []
+        self.listeners = []
+        self._ids = itertools.count(1)
+
+    def add_listener(self, listener):
+        self.listeners = self.listeners + [listener]
+
+    def remove_listener(self, listener):
+        self.listeners = [known for known in self.listeners if known != listener]
+
+    def send(self, method, params=None, session_id=None, wait=True, timeout=10):
+        self.sent.append((method, params, session_id))
+        n = next(self._ids)
+        if method == "Target.createBrowserContext":
+            return {"browserContextId": f"context-{n}"}
+        if method == "Target.createTarget":
+            return {"targetId": f"target-{n}"}
+        if method == "Target.attachToTarget":
+            return {"sessionId": f"page-{n}"}
+        if method == "Runtime.evaluate":
+            return {"result": {"value": [session_id, params["expression"]]}}
+        return {}
+
+    def emit(self, method, params, session_id):
+        for listener in self.listeners:
+            listener(method, params, session_id)
+
+    def response(self, session_id, request_id, url):
+        self.emit("Network.requestWillBeSent", {"requestId": request_id, "request": {"url": url}}, session_id)
+        self.emit("Network.responseReceived", {"requestId": request_id, "response": {"status": 200}}, session_id)
+
+
+def media(url):
+    return ".m3u8" in url or ".vtt" in url
+
+
+def test_each_tab_gets_its_own_browser_context():
+    connection = FakeConnection()
+    first = CdpTab(connection, media, blocked_patterns=["*.png"], user_agent="iPhone")
+    second = CdpTab(connection, media)
+
+    assert first.context_id != second.context_id
+    create = [params for method, params, _ in connection.sent if method == "Target.createTarget"]
+    assert [params["browserContextId"] for params in create] == [first.context_id, second.context_id]
+    assert ("Network.setBlockedURLs", {"urls": ["*.png"]}, first.session_id) in connection.sent
+    assert ("Emulation.setUserAgentOverride", {"userAgent": "iPhone"}, first.session_id) in connection.sent
+    assert not any(m == "Network.setBlockedURLs" and s == second.session_id for m, _, s in connection.sent)
+
+
+def test_requests_are_attributed_to_the_tab_and_its_iframes():
+    connection = FakeConnection()
+    first = CdpTab(connection, media)
+    second = CdpTab(connection, media)
+
+    # the player iframe of the first tab attaches through its page session
+    connection.emit(
+        "Target.attachedToTarget", {"sessionId": "player", "targetInfo": {"type": "iframe"}}, first.session_id
+    )
+    assert first.frames() == ["player"]
+    assert ("Network.enable", None, "player") in connection.sent
+
+    connection.response("player", "1", "https://cdn.example/master.m3u8")
+    connection.response(second.session_id, "1", "https://other.example/index.m3u8")
+    connection.response(first.session_id, "2", "https://hianime.example/app.js")
+    connection.response("browser-level", "3", "https://stray.example/x.vtt")
+
+    assert [(r.url, r.session_id) for r in second.drain()] == [
+        ("https://other.example/index.m3u8", second.session_id)
+    ]
+    # the capture loop reads a tab like the CDP sniffer
+    feed = SnifferRequestFeed(first, wait=0.01)
+    assert [url for url, _ in feed.poll()] == ["https://cdn.example/master.m3u8"]
+
+
+def test_page_loading_other_requests_is_not_idle():
+    """Scripts and XHRs of a slow player count as activity even though none of them is media."""
+    connection = FakeConnection()
+    tab = CdpTab(connection, media)
+    feed = SnifferRequestFeed(tab, wait=0)
+    now = [0.0]
+    window = CaptureWindow(CapturePolicy(idle_refresh=10, deadline=100), clock=lambda: now[0])
+
+    for second in range(5, 30, 5):
+        now[0] = second
+        connection.response(tab.session_id, str(second), f"https://hianime.example/player-{second}.js")
+        assert feed.poll() == []
+        assert window.next_action(False, False, feed.activity) == "wait"
+    assert feed.activity == 5
+
+    now[0] = 40
+    assert window.next_action(False, False, feed.activity) == "refresh"
+
+
+def test_blocked_requests_and_evaluation_per_frame():
+    connection = FakeConnection()
+    tab = CdpTab(connection, media, blocked_patterns=["*.png"])
+    connection.emit(
+        "Network.requestWillBeSent", {"requestId": "1", "request": {"url": "https://ads.example/a.png"}}, tab.session_id
+    )
+    connection.emit("Network.loadingFailed", {"requestId": "1", "blockedReason": "inspector"}, tab.session_id)
+    assert tab.blocked == 1
+    assert tab.counts() == {"ads.example": 1}
+    assert tab.counter.sent == 1
+
+    assert tab.evaluate("1 + 1") == [tab.session_id, "1 + 1"]
+    assert tab.evaluate("2", "player") == ["player", "2"]
+
+
+def test_navigate_returns_at_dom_content_loaded():
+    connection = FakeConnection()
+    tab = CdpTab(connection, media)
+    original_send = connection.send
+
+    def send(method, params=None, session_id=None, wait=True, timeout=10):
+        result = original_send(method, params, session_id, wait, timeout)
+        if method == "Page.navigate":
+            connection.emit("Page.domContentEventFired", {}, tab.session_id)
+        return result
+
+    connection.send = send
+    tab.navigate("https://hianime.example/watch/1", timeout=1)
+    assert ("Page.navigate", {"url": "https://hianime.example/watch/1"}, tab.session_id) in connection.sent
+
+
+def test_close_drops_the_context_and_stops_listening():
+    connection = FakeConnection()
+    tab = CdpTab(connection, media)
+    tab.close()
+
+    assert ("Target.closeTarget", {"targetId": tab.target_id}, None) in connection.sent
+    assert ("Target.disposeBrowserContext", {"browserContextId": tab.context_id}, None) in connection.sent
+    assert connection.listeners == []
@@ -99,6 +99,26 @@ async def test_job_cancellation(db):
     assert job["finished_at"] is not None
 
 
+@pytest.mark.asyncio
+async def test_job_pause_and_requeue(db):
+    """A paused job is not active; requeueing makes it claimable again."""
+    job_id = await db.create_job(url="https://example.com/video")
+    await db.claim_job(job_id)
+    await db.start_job(job_id, pid=12345, log_file="/tmp/test.log")
+
+    await db.pause_job(job_id)
+    job = await db.get_job(job_id)
+    assert job["status"] == JobStatus.PAUSED.value
+    assert job["pid"] is None
+    assert await db.get_active_jobs() == []
+
+    await db.requeue_job(job_id, "Resuming")
+    job = await db.get_job(job_id)
+    assert job["status"] == JobStatus.QUEUED.value
+    assert job["progress_text"] == "Resuming"
+    assert await db.claim_job(job_id)
+
+
 @pytest.mark.asyncio
 async def test_get_jobs(db):
     """Test retrieving multiple jobs."""
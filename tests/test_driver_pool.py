@@ -0,0 +1,100 @@
+"""
+Tests for the warm browser driver pool.
+"""
+
+import threading
+
+import pytest
+
+from tools.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self, serial):
+        self.serial = serial
+        self.resets = 0
+        self.quit_called = False
+
+
+@pytest.fixture
+def pool():
+    created = []
+
+    def factory():
+        driver = FakeDriver(len(created) + 1)
+        created.append(driver)
+        return driver
+
+    def reset(driver):
+        driver.resets += 1
+
+    def dispose(driver):
+        driver.quit_called = True
+
+    pool = DriverPool(factory, reset, dispose, max_size=2, max_uses=3)
+    pool.created = created
+    yield pool
+    pool.close()
+
+
+def test_driver_is_reused_between_borrows(pool):
+    """A returned driver is reset and handed out again (pool hit)."""
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+
+    assert first is second
+    assert first.resets == 2
+    stats = pool.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["drivers_started"] == 1
+
+
+def test_driver_recycled_after_error(pool):
+    """A driver whose user raised is disposed instead of returned to the pool."""
+    with pytest.raises(RuntimeError):
+        with pool.driver() as driver:
+            raise RuntimeError("boom")
+
+    assert driver.quit_called
+    with pool.driver() as replacement:
+        assert replacement is not driver
+    assert pool.stats()["recycled"] == 1
+
+
+def test_driver_recycled_after_max_uses(pool):
+    """Drivers are recycled once they served max_uses pages."""
+    for _ in range(3):
+        with pool.driver() as driver:
+            pass
+    assert driver.quit_called
+    assert pool.stats()["recycled"] == 1
+
+
+def test_pool_is_bounded(pool):
+    """No more than max_size drivers are borrowed at the same time."""
+    borrowed = threading.Semaphore(0)
+    release = threading.Event()
+
+    def worker():
+        with pool.driver():
+            borrowed.release()
+            release.wait(timeout=5)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+
+    assert borrowed.acquire(timeout=2)
+    assert borrowed.acquire(timeout=2)
+    # third worker must wait for a free slot
+    assert not borrowed.acquire(timeout=0.2)
+    assert len(pool.created) == 2
+
+    release.set()
+    assert borrowed.acquire(timeout=2)
+    for t in threads:
+        t.join(timeout=2)
+    assert len(pool.created) == 2
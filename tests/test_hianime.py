@@ -0,0 +1,68 @@
+"""
+Tests for the HiAnime extractor: episodes already on disk and the browsers of a stopped job.
+"""
+
+from argparse import Namespace
+
+import pytest
+
+from extractors.hianime import Anime, HianimeExtractor
+from tools.media_check import MIN_EPISODE_SIZE
+
+SEGMENT = b"\x47" + b"\x11" * 187
+
+
+@pytest.fixture
+def extractor(tmp_path, monkeypatch):
+    monkeypatch.setenv("CONFIG_DIR", str(tmp_path / "config"))
+    return HianimeExtractor(Namespace(link=None, stream_cache_ttl=0, no_subtitles=True, server=None))
+
+
+def test_file_failing_verification_is_downloaded_again(extractor, stand_in_server, tmp_path):
+    """A corrupt file is not reported as "already downloaded" by yt-dlp and its size is not recorded."""
+    anime = Anime("Show", "https://hianime.example/show", 1, 0, "sub", 1)
+    episode = {"number": 1, "title": "Pilot", "url": "https://hianime.example/watch/show?ep=1"}
+    folder = f"{tmp_path}/"
+    location = tmp_path / "Show - s01e01 - Pilot.mp4"
+    location.write_bytes(b"junk" * (MIN_EPISODE_SIZE // 2))
+
+    with open(f"{folder}Show (Season 1).json", "w") as summary:
+        summary.write('{"episodes": [{"number": 1, "filesize": 123456789}]}')
+    assert extractor.skip_existing([episode], anime, folder) == [episode]
+    assert not location.exists()
+
+    stand_in_server.add("/hls/seg0.ts", SEGMENT * 20, content_type="video/mp2t")
+    stand_in_server.add(
+        "/hls/index.m3u8",
+        "#EXTM3U\n#EXT-X-TARGETDURATION:4\n#EXTINF:4.0,\nseg0.ts\n#EXT-X-ENDLIST\n",
+        content_type="application/vnd.apple.mpegurl",
+    )
+    episode.update(m3u8=f"{stand_in_server.base_url}/hls/index.m3u8", headers={})
+
+    assert extractor.download_episode(episode, anime, folder)
+    assert location.read_bytes() == SEGMENT * 20
+    assert episode["status"] == "completed"
+    assert episode["filesize"] == len(SEGMENT * 20)
+    assert stand_in_server.hits("/hls/seg0.ts") == 1
+
+
+class FakeDriver:
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+def test_stopping_a_job_quits_borrowed_browsers(extractor):
+    """Drivers a resolver still holds when the job is paused are quit too, none is left running."""
+    borrowed, idle = FakeDriver("a"), FakeDriver("b")
+    idle.browser_slot = extractor.browser_slots.acquire("job")
+    extractor.browsers.extend([borrowed, idle])
+
+    extractor.quit_browsers()
+
+    assert borrowed.quit_calls == idle.quit_calls == 1
+    assert extractor.browsers == []
+    assert extractor.browser_slots.in_use() == 0
@@ -0,0 +1,80 @@
+"""
+Tests for the HTTP-only HiAnime episode resolver against recorded fixture responses.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from extractors.hianime_resolver import HianimeHttpResolver, ResolverError
+
+FIXTURES = Path(__file__).parent / "fixtures" / "hianime"
+EPISODE_URL = "/watch/test-anime-123?ep=1001"
+
+
+def fixture(name: str, base_url: str) -> str:
+    return (FIXTURES / name).read_text().replace("{base}", base_url)
+
+
+@pytest.fixture
+def site(stand_in_server):
+    base = stand_in_server.base_url
+    stand_in_server.add("/ajax/v2/episode/list/123", fixture("episode_list.json", base))
+    stand_in_server.add("/ajax/v2/episode/servers?episodeId=1001", fixture("servers.json", base))
+    stand_in_server.add("/ajax/v2/episode/sources?id=501", fixture("sources.json", base))
+    stand_in_server.add("/embed-2/v2/e-1/getSources?id=AbCdEf123", fixture("getSources.json", base))
+    return stand_in_server
+
+
+@pytest.fixture
+def resolver(site):
+    return HianimeHttpResolver(site.base_url, {"User-Agent": "test-agent"})
+
+
+def test_episode_list(resolver, site):
+    """Episodes are read from the AJAX list and filtered by range."""
+    episodes = resolver.get_episode_list(f"{site.base_url}/watch/test-anime-123", 2, 3)
+    assert [ep["number"] for ep in episodes] == [2, 3]
+    assert episodes[0]["url"] == f"{site.base_url}/watch/test-anime-123?ep=1002"
+    assert episodes[0]["title"] == "Episode 2 Title"
+
+
+def test_resolve_episode(resolver, site):
+    """An episode resolves to the stream, player headers and english subtitle."""
+    urls = resolver.resolve(site.base_url + EPISODE_URL, "sub", "HD-1")
+
+    assert urls["m3u8"] == f"{site.base_url}/hls/master.m3u8"
+    assert urls["vtt"] == f"{site.base_url}/subs/eng-2.vtt"
+    assert urls["all-vtt"] == [f"{site.base_url}/subs/eng-2.vtt"]
+    assert urls["headers"]["Referer"] == f"{site.base_url}/"
+    assert urls["headers"]["User-Agent"] == "test-agent"
+
+    # embed sources are requested as the player would, with the embed page as referer
+    path, headers = site.requests[-1]
+    assert path == "/embed-2/v2/e-1/getSources?id=AbCdEf123"
+    assert headers["Referer"].endswith("/embed-2/v2/e-1/AbCdEf123?k=1")
+
+
+def test_default_server_follows_download_type(resolver, site):
+    """Without a server name the first server of the requested type is used."""
+    site.add("/ajax/v2/episode/sources?id=601", fixture("sources.json", site.base_url))
+    assert resolver.resolve(site.base_url + EPISODE_URL, "dub")["server"] == "HD-1"
+    assert site.hits("/ajax/v2/episode/sources?id=601") == 1
+
+
+def test_unknown_server_raises(resolver, site):
+    with pytest.raises(ResolverError):
+        resolver.resolve(site.base_url + EPISODE_URL, "sub", "Vidcloud")
+
+
+def test_encrypted_sources_raise(resolver, site):
+    """Encrypted player sources cannot be used without the browser."""
+    site.add("/embed-2/v2/e-1/getSources?id=AbCdEf123", fixture("getSources_encrypted.json", site.base_url))
+    with pytest.raises(ResolverError):
+        resolver.resolve(site.base_url + EPISODE_URL, "sub")
+
+
+def test_http_errors_raise(resolver, site):
+    site.add("/ajax/v2/episode/servers?episodeId=1001", "blocked", status=403)
+    with pytest.raises(ResolverError):
+        resolver.resolve(site.base_url + EPISODE_URL, "sub")
@@ -0,0 +1,64 @@
+"""
+Tests for the HLS master playlist parser and variant selection.
+"""
+
+from tools.hls import parse_attributes, parse_master_playlist, select_variant
+
+MASTER = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-MEDIA:TYPE=SUBTITLES,GROUP-ID="subs",NAME="English",URI="subs/eng.m3u8"
+#EXT-X-STREAM-INF:BANDWIDTH=1400000,AVERAGE-BANDWIDTH=1200000,RESOLUTION=1280x720,CODECS="avc1.64001f,mp4a.40.2",FRAME-RATE=23.976
+720/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=5000000,RESOLUTION=1920x1080,CODECS="avc1.640028,mp4a.40.2"
+https://cdn.example/1080/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=600000,RESOLUTION=640x360
+360/index.m3u8
+#EXT-X-I-FRAME-STREAM-INF:BANDWIDTH=90000,URI="iframes.m3u8"
+"""
+
+
+def test_parse_attributes_keeps_quoted_commas():
+    attributes = parse_attributes('#EXT-X-STREAM-INF:BANDWIDTH=1,CODECS="avc1.64001f,mp4a.40.2",RESOLUTION=1x2')
+    assert attributes == {"BANDWIDTH": "1", "CODECS": "avc1.64001f,mp4a.40.2", "RESOLUTION": "1x2"}
+
+
+def test_parse_master_playlist():
+    """Variants carry their attributes and absolute URIs; I-frame playlists are not variants."""
+    playlist = parse_master_playlist(MASTER, "https://host.example/hls/master.m3u8")
+
+    assert [v.uri for v in playlist.variants] == [
+        "https://host.example/hls/720/index.m3u8",
+        "https://cdn.example/1080/index.m3u8",
+        "https://host.example/hls/360/index.m3u8",
+    ]
+    hd = playlist.variants[0]
+    assert (hd.width, hd.height, hd.bandwidth, hd.bitrate) == (1280, 720, 1400000, 1200000)
+    assert hd.codecs == "avc1.64001f,mp4a.40.2"
+    assert hd.frame_rate == 23.976
+
+
+def test_media_playlist_has_no_variants():
+    playlist = parse_master_playlist("#EXTM3U\n#EXTINF:4,\nseg0.ts\n#EXT-X-ENDLIST\n", "https://h/index.m3u8")
+    assert playlist.variants == []
+
+
+def test_separate_audio_is_detected():
+    text = (
+        '#EXTM3U\n#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aud",NAME="jp",URI="audio/jp.m3u8"\n'
+        '#EXT-X-STREAM-INF:BANDWIDTH=1000,RESOLUTION=1280x720,AUDIO="aud"\nvideo.m3u8\n'
+    )
+    playlist = parse_master_playlist(text, "https://h/master.m3u8")
+    assert playlist.audio_groups == {"aud": ["https://h/audio/jp.m3u8"]}
+    assert playlist.has_separate_audio(playlist.variants[0])
+
+
+def test_select_variant_policies():
+    variants = parse_master_playlist(MASTER, "https://host.example/master.m3u8").variants
+
+    assert select_variant(variants).height == 1080
+    assert select_variant(variants, "worst").height == 360
+    assert select_variant(variants, "720p").height == 720
+    assert select_variant(variants, "540").height == 360  # equidistant: prefer the lower one
+    assert select_variant(variants, "best", max_bitrate=2_000_000).height == 720
+    assert select_variant(variants, "best", max_bitrate=100_000).height == 360  # nothing fits: lowest bitrate
+    assert select_variant([]) is None
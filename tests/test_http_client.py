@@ -0,0 +1,39 @@
+"""
+Tests for the shared pooled HTTP client.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from tools.http_client import ACCEPT_ENCODING, HttpClient
+
+
+def test_connections_are_reused_across_threads(stand_in_server):
+    """Parallel workers share the per-host pool instead of opening a connection per request."""
+    stand_in_server.add("/playlist.m3u8", "#EXTM3U\n", content_type="application/vnd.apple.mpegurl")
+    client = HttpClient(pool_size=3)
+
+    def fetch(_):
+        return client.get(f"{stand_in_server.base_url}/playlist.m3u8").status_code
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert set(executor.map(fetch, range(30))) == {200}
+
+    stats = client.stats()
+    assert stats["requests"] == 30
+    assert stats["connections"] <= 3
+    assert stats["reused"] >= 27
+    client.close()
+
+
+def test_compression_is_always_requested(stand_in_server):
+    """Caller headers that disable compression are overridden."""
+    stand_in_server.add("/page", "<html></html>", content_type="text/html")
+    client = HttpClient()
+
+    client.get(f"{stand_in_server.base_url}/page", headers={"Accept-Encoding": "identity", "Referer": "x"})
+
+    _, headers = stand_in_server.requests[-1]
+    assert headers["Accept-Encoding"] == ACCEPT_ENCODING
+    assert "gzip" in ACCEPT_ENCODING
+    assert headers["Referer"] == "x"
+    client.close()
@@ -0,0 +1,84 @@
+"""
+Tests for the per-season episode journal and the summary rebuilt from it.
+"""
+
+import json
+
+import pytest
+
+from tools.journal import JobJournal
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return JobJournal(str(tmp_path / "Show (Season 1).journal.jsonl"))
+
+
+def test_latest_event_wins(journal):
+    journal.record("resolved", 1, m3u8="https://cdn/1.m3u8", time_to_m3u8=1.5)
+    journal.record("download_failed", 1, error="HTTP 403")
+    journal.record("resolved", 1, m3u8="https://cdn/1b.m3u8")
+    journal.record("downloaded", 1, filesize=1234, duration=1420.0)
+    journal.record("resolve_failed", 2, error="No stream found")
+
+    episodes = journal.episodes()
+
+    assert episodes[1]["status"] == "completed"
+    assert episodes[1]["m3u8"] == "https://cdn/1b.m3u8"
+    assert episodes[1]["filesize"] == 1234
+    assert "error" not in episodes[1]
+    assert episodes[2] == {
+        "number": 2,
+        "error": "No stream found",
+        "status": "failed",
+        "updated": episodes[2]["updated"],
+    }
+
+
+def test_torn_last_line_is_ignored(journal):
+    """A line cut off by a crash does not hide the events before it."""
+    journal.record("downloaded", 3, filesize=10)
+    with open(journal.path, "a") as file:
+        file.write('{"event": "resolved", "numb')
+
+    assert journal.episodes()[3]["status"] == "completed"
+
+
+def test_summary_is_rebuilt_from_the_journal(journal, tmp_path):
+    journal.record("downloaded", 2, filesize=99)
+    journal.record("skipped", 7)
+    path = tmp_path / "Show (Season 1).json"
+    episodes = [{"number": 1, "title": "One", "url": "u1"}, {"number": 2, "title": "Two", "url": "u2"}]
+
+    journal.write_summary(str(path), {"name": "Show", "season_number": 1}, episodes)
+
+    summary = json.loads(path.read_text())
+    assert summary["name"] == "Show"
+    assert [ep["number"] for ep in summary["episodes"]] == [1, 2, 7]
+    assert summary["episodes"][0] == {"number": 1, "title": "One", "url": "u1"}
+    assert summary["episodes"][1]["title"] == "Two" and summary["episodes"][1]["filesize"] == 99
+    assert summary["episodes"][2]["status"] == "skipped"
+    assert not (tmp_path / "Show (Season 1).json.tmp").exists()
+
+
+def test_unknown_event(journal):
+    with pytest.raises(ValueError):
+        journal.record("finished", 1)
+
+
+def test_retries_are_kept_with_their_cause(journal):
+    journal.record("resolve_failed", 4, error="No stream found")
+    journal.record("retry_scheduled", 4, attempt=1, stage="resolve", error="No stream found", delay=31.2)
+    journal.record("download_failed", 4, error="HTTP 403")
+    journal.record("retry_scheduled", 4, attempt=2, stage="download", error="HTTP 403", delay=58.0)
+    assert journal.episodes()[4]["status"] == "retrying"
+
+    journal.record("downloaded", 4, filesize=10)
+    episode = journal.episodes()[4]
+
+    assert episode["status"] == "completed"
+    assert "error" not in episode
+    assert [(retry["attempt"], retry["stage"], retry["error"]) for retry in episode["retries"]] == [
+        (1, "resolve", "No stream found"),
+        (2, "download", "HTTP 403"),
+    ]
@@ -0,0 +1,51 @@
+"""
+Tests for verifying already downloaded episode files.
+"""
+
+import pytest
+
+from tools import media_check
+from tools.media_check import MIN_EPISODE_SIZE, check_download
+
+
+@pytest.fixture
+def episode(tmp_path):
+    path = tmp_path / "Show - s01e01 - Pilot.mp4"
+    path.write_bytes(b"\0" * (MIN_EPISODE_SIZE + 10))
+    return str(path)
+
+
+@pytest.fixture
+def ffprobe(monkeypatch):
+    """Pretend ffprobe is installed and reports the duration stored on the fixture."""
+    result = {"duration": 1420.0}
+    monkeypatch.setattr(media_check.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(media_check, "probe_duration", lambda path: result["duration"])
+    return result
+
+
+def test_missing_and_truncated_files(tmp_path):
+    assert check_download(str(tmp_path / "nope.mp4")) == "missing"
+    (tmp_path / "tiny.mp4").write_bytes(b"x" * 100)
+    assert check_download(str(tmp_path / "tiny.mp4")) == "only 100 bytes"
+
+
+def test_size_must_match_the_recorded_size(episode, monkeypatch):
+    monkeypatch.setattr(media_check.shutil, "which", lambda name: None)
+    assert check_download(episode, expected_size=MIN_EPISODE_SIZE + 10) is None
+    assert "differs" in check_download(episode, expected_size=MIN_EPISODE_SIZE * 2)
+
+
+def test_duration_is_compared_with_the_playlist(episode, ffprobe):
+    assert check_download(episode, expected_duration=1421.5) is None
+    assert check_download(episode, expected_duration=1500.0) == "duration 1420s, playlist has 1500s"
+
+
+def test_unreadable_file(episode, ffprobe):
+    ffprobe["duration"] = None
+    assert check_download(episode) == "ffprobe cannot read the file"
+
+
+def test_without_ffprobe_only_size_is_checked(episode, monkeypatch):
+    monkeypatch.setattr(media_check.shutil, "which", lambda name: None)
+    assert check_download(episode, expected_duration=9999.0) is None
@@ -0,0 +1,91 @@
+"""
+Tests for the per-host adaptive request pacing.
+"""
+
+from tools.http_client import HttpClient
+from tools.pacing import HostPacer, Pacer, parse_retry_after, status_from_error
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_requests_are_spaced_by_the_rate():
+    clock = FakeClock()
+    pacer = HostPacer(rate=4, clock=clock, sleep=clock.sleep)
+
+    waits = [pacer.wait() for _ in range(3)]
+
+    assert waits == [0, 0.25, 0.25]
+
+
+def test_rate_rises_additively_and_falls_multiplicatively():
+    pacer = HostPacer(rate=4, min_rate=1, max_rate=5, increase=0.5, decrease=0.5)
+    for _ in range(4):
+        pacer.observe(200)
+    assert pacer.rate == 5
+
+    pacer.observe(429)
+    assert pacer.rate == 2.5
+    pacer.observe(503)
+    pacer.observe(403)
+    assert pacer.rate == 1
+    assert pacer.backoffs == 3
+
+    pacer.observe(404)
+    pacer.observe(None)
+    assert pacer.rate == 1
+
+
+def test_retry_after_holds_back_the_next_request():
+    clock = FakeClock()
+    pacer = HostPacer(rate=4, clock=clock, sleep=clock.sleep)
+    pacer.observe(429, retry_after=10)
+
+    assert pacer.wait() == 10
+
+
+def test_hosts_are_paced_separately():
+    pacer = Pacer()
+    pacer.observe("https://hianime.to/watch/1", 429)
+    pacer.observe("https://cdn.example/seg.ts", 200)
+
+    assert pacer.rates() == {"cdn.example": 4.5, "hianime.to": 2.0}
+    assert "hianime.to 2.0/s (1 backoffs)" in pacer.describe()
+
+
+def test_disabled_pacer_does_nothing():
+    pacer = Pacer(enabled=False)
+    pacer.observe("https://hianime.to/", 429)
+    assert pacer.wait("https://hianime.to/") == 0
+    assert pacer.rates() == {}
+
+
+def test_error_parsing():
+    assert status_from_error("ERROR: unable to download video data: HTTP Error 429: Too Many Requests") == 429
+    assert status_from_error("ERROR: timed out") is None
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+
+
+def test_http_client_reports_answers_to_the_pacer(stand_in_server):
+    stand_in_server.add("/ok", "fine")
+    stand_in_server.add("/busy", "slow down", status=429)
+    pacer = Pacer()
+    client = HttpClient(retries=0, pacer=pacer)
+    host = Pacer.host(stand_in_server.base_url)
+
+    client.get(f"{stand_in_server.base_url}/ok")
+    assert pacer.rates()[host] == 4.5
+    client.get(f"{stand_in_server.base_url}/busy")
+    assert pacer.rates()[host] == 2.25
+    client.close()
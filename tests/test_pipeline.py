@@ -0,0 +1,160 @@
+"""
+Tests for the two-stage resolve/download pipeline.
+"""
+
+import threading
+import time
+
+from tools.pipeline import Pipeline, workers_for_memory
+
+
+def test_downloads_start_while_others_are_still_resolving():
+    """The first download begins before the last episode is resolved."""
+    events = []
+    lock = threading.Lock()
+
+    def resolve(item):
+        time.sleep(0.05)
+        with lock:
+            events.append(("resolved", item))
+        return True
+
+    def download(item):
+        with lock:
+            events.append(("download", item))
+        time.sleep(0.05)
+
+    pipeline = Pipeline(resolve, download, resolvers=1, downloaders=2)
+    pipeline.run(range(5))
+
+    first_download = events.index(next(e for e in events if e[0] == "download"))
+    last_resolve = max(i for i, e in enumerate(events) if e[0] == "resolved")
+    assert first_download < last_resolve
+    assert sorted(item for kind, item in events if kind == "download") == list(range(5))
+
+
+def test_unresolved_items_and_errors_skip_the_download_stage():
+    downloaded, failed = [], []
+
+    def resolve(item):
+        if item == 2:
+            raise ValueError("no stream")
+        return item != 3
+
+    pipeline = Pipeline(resolve, downloaded.append, on_error=lambda item, e: failed.append((item, str(e))))
+    pipeline.run(range(5))
+
+    assert sorted(downloaded) == [0, 1, 4]
+    assert failed == [(2, "no stream")]
+
+
+def test_hand_off_queue_is_bounded():
+    """Resolvers stall once the queue is full instead of resolving far ahead of the downloaders."""
+    release = threading.Event()
+
+    def download(item):
+        release.wait(5)
+
+    pipeline = Pipeline(lambda item: True, download, resolvers=2, downloaders=1, queue_size=2)
+    runner = threading.Thread(target=pipeline.run, args=(range(10),))
+    runner.start()
+    time.sleep(0.2)
+
+    stats = pipeline.stats()
+    # one item downloading, two waiting, the resolvers blocked on the third and fourth
+    assert stats["download"]["queued"] == 2
+    assert stats["resolve"]["processed"] <= 5
+    release.set()
+    runner.join(5)
+
+    stats = pipeline.stats()
+    assert stats["download"]["processed"] == 10
+    assert stats["download"]["peak_queue"] <= 2
+    assert 0 < stats["download"]["utilisation"] <= 1
+
+
+def test_status_line():
+    pipeline = Pipeline(lambda item: True, lambda item: None, resolvers=2, downloaders=3)
+    pipeline.run([])
+    assert pipeline.status() == "resolve: 0/2 busy, 0 queued | download: 0/3 busy, 0 queued"
+
+
+def test_failed_items_are_retried_at_the_back_of_the_queue():
+    attempts, order = {}, []
+    lock = threading.Lock()
+
+    def resolve(item):
+        with lock:
+            attempts[item] = attempts.get(item, 0) + 1
+            order.append(item)
+        return not (item == 0 and attempts[item] == 1)
+
+    def download(item):
+        return not (item == 1 and attempts[item] < 3)
+
+    retried = []
+
+    def retry(item, stage):
+        retried.append((item, stage))
+        return 0.05 if attempts[item] < 3 else None
+
+    pipeline = Pipeline(resolve, download, resolvers=1, downloaders=1, retry=retry)
+    pipeline.run(range(4))
+
+    assert attempts == {0: 2, 1: 3, 2: 1, 3: 1}
+    assert order[:4] == [0, 1, 2, 3]
+    assert retried == [(0, "resolve"), (1, "download"), (1, "download")]
+    assert pipeline.retries == 3
+
+
+def test_items_that_are_not_retried_end_the_run():
+    pipeline = Pipeline(lambda item: False, lambda item: None, retry=lambda item, stage: None)
+    pipeline.run(range(3))
+    assert pipeline.retries == 0
+
+
+def test_workers_for_memory_uses_the_container_memory():
+    assert workers_for_memory(600, maximum=4, memory=lambda: 1300) == 2
+    assert workers_for_memory(600, maximum=4, memory=lambda: 100) == 1
+    assert workers_for_memory(600, maximum=4, memory=lambda: 64000) == 4
+    assert 1 <= workers_for_memory(600, maximum=4, memory=lambda: None) <= 4
+
+
+def test_failing_retry_gives_the_item_up():
+    """A retry hook that cannot write its records (disk full) must not leave the run hanging."""
+    errors = []
+
+    def retry(item, stage):
+        raise OSError(28, "No space left on device")
+
+    pipeline = Pipeline(
+        lambda item: item != 1,
+        lambda item: None,
+        resolvers=2,
+        on_error=lambda item, e: errors.append((item, e.errno)),
+        retry=retry,
+    )
+    runner = threading.Thread(target=pipeline.run, args=(range(3),), daemon=True)
+    runner.start()
+    runner.join(timeout=5)
+
+    assert not runner.is_alive()
+    assert errors == [(1, 28)]
+    assert pipeline.retries == 0
+
+
+def test_failing_requeue_gives_the_item_up():
+    class BrokenQueue:
+        def put(self, item):
+            raise RuntimeError("queue gone")
+
+    errors = []
+    pipeline = Pipeline(lambda item: True, lambda item: None, on_error=lambda item, e: errors.append(item))
+    pipeline._outstanding = pipeline.waiting_retry = 1
+    pipeline._pending = BrokenQueue()
+
+    pipeline._requeue("episode")
+
+    assert errors == ["episode"]
+    assert pipeline.waiting_retry == 0
+    assert pipeline._all_done.is_set()
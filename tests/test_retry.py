@@ -0,0 +1,58 @@
+"""
+Tests for the episode retry policy and scheduler.
+"""
+
+from tools.retry import RetryPolicy, RetryScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_backoff_doubles_up_to_the_cap():
+    policy = RetryPolicy(backoff=10, max_backoff=35, jitter=0)
+    assert [policy.delay(retry) for retry in (1, 2, 3, 4)] == [10, 20, 35, 35]
+
+
+def test_jitter_scatters_around_the_backoff():
+    policy = RetryPolicy(backoff=10, jitter=0.5)
+    assert policy.delay(1, rng=lambda: 0.0) == 5
+    assert policy.delay(1, rng=lambda: 1.0) == 15
+
+
+def test_gives_up_after_the_attempts():
+    scheduler = RetryScheduler(RetryPolicy(attempts=2, backoff=1, jitter=0), clock=FakeClock())
+    scheduler.start(1)
+    assert scheduler.schedule(1) == (1, "")
+    scheduler.start(1)
+
+    delay, reason = scheduler.schedule(1)
+
+    assert delay is None and reason == "2 attempts made"
+    assert scheduler.given_up == {"attempts": 1}
+
+
+def test_budget_is_shared_by_the_job():
+    scheduler = RetryScheduler(RetryPolicy(attempts=5, backoff=1, jitter=0, budget=2), clock=FakeClock())
+    for number in (1, 2, 3):
+        scheduler.start(number)
+
+    assert scheduler.schedule(1)[0] == 1
+    assert scheduler.schedule(2)[0] == 1
+    assert scheduler.schedule(3) == (None, "retry budget of 2 used up")
+    assert scheduler.retries == 2
+
+
+def test_no_retry_would_start_after_the_deadline():
+    clock = FakeClock()
+    scheduler = RetryScheduler(RetryPolicy(attempts=5, backoff=60, jitter=0, deadline=300), clock=clock)
+    scheduler.start(1)
+    clock.now += 200
+    scheduler.start(1)
+
+    assert scheduler.schedule(1) == (None, "deadline of 300s reached")
+    assert scheduler.given_up == {"deadline": 1}
@@ -0,0 +1,59 @@
+"""
+Tests for the on-disk stream resolution cache.
+"""
+
+import time
+
+from tools.stream_cache import StreamCache
+
+STREAMS = {
+    "m3u8": "https://cdn.example/master.m3u8",
+    "vtt": "https://cdn.example/eng.vtt",
+    "all-vtt": ["https://cdn.example/eng.vtt"],
+    "headers": {"Referer": "https://player.example/"},
+    "server": "HD-1",
+    "time_to_m3u8": 4.2,
+}
+
+
+def test_round_trip_by_episode_server_and_type(tmp_path):
+    """Entries are keyed by episode URL, server (case-insensitive) and download type."""
+    cache = StreamCache(str(tmp_path / "streams.db"))
+    cache.put("https://site/watch/show-1?ep=10", "HD-1", "sub", STREAMS)
+
+    cached = cache.get("https://site/watch/show-1?ep=10", "hd-1", "sub")
+    assert cached["m3u8"] == STREAMS["m3u8"]
+    assert cached["headers"] == STREAMS["headers"]
+    assert "time_to_m3u8" not in cached
+
+    assert cache.get("https://site/watch/show-1?ep=10", "HD-1", "dub") is None
+    assert cache.get("https://site/watch/show-1?ep=10", "HD-2", "sub") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_survives_reopen(tmp_path):
+    """A later run sees entries written by an earlier one."""
+    StreamCache(str(tmp_path / "streams.db")).put("ep", None, "sub", STREAMS)
+    assert StreamCache(str(tmp_path / "streams.db")).get("ep", None, "sub")["m3u8"] == STREAMS["m3u8"]
+
+
+def test_expired_entries_are_dropped(tmp_path, monkeypatch):
+    """Entries older than the TTL are not returned and are removed."""
+    cache = StreamCache(str(tmp_path / "streams.db"), ttl=60)
+    cache.put("ep", "HD-1", "sub", STREAMS)
+
+    later = time.time() + 61
+    monkeypatch.setattr("tools.stream_cache.time.time", lambda: later)
+    assert cache.get("ep", "HD-1", "sub") is None
+    assert cache.purge_expired() == 0
+
+
+def test_evict(tmp_path):
+    """Evicted entries are gone and counted."""
+    cache = StreamCache(str(tmp_path / "streams.db"))
+    cache.put("ep", "HD-1", "sub", STREAMS)
+    cache.evict("ep", "HD-1", "sub")
+    cache.evict("ep", "HD-1", "sub")
+
+    assert cache.get("ep", "HD-1", "sub") is None
+    assert cache.evictions == 1
@@ -0,0 +1,63 @@
+"""
+Tests for subtitle sampling and the language detection cache.
+"""
+
+from tools.subtitles import SubtitleLanguageCache, sample_cue_text
+
+VTT = """WEBVTT
+Kind: captions
+
+NOTE this is a comment
+that spans lines
+
+1
+00:00:01.000 --> 00:00:03.000 align:start
+<i>Where are you going?</i>
+
+2
+00:00:04.000 --> 00:00:06.000
+{\\an8}I am going home, it is getting late.
+"""
+
+
+def test_sample_cue_text_keeps_only_spoken_text():
+    """Header, notes, identifiers, timings and markup are stripped."""
+    assert sample_cue_text(VTT) == "Where are you going? I am going home, it is getting late."
+
+
+def test_sample_cue_text_is_bounded():
+    """The sample never exceeds max_chars."""
+    body = "\n\n".join(f"00:00:{i:02}.000 --> 00:00:{i:02}.500\nline number {i}" for i in range(60))
+    assert len(sample_cue_text("WEBVTT\n\n" + body, max_chars=50)) <= 50
+
+
+def test_each_uri_fetched_once():
+    """Repeated lookups of the same URI are served from the cache."""
+    fetched = []
+
+    def fetch(uri, headers):
+        fetched.append(uri)
+        return VTT.encode()
+
+    cache = SubtitleLanguageCache(fetch)
+    assert cache.language("https://cdn/eng.vtt", {}) == "en"
+    assert cache.language("https://cdn/eng.vtt", {}) == "en"
+    assert fetched == ["https://cdn/eng.vtt"]
+    assert cache.hits == 1
+    assert cache.get("https://cdn/eng.vtt").sha1
+
+
+def test_identical_content_reuses_detection(monkeypatch):
+    """A second URI with the same content skips language detection."""
+    calls = []
+
+    def fake_detect(text):
+        calls.append(text)
+        return "en"
+
+    monkeypatch.setattr("tools.subtitles.detect_lang", fake_detect)
+    cache = SubtitleLanguageCache(lambda uri, headers: VTT.encode())
+    cache.language("https://cdn/a.vtt", {})
+    cache.language("https://cdn/b.vtt", {})
+    assert len(calls) == 1
+    assert cache.fetches == 2
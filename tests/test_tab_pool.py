@@ -0,0 +1,143 @@
+"""
+Tests for the pool of episode tabs in a shared browser.
+"""
+
+import threading
+
+import pytest
+
+from tools.tab_pool import TabPool
+
+
+class FakeBrowser:
+    def __init__(self, serial):
+        self.serial = serial
+        self.open_tabs = 0
+        self.disposed = False
+
+
+class FakeTab:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+
+def make_pool(tabs=3, max_uses=100, fail_open=False, fail_start=0):
+    created = []
+    failures = [fail_start]
+
+    def factory():
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError("chrome did not start")
+        browser = FakeBrowser(len(created) + 1)
+        created.append(browser)
+        return browser
+
+    def open_tab(browser):
+        if fail_open:
+            raise ConnectionError("browser crashed")
+        browser.open_tabs += 1
+        return FakeTab(browser)
+
+    def close_tab(tab):
+        tab.browser.open_tabs -= 1
+        tab.closed = True
+
+    def dispose(browser):
+        browser.disposed = True
+
+    pool = TabPool(factory, open_tab, close_tab, dispose, tabs=tabs, max_uses=max_uses)
+    pool.created = created
+    return pool
+
+
+def test_concurrent_tabs_share_one_browser():
+    pool = make_pool(tabs=3)
+    inside = threading.Barrier(3)
+    seen = []
+
+    def worker():
+        with pool.tab() as tab:
+            seen.append(tab)
+            inside.wait(timeout=2)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(pool.created) == 1
+    assert len({id(tab) for tab in seen}) == 3
+    assert all(tab.closed for tab in seen)
+    stats = pool.stats()
+    assert stats["tabs_opened"] == 3
+    assert stats["peak_tabs"] == 3
+    assert stats["browsers_started"] == 1
+
+    pool.close()
+    assert pool.created[0].disposed
+
+
+def test_browser_is_retired_after_max_uses_once_its_tabs_closed():
+    pool = make_pool(max_uses=2)
+    with pool.tab() as first:
+        with pool.tab() as second:
+            assert first.browser is second.browser
+        assert not first.browser.disposed
+    assert first.browser.disposed
+
+    with pool.tab() as third:
+        assert third.browser is pool.created[1]
+    assert pool.stats()["recycled"] == 1
+    pool.close()
+
+
+def test_failed_tab_retires_the_browser():
+    pool = make_pool(fail_open=True)
+    with pytest.raises(ConnectionError):
+        with pool.tab():
+            pass
+    assert pool.created[0].disposed
+
+    with pytest.raises(ConnectionError):
+        with pool.tab():
+            pass
+    assert len(pool.created) == 2
+    pool.close()
+
+
+def test_browser_that_fails_to_start_is_checked_in():
+    pool = make_pool(tabs=1, fail_start=1)
+    with pytest.raises(OSError):
+        with pool.tab():
+            pass
+    assert pool._hosts == []
+    # the failed start released its slot, the next worker starts a working browser
+    with pool.tab() as tab:
+        assert tab.browser is pool.created[0]
+
+    pool.close()
+    assert pool.created[0].disposed
+    assert pool.stats()["browsers_started"] == 1
+
+
+def test_errors_inside_a_tab_keep_the_browser():
+    pool = make_pool()
+    with pytest.raises(RuntimeError):
+        with pool.tab() as tab:
+            raise RuntimeError("no stream")
+    assert tab.closed
+
+    with pool.tab() as again:
+        assert again.browser is tab.browser
+    pool.close()
+
+
+def test_closed_pool_refuses_tabs():
+    pool = make_pool()
+    pool.close()
+    with pytest.raises(RuntimeError):
+        with pool.tab():
+            pass
@@ -0,0 +1,78 @@
+"""
+Tests for the per-driver temp dirs and the janitor that removes the ones crashed runs left behind.
+"""
+
+import os
+
+from tools.temp_dirs import make_temp_dir, owner_pid, purge_stale_dirs, remove_temp_dir
+
+NOW = 1_000_000.0
+
+
+def make_dir(root, name, modified=NOW, size=0):
+    path = root / name
+    path.mkdir()
+    if size:
+        (path / "Cookies").write_bytes(b"x" * size)
+    os.utime(path, (modified, modified))
+    return path
+
+
+def purge(root, alive=(), started=None, **kwargs):
+    return purge_stale_dirs(
+        [str(root)],
+        clock=lambda: NOW,
+        alive=lambda pid: pid in alive,
+        started_at=lambda pid: started,
+        **kwargs,
+    )
+
+
+def test_make_temp_dir_is_named_after_this_process(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    path = make_temp_dir("chrome-profile-")
+    name = os.path.basename(path)
+    assert name.startswith(f"chrome-profile-{os.getpid()}-")
+    assert owner_pid(name, "chrome-profile-") == os.getpid()
+
+    remove_temp_dir(path)
+    assert not os.path.exists(path)
+
+
+def test_owner_pid_ignores_thread_ids_and_timestamps():
+    assert owner_pid("seleniumwire-4242-abc", "seleniumwire-") == 4242
+    assert owner_pid("scoped_dir4242_123", "scoped_dir") == 4242
+    assert owner_pid("chrome-profile-140234567890-abc", "chrome-profile-") is None
+    assert owner_pid("chrome-profile-1760000000-17", "chrome-profile-") is None
+    assert owner_pid(".org.chromium.Chromium.xYz12", ".org.chromium.Chromium.") is None
+
+
+def test_dirs_of_dead_processes_are_removed(tmp_path):
+    make_dir(tmp_path, "chrome-profile-100-a", size=1000)
+    make_dir(tmp_path, "seleniumwire-100-b", size=500)
+    kept = make_dir(tmp_path, "chrome-profile-200-c")
+    unrelated = make_dir(tmp_path, "pip-build-100")
+
+    assert purge(tmp_path, alive={200}) == (2, 1500)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [kept.name, unrelated.name]
+
+
+def test_dirs_older_than_a_reused_pid_are_removed(tmp_path):
+    # after a container restart the new process can get the pid of the one that crashed
+    make_dir(tmp_path, "chrome-profile-7-old", modified=NOW - 600)
+    current = make_dir(tmp_path, "chrome-profile-7-new", modified=NOW - 10)
+
+    assert purge(tmp_path, alive={7}, started=NOW - 60) == (1, 0)
+    assert [p.name for p in tmp_path.iterdir()] == [current.name]
+
+
+def test_dirs_without_an_owner_are_removed_by_age(tmp_path):
+    make_dir(tmp_path, "chrome-profile-1760000000-17", modified=NOW - 7200)
+    fresh = make_dir(tmp_path, ".org.chromium.Chromium.abc", modified=NOW - 60)
+
+    assert purge(tmp_path, max_age=3600) == (1, 0)
+    assert [p.name for p in tmp_path.iterdir()] == [fresh.name]
+
+
+def test_missing_roots_are_skipped(tmp_path):
+    assert purge_stale_dirs([str(tmp_path / "missing")]) == (0, 0)
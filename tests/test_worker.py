@@ -0,0 +1,62 @@
+"""
+Tests for pausing, resuming and recovering jobs in the job worker.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+from webgui.database import Database, JobStatus
+from webgui.worker import JobWorker
+
+
+@pytest.fixture
+async def worker():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = Database(os.path.join(tmpdir, "test.db"))
+        await database.init_db()
+        yield JobWorker(database, tmpdir, os.path.join(tmpdir, "downloads"))
+
+
+@pytest.mark.asyncio
+async def test_orphaned_jobs_are_requeued(worker):
+    """A job left running by a restart runs again instead of failing."""
+    job_id = await worker.db.create_job(url="https://example.com/video")
+    await worker.db.claim_job(job_id)
+    await worker.db.start_job(job_id, pid=12345, log_file="/tmp/test.log")
+
+    await worker.cleanup_orphaned_jobs()
+
+    job = await worker.db.get_job(job_id)
+    assert job["status"] == JobStatus.QUEUED.value
+    assert job["error_message"] is None
+
+
+@pytest.mark.asyncio
+async def test_pause_and_resume_queued_job(worker):
+    job_id = await worker.db.create_job(url="https://example.com/video")
+
+    assert await worker.pause_job(job_id)
+    assert (await worker.db.get_job(job_id))["status"] == JobStatus.PAUSED.value
+    assert not await worker.pause_job(job_id)
+
+    assert await worker.resume_job(job_id)
+    assert (await worker.db.get_job(job_id))["status"] == JobStatus.QUEUED.value
+    assert not await worker.resume_job(job_id)
+
+
+@pytest.mark.asyncio
+async def test_pause_running_job_stops_its_process(worker):
+    job_id = await worker.db.create_job(url="https://example.com/video")
+    await worker.db.claim_job(job_id)
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    worker.active_processes[job_id] = process
+
+    assert await worker.pause_job(job_id)
+
+    assert process.poll() is not None
+    assert job_id not in worker.active_processes
+    assert (await worker.db.get_job(job_id))["status"] == JobStatus.PAUSED.value
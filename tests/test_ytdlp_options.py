@@ -0,0 +1,77 @@
+"""
+Tests for the yt-dlp external downloader options.
+"""
+
+import argparse
+from argparse import Namespace
+
+import pytest
+
+from tools import ytdlp_options
+from tools.ytdlp_options import aria_size, byte_size, downloader_options, tuning_options
+
+
+def test_aria_disabled():
+    assert downloader_options(Namespace(aria=False)) == {}
+
+
+def test_aria_missing_binary(monkeypatch):
+    monkeypatch.setattr(ytdlp_options.shutil, "which", lambda name: None)
+    assert downloader_options(Namespace(aria=True)) == {}
+
+
+def test_aria_options(monkeypatch):
+    """The configured values reach aria2c; connections are capped at aria2c's maximum."""
+    monkeypatch.setattr(ytdlp_options.shutil, "which", lambda name: "/usr/bin/aria2c")
+    args = Namespace(aria=True, aria_connections=32, aria_split=8, aria_min_split_size="4M")
+
+    options = downloader_options(args)
+
+    assert options["external_downloader"] == {"default": "aria2c"}
+    assert options["external_downloader_args"]["aria2c"] == [
+        "--max-connection-per-server=16",
+        "--split=8",
+        "--max-concurrent-downloads=8",
+        "--min-split-size=4M",
+    ]
+
+
+def test_aria_size():
+    assert aria_size("512k") == "512K"
+    with pytest.raises(argparse.ArgumentTypeError):
+        aria_size("1M --foo")
+
+
+def test_default_profile():
+    options = tuning_options(Namespace())
+    assert options["concurrent_fragment_downloads"] == 4
+    assert "http_chunk_size" not in options
+
+
+def test_profile_overrides():
+    """Individually given values win over the selected preset; unset ones keep the preset's."""
+    args = Namespace(
+        ytdlp_profile="fast-lan", fragment_concurrency=6, rate_limit=None, buffer_size=None, http_chunk_size=None
+    )
+
+    options = tuning_options(args)
+
+    assert options["concurrent_fragment_downloads"] == 6
+    assert "ratelimit" not in options
+    assert "sleep_interval_requests" not in options
+    assert options["http_chunk_size"] == 10 * 1024**2
+    assert options["buffersize"] == 1024**2
+
+
+def test_rate_limit_caps_fragment_downloads():
+    """The cap goes to yt-dlp's downloader, which applies it to every fragment it fetches."""
+    options = tuning_options(Namespace(ytdlp_profile="polite", rate_limit=byte_size("2M")))
+    assert options["ratelimit"] == 2 * 1024**2
+    assert options["concurrent_fragment_downloads"] == 1
+
+
+def test_byte_size():
+    assert byte_size("64k") == 65536
+    assert byte_size("123") == 123
+    with pytest.raises(argparse.ArgumentTypeError):
+        byte_size("10 MB")
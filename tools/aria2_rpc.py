@@ -0,0 +1,172 @@
+import os
+import shutil
+import time
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+import requests
+from aria2p import Client
+from aria2p.client import ClientException
+
+from tools.hls_downloader import MediaPlaylist, finish_download, format_size
+
+STATUS_KEYS = ["gid", "status", "dir", "completedLength", "totalLength", "downloadSpeed", "errorMessage"]
+# fragments of one episode are downloaded into "<output file>.aria2-frags/"
+FRAGMENT_DIR_SUFFIX = ".aria2-frags"
+
+
+class Aria2RpcError(Exception):
+    pass
+
+
+def rpc_client(url: str | None = None, secret: str | None = None, timeout: float = 10) -> Client:
+    """Client for the shared aria2c daemon (``ARIA2_RPC_URL`` / ``ARIA2_RPC_SECRET``)."""
+    parsed = urlparse(url or os.environ.get("ARIA2_RPC_URL", "http://localhost:6800"))
+    return Client(
+        host=f"{parsed.scheme or 'http'}://{parsed.hostname or 'localhost'}",
+        port=parsed.port or 6800,
+        secret=os.environ.get("ARIA2_RPC_SECRET", "") if secret is None else secret,
+        timeout=timeout,
+    )
+
+
+def fragment_dir(location: str) -> str:
+    return f"{location}{FRAGMENT_DIR_SUFFIX}"
+
+
+def download_statuses(client: Client) -> list[dict[str, Any]]:
+    """Status of every download the daemon knows about, in three RPC calls."""
+    try:
+        return [
+            *client.tell_active(keys=STATUS_KEYS),
+            *client.tell_waiting(0, 10000, keys=STATUS_KEYS),
+            *client.tell_stopped(0, 10000, keys=STATUS_KEYS),
+        ]
+    except (ClientException, requests.RequestException) as e:
+        raise Aria2RpcError(f"aria2 RPC request failed: {e}") from e
+
+
+class Aria2RpcDownloader:
+    """
+    Submits downloads to a long-lived aria2c daemon over JSON-RPC and waits for them.
+
+    The daemon owns queueing, connection and bandwidth limits for every job on the host. HLS
+    streams are submitted as one download per segment into a fragment directory next to the
+    output file and concatenated in playlist order once all segments are there; segments that
+    already finished in an earlier run are not requested again. Failed downloads are re-added
+    up to ``retries`` times, as are downloads the daemon lost (e.g. after a restart without a
+    saved session).
+    """
+
+    def __init__(
+        self,
+        client: Client | None = None,
+        poll_interval: float = 1.0,
+        retries: int = 3,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        self.client = client or rpc_client()
+        self.poll_interval = poll_interval
+        self.retries = retries
+        self.progress = progress
+
+    def _add(self, url: str, headers: dict[str, str], directory: str, out: str) -> str:
+        options = {
+            "dir": directory,
+            "out": out,
+            "header": [f"{key}: {value}" for key, value in headers.items()],
+            "continue": "true",
+            "allow-overwrite": "true",
+            "auto-file-renaming": "false",
+        }
+        try:
+            return self.client.add_uri([url], options)
+        except (ClientException, requests.RequestException) as e:
+            raise Aria2RpcError(f"Could not submit {url} to aria2: {e}") from e
+
+    def _wait(self, pending: dict[str, tuple[str, str, str]], headers: dict[str, str], total: int) -> None:
+        """Wait for ``pending`` (gid -> (url, dir, out)); ``total`` includes items finished earlier."""
+        attempts: dict[tuple[str, str, str], int] = {}
+        last_report = 0.0
+
+        while pending:
+            time.sleep(self.poll_interval)
+            statuses = {status["gid"]: status for status in download_statuses(self.client)}
+
+            for gid, item in list(pending.items()):
+                status = statuses.get(gid)
+                state = status["status"] if status else "lost"
+                if state == "complete":
+                    del pending[gid]
+                    self._forget(gid)
+                elif state in ("error", "removed", "lost"):
+                    del pending[gid]
+                    self._forget(gid)
+                    attempts[item] = attempts.get(item, 0) + 1
+                    if attempts[item] > self.retries:
+                        message = status.get("errorMessage") if status else "download lost by aria2"
+                        raise Aria2RpcError(f"{item[0]} failed: {message}")
+                    pending[self._add(item[0], headers, item[1], item[2])] = item
+
+            now = time.monotonic()
+            if now - last_report >= 5 or not pending:
+                last_report = now
+                speed = sum(int(statuses[gid].get("downloadSpeed", 0)) for gid in pending if gid in statuses)
+                done = total - len(pending)
+                self._report(f"aria2: {done}/{total} files complete at {format_size(speed)}/s")
+
+    def _forget(self, gid: str) -> None:
+        # keep the daemon's list of stopped downloads short
+        try:
+            self.client.remove_download_result(gid)
+        except (ClientException, requests.RequestException):
+            pass
+
+    def download_file(self, url: str, headers: dict[str, str], location: str) -> None:
+        directory, out = os.path.dirname(os.path.abspath(location)), os.path.basename(location)
+        self._report(f"Queued {out} on aria2")
+        self._wait({self._add(url, headers, directory, out): (url, directory, out)}, headers, 1)
+
+    def download_hls(self, playlist: MediaPlaylist, headers: dict[str, str], location: str) -> dict[str, float]:
+        """Download the segments of ``playlist`` through aria2 and join them into ``location``."""
+        if any(segment.key or segment.byte_range for segment in playlist.segments):
+            raise Aria2RpcError("Encrypted or byte-range segments are not supported over aria2 RPC")
+
+        started = time.monotonic()
+        segments = ([playlist.init_segment] if playlist.init_segment else []) + playlist.segments
+        directory = fragment_dir(os.path.abspath(location))
+        os.makedirs(directory, exist_ok=True)
+
+        names = [f"frag{i:05d}" for i in range(len(segments))]
+        pending: dict[str, tuple[str, str, str]] = {}
+        for segment, name in zip(segments, names):
+            path = os.path.join(directory, name)
+            # a finished segment has no .aria2 control file left next to it
+            if os.path.exists(path) and not os.path.exists(f"{path}.aria2"):
+                continue
+            pending[self._add(segment.uri, headers, directory, name)] = (segment.uri, directory, name)
+
+        self._report(f"Queued {len(pending)} of {len(segments)} segments on aria2 ({directory})")
+        self._wait(pending, headers, len(segments))
+
+        part = f"{location}.part"
+        with open(part, "wb") as output:
+            for name in names:
+                with open(os.path.join(directory, name), "rb") as fragment:
+                    shutil.copyfileobj(fragment, output)
+            written = output.tell()
+        finish_download(part, location, self._report)
+        shutil.rmtree(directory, ignore_errors=True)
+
+        elapsed = time.monotonic() - started
+        return {
+            "bytes": written,
+            "segments": len(segments),
+            "duration": playlist.duration,
+            "seconds": elapsed,
+            "throughput": written / elapsed if elapsed else 0.0,
+        }
+
+    def _report(self, message: str) -> None:
+        if self.progress:
+            self.progress(message)
@@ -0,0 +1,76 @@
+import argparse
+from dataclasses import dataclass, field
+
+# ad, tracking and comment hosts the episode pages pull in; none of them is needed for the player
+DEFAULT_BLOCKED_DOMAINS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "google-analytics.com",
+    "adservice.google.com",
+    "amazon-adsystem.com",
+    "facebook.net",
+    "scorecardresearch.com",
+    "cloudflareinsights.com",
+    "histats.com",
+    "mc.yandex.ru",
+    "disqus.com",
+    "disquscdn.com",
+    "popads.net",
+    "popcash.net",
+    "onclickads.net",
+    "a-ads.com",
+    "adsterra.com",
+    "taboola.com",
+    "outbrain.com",
+)
+
+# URL patterns per resource type; the DevTools blocklist only matches URLs
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheet": ("css",),
+}
+DEFAULT_BLOCKED_TYPES = ("image", "font")
+
+
+@dataclass(frozen=True)
+class Blocklist:
+    """
+    Requests the headless browser never sends: URL patterns, resource types and ad domains.
+
+    :meth:`url_patterns` renders everything as wildcard patterns for ``Network.setBlockedURLs``.
+    Stylesheets are not blocked by default because some players position their play button with them.
+    """
+
+    patterns: tuple[str, ...] = ()
+    resource_types: tuple[str, ...] = DEFAULT_BLOCKED_TYPES
+    domains: tuple[str, ...] = field(default=DEFAULT_BLOCKED_DOMAINS)
+
+    def url_patterns(self) -> list[str]:
+        patterns = list(self.patterns)
+        for resource_type in self.resource_types:
+            for extension in RESOURCE_TYPE_EXTENSIONS[resource_type]:
+                # with and without a query string
+                patterns += [f"*.{extension}", f"*.{extension}?*"]
+        for domain in self.domains:
+            patterns.append(f"*://*{domain}/*")
+        return patterns
+
+
+def split_list(value: str) -> tuple[str, ...]:
+    """argparse type for comma-separated lists such as ``image,font``."""
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def resource_types(value: str) -> tuple[str, ...]:
+    """argparse type for ``--block-types``: a comma-separated subset of the known resource types, or ``none``."""
+    if value.strip().lower() == "none":
+        return ()
+    types = split_list(value)
+    unknown = [t for t in types if t not in RESOURCE_TYPE_EXTENSIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown resource type(s) {', '.join(unknown)}; choose from {', '.join(RESOURCE_TYPE_EXTENSIONS)}"
+        )
+    return types
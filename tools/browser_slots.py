@@ -0,0 +1,324 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+# assumed size of one headless Chrome until a real one was measured
+DEFAULT_BROWSER_MB = 600
+# share of the memory browsers may use; the rest is left to downloads, ffmpeg and the WebGUI
+MEMORY_SHARE = 0.75
+# seconds after its slot was taken until a browser is assumed to use its memory
+BROWSER_WARMUP = 30.0
+
+
+def default_slots_path() -> str:
+    """``browser_slots.db`` in ``CONFIG_DIR`` (``/config``), or the temp dir if that is not writable."""
+    config_dir = Path(os.environ.get("CONFIG_DIR", "/config"))
+    try:
+        config_dir.mkdir(parents=True, exist_ok=True)
+        if os.access(config_dir, os.W_OK):
+            return str(config_dir / "browser_slots.db")
+    except OSError:
+        pass
+    return os.path.join(tempfile.gettempdir(), "browser_slots.db")
+
+
+def _read_int(path: str) -> int | None:
+    try:
+        with open(path) as file:
+            value = file.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def available_memory_mb(cgroup_root: str = "/sys/fs/cgroup", meminfo: str = "/proc/meminfo") -> int | None:
+    """
+    Memory still free for this container: ``MemAvailable``, or less when a cgroup limit is closer.
+
+    Both cgroup v2 (``memory.max``) and v1 (``memory/memory.limit_in_bytes``) limits are read;
+    "no limit" shows up as ``max`` or a huge number and is ignored.
+    """
+    available: int | None = None
+    try:
+        with open(meminfo) as file:
+            fields = dict(line.split(":", 1) for line in file)
+        available = int(fields["MemAvailable"].split()[0]) * 1024
+    except (OSError, KeyError, ValueError):
+        pass
+
+    for limit_file, usage_file in (
+        ("memory.max", "memory.current"),
+        ("memory/memory.limit_in_bytes", "memory/memory.usage_in_bytes"),
+    ):
+        limit = _read_int(os.path.join(cgroup_root, limit_file))
+        usage = _read_int(os.path.join(cgroup_root, usage_file))
+        if limit is None or usage is None or limit >= 1 << 60:
+            continue
+        headroom = max(0, limit - usage)
+        available = headroom if available is None else min(available, headroom)
+        break
+
+    return available // 1024**2 if available is not None else None
+
+
+def process_tree_rss_mb(pid: int, proc: str = "/proc") -> float | None:
+    """Resident memory of ``pid`` and all its descendants, e.g. chromedriver and its Chrome processes."""
+    children: dict[int, list[int]] = {}
+    try:
+        entries = [entry for entry in os.listdir(proc) if entry.isdigit()]
+    except OSError:
+        return None
+    for entry in entries:
+        try:
+            with open(os.path.join(proc, entry, "stat")) as file:
+                # the command name in parentheses may contain spaces
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    found = False
+    todo = [pid]
+    while todo:
+        current = todo.pop()
+        todo.extend(children.get(current, []))
+        try:
+            with open(os.path.join(proc, str(current), "status")) as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        found = True
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024 if found else None
+
+
+class RssSampler:
+    """
+    Samples the summed resident memory of the browsers of a job in a background thread.
+
+    ``pids()`` returns the chromedriver pids of the browsers running right now; each sample is the
+    size of all their process trees. Used to compare resolution modes by peak and average RSS.
+    """
+
+    def __init__(
+        self,
+        pids: Callable[[], list[int]],
+        interval: float = 2.0,
+        measure: Callable[[int], float | None] = process_tree_rss_mb,
+    ) -> None:
+        self._pids = pids
+        self.interval = interval
+        self._measure = measure
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.samples = 0
+        self.peak_mb = 0.0
+        self._total_mb = 0.0
+
+    def sample(self) -> float:
+        total = sum(self._measure(pid) or 0.0 for pid in self._pids())
+        if total:
+            # only while browsers run, so the average is not diluted by HTTP-only stretches
+            self.samples += 1
+            self._total_mb += total
+            self.peak_mb = max(self.peak_mb, total)
+        return total
+
+    @property
+    def average_mb(self) -> float:
+        return self._total_mb / self.samples if self.samples else 0.0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+
+def process_started_at(pid: int, proc: str = "/proc") -> float | None:
+    """Wall-clock start time of ``pid`` from ``/proc``, ``None`` if it cannot be read."""
+    try:
+        with open(os.path.join(proc, str(pid), "stat")) as file:
+            # the command name in parentheses may contain spaces; starttime is field 22
+            start_ticks = int(file.read().rsplit(")", 1)[1].split()[19])
+        with open(os.path.join(proc, "stat")) as file:
+            boot_time = next(int(line.split()[1]) for line in file if line.startswith("btime "))
+    except (OSError, IndexError, ValueError, StopIteration):
+        return None
+    return boot_time + start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class BrowserSlots:
+    """
+    Host-wide limit on running browsers, shared by every extractor process through SQLite.
+
+    A browser holds a slot from start to quit. The number of slots is ``capacity`` when given,
+    otherwise what fits into :data:`MEMORY_SHARE` of the memory available to the container,
+    counting the memory of browsers that hold a slot for :data:`BROWSER_WARMUP` seconds as free,
+    at the measured size of one browser (:meth:`record_rss`). Browsers admitted more recently
+    have not taken their memory from the available memory yet, so they only take their slot. Slots of processes that died are reclaimed on the next acquire, as are
+    slots taken before their pid's process started, whose pid was reused after a container restart.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        capacity: int | None = None,
+        poll_interval: float = 1.0,
+        memory: Callable[[], int | None] = available_memory_mb,
+        started_at: Callable[[int], float | None] = process_started_at,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path or default_slots_path()
+        self.fixed_capacity = capacity
+        self.poll_interval = poll_interval
+        self._memory = memory
+        self._started_at = started_at
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS slots (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    pid INTEGER NOT NULL,
+                    owner TEXT NOT NULL,
+                    acquired_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS browser_rss (id INTEGER PRIMARY KEY CHECK (id = 1), mb REAL, samples INTEGER)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # autocommit mode, transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def browser_mb(self) -> float:
+        """Average measured resident size of one browser, or :data:`DEFAULT_BROWSER_MB`."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT mb FROM browser_rss WHERE id = 1").fetchone()
+        return row[0] if row and row[0] else DEFAULT_BROWSER_MB
+
+    def record_rss(self, mb: float) -> None:
+        """Fold a measured browser size into the moving average all processes use."""
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT mb, samples FROM browser_rss WHERE id = 1").fetchone()
+            average = mb if not row else row[0] * 0.8 + mb * 0.2
+            samples = (row[1] if row else 0) + 1
+            conn.execute("INSERT OR REPLACE INTO browser_rss (id, mb, samples) VALUES (1, ?, ?)", (average, samples))
+            conn.execute("COMMIT")
+
+    def _capacity(self, settled: int, browser_mb: float) -> int:
+        if self.fixed_capacity:
+            return self.fixed_capacity
+        available = self._memory()
+        if available is None:
+            return max(1, (os.cpu_count() or 2) // 2)
+        # settled browsers already use part of the memory they are counted against
+        budget = (available + settled * browser_mb) * MEMORY_SHARE
+        return max(1, int(budget // browser_mb))
+
+    def _try_acquire(self, owner: str, browser_mb: float) -> tuple[int | None, int, int]:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self._clock()
+                in_use = settled = 0
+                for slot_id, pid, acquired_at in conn.execute("SELECT id, pid, acquired_at FROM slots").fetchall():
+                    if not pid_alive(pid) or self._taken_before_start(pid, acquired_at):
+                        conn.execute("DELETE FROM slots WHERE id = ?", (slot_id,))
+                        continue
+                    in_use += 1
+                    if now - acquired_at >= BROWSER_WARMUP:
+                        settled += 1
+                capacity = self._capacity(settled, browser_mb)
+                slot_id = None
+                if in_use < capacity:
+                    slot_id = conn.execute(
+                        "INSERT INTO slots (pid, owner, acquired_at) VALUES (?, ?, ?)",
+                        (os.getpid(), owner, now),
+                    ).lastrowid
+                    in_use += 1
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return slot_id, in_use, capacity
+
+    def _taken_before_start(self, pid: int, acquired_at: float) -> bool:
+        started = self._started_at(pid)
+        return started is not None and acquired_at < started
+
+    def acquire(self, owner: str = "", on_wait: Callable[[int, int], None] | None = None) -> int:
+        """
+        Block until a browser may start; returns the slot id to :meth:`release` after quitting it.
+
+        ``on_wait(in_use, capacity)`` is called once when the caller has to wait.
+        """
+        browser_mb = self.browser_mb()
+        started = time.monotonic()
+        waited = False
+        while True:
+            slot_id, in_use, capacity = self._try_acquire(owner, browser_mb)
+            if slot_id is not None:
+                if waited:
+                    with self._lock:
+                        self.waits += 1
+                        self.wait_seconds += time.monotonic() - started
+                return slot_id
+            if not waited and on_wait:
+                on_wait(in_use, capacity)
+            waited = True
+            time.sleep(self.poll_interval)
+
+    def release(self, slot_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM slots WHERE id = ?", (slot_id,))
+
+    @contextmanager
+    def slot(self, owner: str = "", on_wait: Callable[[int, int], None] | None = None) -> Iterator[int]:
+        slot_id = self.acquire(owner, on_wait)
+        try:
+            yield slot_id
+        finally:
+            self.release(slot_id)
+
+    def in_use(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM slots").fetchone()[0]
@@ -0,0 +1,198 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from tools.cdp import CdpNetworkSniffer, CdpTab
+
+UrlFilter = Callable[[str], bool]
+
+
+@dataclass(frozen=True)
+class CapturePolicy:
+    """
+    When the media capture of an episode page stops.
+
+    Without a stream the capture gives up ``deadline`` seconds after the page was opened. Once
+    the m3u8 is found, subtitles get ``subtitle_grace`` more seconds, so episodes with hard-subbed
+    or missing subtitles do not wait out the deadline. The page is refreshed (at most
+    ``max_refreshes`` times) when it sent no request at all, media or not, for ``idle_refresh``
+    seconds.
+    """
+
+    deadline: float = 60.0
+    subtitle_grace: float = 5.0
+    idle_refresh: float = 15.0
+    max_refreshes: int = 2
+    poll_interval: float = 0.5
+
+
+class CaptureWindow:
+    """Applies a :class:`CapturePolicy` to one capture; :meth:`next_action` is asked after every poll."""
+
+    def __init__(
+        self, policy: CapturePolicy, started: float | None = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.policy = policy
+        self._clock = clock
+        self.started = self.last_activity = started if started is not None else clock()
+        self.stream_found_at: float | None = None
+        self.activity = 0
+        self.refreshes = 0
+        self.outcome = ""
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    def next_action(self, found_stream: bool, found_subtitles: bool, activity: int) -> str:
+        """
+        ``"done"``, ``"timeout"``, ``"refresh"`` or ``"wait"``; sets :attr:`outcome` when it ends.
+
+        ``activity`` is the feed's count of requests the page sent so far (see ``activity`` of
+        the request feeds); any change counts as the page still loading.
+        """
+        now = self._clock()
+        if activity != self.activity:
+            self.activity = activity
+            self.last_activity = now
+
+        if found_stream:
+            if self.stream_found_at is None:
+                self.stream_found_at = now
+            if found_subtitles:
+                self.outcome = "stream and subtitles found"
+                return "done"
+            if now - self.stream_found_at >= self.policy.subtitle_grace:
+                self.outcome = "no subtitles within the grace window"
+                return "done"
+            return "wait"
+
+        if now - self.started >= self.policy.deadline:
+            self.outcome = f"no stream within {self.policy.deadline:.0f}s"
+            return "timeout"
+        if now - self.last_activity >= self.policy.idle_refresh and self.refreshes < self.policy.max_refreshes:
+            self.refreshes += 1
+            self.last_activity = now
+            return "refresh"
+        return "wait"
+
+
+class WireRequestFeed:
+    """
+    Incremental view of the requests recorded by a selenium-wire driver.
+
+    Every ``poll()`` only looks at requests recorded since the previous poll (plus the ones that
+    were still waiting for a response), so each request is examined once instead of rescanning
+    ``driver.requests`` from the start on every attempt. With the on-disk store the request index
+    already carries the URL, so requests rejected by ``url_filter`` are never unpickled.
+
+    With ``driver.scopes`` set the store only holds the requests in scope, so ``activity`` (the
+    count of all requests the page sent) comes from ``activity`` when given, e.g. the request
+    blocker's DevTools connection; otherwise only the recorded requests count.
+    """
+
+    def __init__(
+        self, driver: Any, url_filter: UrlFilter | None = None, activity: Callable[[], int] | None = None
+    ) -> None:
+        self.driver = driver
+        self.url_filter = url_filter
+        self._activity = activity
+        self.storage = driver.backend.storage
+        self.cursor = 0
+        self.pending: dict[str, Any] = {}
+        self.seen_ids: set[str] = set()
+        self.seen_urls: list[str] = []
+        self.examined = 0
+        self.completed = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.seen_ids)
+
+    @property
+    def activity(self) -> int:
+        return self._activity() if self._activity else self.total
+
+    def poll(self) -> list[tuple[str, dict[str, str]]]:
+        """Return ``(url, headers)`` for requests whose response arrived since the last poll."""
+        index = getattr(self.storage, "_index", None)
+        if index is None:
+            return self._poll_loaded()
+
+        with self.storage._lock:
+            if len(index) < self.cursor:
+                # storage was cleared underneath us
+                self.cursor = 0
+            new_entries = index[self.cursor:]
+            self.cursor += len(new_entries)
+
+        for entry in new_entries:
+            self._see(entry.id, entry.url)
+            self.pending[entry.id] = entry
+
+        ready: list[tuple[str, dict[str, str]]] = []
+        for request_id, entry in list(self.pending.items()):
+            if not entry.has_response:
+                continue
+            del self.pending[request_id]
+            self.completed += 1
+            if self.url_filter and not self.url_filter(entry.url.lower()):
+                continue
+            self.examined += 1
+            request = self.storage._load_request(request_id)
+            if request is not None:
+                ready.append((request.url, dict(request.headers)))
+        return ready
+
+    def _poll_loaded(self) -> list[tuple[str, dict[str, str]]]:
+        # in-memory storage hands out live request objects, so listing them is cheap
+        for request in self.driver.requests:
+            if request.id not in self.seen_ids:
+                self._see(request.id, request.url)
+                self.pending[request.id] = request
+
+        ready: list[tuple[str, dict[str, str]]] = []
+        for request_id, request in list(self.pending.items()):
+            if not request.response:
+                continue
+            del self.pending[request_id]
+            self.completed += 1
+            if self.url_filter and not self.url_filter(request.url.lower()):
+                continue
+            self.examined += 1
+            ready.append((request.url, dict(request.headers)))
+        return ready
+
+    def _see(self, request_id: str, url: str) -> None:
+        self.seen_ids.add(request_id)
+        self.seen_urls.append(url.lower())
+
+
+class SnifferRequestFeed:
+    """Same interface as :class:`WireRequestFeed` on top of the queue of a CDP sniffer or tab."""
+
+    def __init__(self, sniffer: CdpNetworkSniffer | CdpTab, wait: float = 1) -> None:
+        self.sniffer = sniffer
+        self.wait = wait
+        self.seen_urls: list[str] = []
+        self.examined = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.seen_urls)
+
+    @property
+    def completed(self) -> int:
+        return len(self.seen_urls)
+
+    @property
+    def activity(self) -> int:
+        """Every request the page sent, not only the captured media, so a busy page is not idle."""
+        return self.sniffer.requests_sent
+
+    def poll(self) -> list[tuple[str, dict[str, str]]]:
+        # blocks until something arrives, which replaces the fixed polling sleep
+        ready = [(r.url, r.headers) for r in self.sniffer.drain(timeout=self.wait)]
+        self.seen_urls.extend(url.lower() for url, _ in ready)
+        self.examined += len(ready)
+        return ready
@@ -0,0 +1,496 @@
+import itertools
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+import websocket
+
+CdpListener = Callable[[str, dict[str, Any], str | None], None]
+
+
+class CdpError(Exception):
+    pass
+
+
+class CdpConnection:
+    """
+    Minimal Chrome DevTools Protocol client on the browser-level websocket.
+
+    Uses flattened sessions, so commands for a page or iframe target are sent on this single
+    connection with a ``sessionId``. Events are dispatched from a background reader thread to the
+    registered listeners; listeners must not block on ``send(..., wait=True)``.
+    """
+
+    def __init__(self, debugger_address: str, timeout: float = 10) -> None:
+        with urlopen(f"http://{debugger_address}/json/version", timeout=timeout) as response:
+            ws_url = json.loads(response.read().decode("utf-8"))["webSocketDebuggerUrl"]
+
+        # Chrome rejects websocket clients that send an Origin header unless --remote-allow-origins is set
+        self._ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self._ws.settimeout(None)
+        self._ids = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._listeners: list[CdpListener] = []
+        self.closed = False
+
+        self._reader = threading.Thread(target=self._read_loop, name="cdp-reader", daemon=True)
+        self._reader.start()
+
+    @classmethod
+    def for_driver(cls, driver: Any) -> "CdpConnection":
+        """Connect to the browser behind a chromedriver session."""
+        address = driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        return cls(address)
+
+    def add_listener(self, listener: CdpListener) -> None:
+        # copied on write, the reader thread iterates over the list without a lock
+        self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener: CdpListener) -> None:
+        self._listeners = [known for known in self._listeners if known != listener]
+
+    def send(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        session_id: str | None = None,
+        wait: bool = True,
+        timeout: float = 10,
+    ) -> dict[str, Any]:
+        message_id = next(self._ids)
+        message: dict[str, Any] = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        waiter: dict[str, Any] = {"event": threading.Event()}
+        if wait:
+            with self._pending_lock:
+                self._pending[message_id] = waiter
+
+        with self._send_lock:
+            self._ws.send(json.dumps(message))
+
+        if not wait:
+            return {}
+
+        if not waiter["event"].wait(timeout):
+            with self._pending_lock:
+                self._pending.pop(message_id, None)
+            raise CdpError(f"Timed out waiting for {method}")
+        if "error" in waiter["message"]:
+            raise CdpError(f"{method} failed: {waiter['message']['error'].get('message')}")
+        return waiter["message"].get("result", {})
+
+    def _read_loop(self) -> None:
+        while not self.closed:
+            try:
+                message = json.loads(self._ws.recv())
+            except Exception:
+                break
+
+            if "id" in message:
+                with self._pending_lock:
+                    waiter = self._pending.pop(message["id"], None)
+                if waiter:
+                    waiter["message"] = message
+                    waiter["event"].set()
+                continue
+
+            for listener in self._listeners:
+                try:
+                    listener(message.get("method", ""), message.get("params", {}), message.get("sessionId"))
+                except Exception:
+                    pass
+
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+@dataclass
+class CapturedRequest:
+    url: str
+    headers: dict[str, str]
+    status: int | None = None
+    session_id: str | None = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+class MediaRecorder:
+    """
+    Turns ``Network`` events into :class:`CapturedRequest` objects for URLs accepted by ``url_filter``.
+
+    A request is queued once its response headers arrived; the headers are those actually sent,
+    including the ones only reported by ``Network.requestWillBeSentExtraInfo``. :attr:`sent`
+    counts every request, matching or not, as a measure of network activity.
+    """
+
+    def __init__(self, url_filter: Callable[[str], bool]) -> None:
+        self.url_filter = url_filter
+        self.requests: queue.Queue[CapturedRequest] = queue.Queue()
+        self.sent = 0
+        self._inflight: dict[tuple[str | None, str], CapturedRequest] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, method: str, params: dict[str, Any], session_id: str | None) -> None:
+        key = (session_id, params.get("requestId", ""))
+        if method == "Network.requestWillBeSent":
+            self.sent += 1
+            url = params["request"]["url"]
+            if self.url_filter(url.lower()):
+                with self._lock:
+                    self._inflight[key] = CapturedRequest(
+                        url=url, headers=dict(params["request"].get("headers", {})), session_id=session_id
+                    )
+        elif method == "Network.requestWillBeSentExtraInfo":
+            with self._lock:
+                captured = self._inflight.get(key)
+                if captured:
+                    # the extra info carries the headers actually sent (cookies, sec-* etc.)
+                    captured.headers.update(
+                        {k: v for k, v in params.get("headers", {}).items() if not k.startswith(":")}
+                    )
+        elif method == "Network.responseReceived":
+            with self._lock:
+                captured = self._inflight.pop(key, None)
+            if captured:
+                captured.status = params["response"].get("status")
+                self.requests.put(captured)
+        elif method == "Network.loadingFailed":
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def drain(self, timeout: float = 0) -> list[CapturedRequest]:
+        """Return every queued request, waiting up to ``timeout`` seconds for the first one."""
+        drained: list[CapturedRequest] = []
+        try:
+            drained.append(self.requests.get(timeout=timeout) if timeout else self.requests.get_nowait())
+            while True:
+                drained.append(self.requests.get_nowait())
+        except queue.Empty:
+            pass
+        return drained
+
+    def clear(self) -> None:
+        with self._lock:
+            self._inflight.clear()
+        self.drain()
+
+
+class BlockedCounter:
+    """
+    Counts requests stopped by ``Network.setBlockedURLs`` per host, from ``Network.loadingFailed`` events.
+
+    :attr:`sent` counts every request that was attempted, blocked or not.
+    """
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.blocked = 0
+        self.by_host: dict[str, int] = {}
+        self._urls: dict[tuple[str | None, str], str] = {}
+        self._lock = threading.Lock()
+
+    def handle(self, method: str, params: dict[str, Any], session_id: str | None) -> None:
+        key = (session_id, params.get("requestId", ""))
+        if method == "Network.requestWillBeSent":
+            with self._lock:
+                self.sent += 1
+                self._urls[key] = params["request"]["url"]
+        elif method == "Network.loadingFinished":
+            with self._lock:
+                self._urls.pop(key, None)
+        elif method == "Network.loadingFailed":
+            with self._lock:
+                url = self._urls.pop(key, "")
+                if params.get("blockedReason") == "inspector":
+                    host = urlsplit(url).hostname or "unknown"
+                    self.blocked += 1
+                    self.by_host[host] = self.by_host.get(host, 0) + 1
+
+    def counts(self) -> dict[str, int]:
+        """Blocked requests per host so far."""
+        with self._lock:
+            return dict(self.by_host)
+
+
+class CdpNetworkSniffer:
+    """
+    Streams matching network requests of a Chrome page (including its iframes) into a queue.
+
+    Subscribes to ``Network.requestWillBeSent``/``Network.responseReceived`` on the page target and
+    every auto-attached child target, so manifest and subtitle URLs are available as soon as their
+    response headers arrive, without a MITM proxy or on-disk request storage.
+    """
+
+    def __init__(self, driver: Any, url_filter: Callable[[str], bool]) -> None:
+        self.recorder = MediaRecorder(url_filter)
+        self.requests = self.recorder.requests
+
+        self.connection = CdpConnection.for_driver(driver)
+        self.connection.add_listener(self._on_event)
+
+        targets = self.connection.send("Target.getTargets")["targetInfos"]
+        page = next(t for t in targets if t["type"] == "page")
+        self.session_id: str = self.connection.send(
+            "Target.attachToTarget", {"targetId": page["targetId"], "flatten": True}
+        )["sessionId"]
+        self._enable(self.session_id, wait=True)
+
+    def _enable(self, session_id: str, wait: bool = False) -> None:
+        self.connection.send("Network.enable", session_id=session_id, wait=wait)
+        self.connection.send(
+            "Target.setAutoAttach",
+            {"autoAttach": True, "waitForDebuggerOnStart": False, "flatten": True},
+            session_id=session_id,
+            wait=wait,
+        )
+
+    def _on_event(self, method: str, params: dict[str, Any], session_id: str | None) -> None:
+        if method == "Target.attachedToTarget":
+            # player iframes are out-of-process targets with their own network domain
+            self._enable(params["sessionId"])
+            return
+        self.recorder.handle(method, params, session_id)
+
+    @property
+    def requests_sent(self) -> int:
+        """Requests of any kind the page and its iframes sent so far."""
+        return self.recorder.sent
+
+    def drain(self, timeout: float = 0) -> list[CapturedRequest]:
+        return self.recorder.drain(timeout)
+
+    def clear(self) -> None:
+        self.recorder.clear()
+
+    def stop(self) -> None:
+        self.connection.close()
+
+
+class CdpRequestBlocker:
+    """
+    Applies a ``Network.setBlockedURLs`` blocklist to a page and all its iframes, and counts what it blocks.
+
+    Works with either capture backend: it keeps its own DevTools connection, so its sessions and
+    events stay apart from those of a :class:`CdpNetworkSniffer` on the same browser. Blocked
+    requests are counted per host from ``Network.loadingFailed`` events with ``blockedReason``
+    ``inspector``.
+    """
+
+    def __init__(self, connection: CdpConnection, patterns: list[str]) -> None:
+        self.patterns = patterns
+        self.counter = BlockedCounter()
+
+        self.connection = connection
+        self.connection.add_listener(self._on_event)
+
+        targets = self.connection.send("Target.getTargets")["targetInfos"]
+        page = next(t for t in targets if t["type"] == "page")
+        session_id = self.connection.send(
+            "Target.attachToTarget", {"targetId": page["targetId"], "flatten": True}
+        )["sessionId"]
+        self._apply(session_id, wait=True)
+
+    def _apply(self, session_id: str, wait: bool = False) -> None:
+        self.connection.send("Network.enable", session_id=session_id, wait=wait)
+        self.connection.send("Network.setBlockedURLs", {"urls": self.patterns}, session_id=session_id, wait=wait)
+        self.connection.send(
+            "Target.setAutoAttach",
+            {"autoAttach": True, "waitForDebuggerOnStart": False, "flatten": True},
+            session_id=session_id,
+            wait=wait,
+        )
+
+    def _on_event(self, method: str, params: dict[str, Any], session_id: str | None) -> None:
+        if method == "Target.attachedToTarget":
+            # out-of-process iframes do not inherit the blocklist of their page
+            self._apply(params["sessionId"])
+            return
+        self.counter.handle(method, params, session_id)
+
+    @property
+    def blocked(self) -> int:
+        return self.counter.blocked
+
+    @property
+    def requests_sent(self) -> int:
+        """Requests of any kind the page and its iframes sent so far, blocked ones included."""
+        return self.counter.sent
+
+    def counts(self) -> dict[str, int]:
+        """Blocked requests per host so far."""
+        return self.counter.counts()
+
+    @classmethod
+    def for_driver(cls, driver: Any, patterns: list[str]) -> "CdpRequestBlocker":
+        return cls(CdpConnection.for_driver(driver), patterns)
+
+    def stop(self) -> None:
+        self.connection.close()
+
+
+class CdpTab:
+    """
+    An isolated tab in a shared browser, driven entirely over DevTools.
+
+    Every tab lives in its own browser context, so cookies, cache and storage are as separate as
+    in a browser of its own, and several tabs can load pages at the same time from different
+    threads. Only events of the tab's page session and of the iframes auto-attached to it are
+    handled, so each captured request is attributed to the tab that made it. ``blocked_patterns``
+    are applied to the page and every iframe like :class:`CdpRequestBlocker` does.
+    """
+
+    def __init__(
+        self,
+        connection: CdpConnection,
+        url_filter: Callable[[str], bool],
+        blocked_patterns: list[str] | None = None,
+        user_agent: str | None = None,
+        device_metrics: dict[str, Any] | None = None,
+        init_script: str | None = None,
+    ) -> None:
+        self.connection = connection
+        self.blocked_patterns = blocked_patterns or []
+        self.recorder = MediaRecorder(url_filter)
+        self.counter = BlockedCounter()
+        self._lock = threading.Lock()
+        self._sessions: set[str] = set()
+        self._frames: list[str] = []
+        self._loaded = threading.Event()
+
+        self.context_id: str = connection.send("Target.createBrowserContext", {"disposeOnDetach": True})[
+            "browserContextId"
+        ]
+        self.target_id: str = connection.send(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id}
+        )["targetId"]
+        connection.add_listener(self._on_event)
+        self.session_id: str = connection.send(
+            "Target.attachToTarget", {"targetId": self.target_id, "flatten": True}
+        )["sessionId"]
+        with self._lock:
+            self._sessions.add(self.session_id)
+
+        self.send("Page.enable")
+        if user_agent:
+            self.send("Emulation.setUserAgentOverride", {"userAgent": user_agent})
+        if device_metrics:
+            self.send("Emulation.setDeviceMetricsOverride", device_metrics)
+            if device_metrics.get("mobile"):
+                self.send("Emulation.setTouchEmulationEnabled", {"enabled": True})
+        if init_script:
+            self.send("Page.addScriptToEvaluateOnNewDocument", {"source": init_script})
+        self._enable(self.session_id, wait=True)
+
+    def send(self, method: str, params: dict[str, Any] | None = None, session_id: str | None = None) -> dict[str, Any]:
+        """Send a command to the page, or to the iframe session ``session_id``."""
+        return self.connection.send(method, params, session_id=session_id or self.session_id)
+
+    def _enable(self, session_id: str, wait: bool = False) -> None:
+        self.connection.send("Network.enable", session_id=session_id, wait=wait)
+        if self.blocked_patterns:
+            self.connection.send(
+                "Network.setBlockedURLs", {"urls": self.blocked_patterns}, session_id=session_id, wait=wait
+            )
+        self.connection.send(
+            "Target.setAutoAttach",
+            {"autoAttach": True, "waitForDebuggerOnStart": False, "flatten": True},
+            session_id=session_id,
+            wait=wait,
+        )
+
+    def _on_event(self, method: str, params: dict[str, Any], session_id: str | None) -> None:
+        with self._lock:
+            if session_id not in self._sessions:
+                return  # another tab, or the browser itself
+
+        if method == "Target.attachedToTarget":
+            child = params["sessionId"]
+            with self._lock:
+                self._sessions.add(child)
+                if params.get("targetInfo", {}).get("type") == "iframe":
+                    self._frames.append(child)
+            self._enable(child)
+        elif method == "Target.detachedFromTarget":
+            with self._lock:
+                self._sessions.discard(params.get("sessionId", ""))
+                if params.get("sessionId") in self._frames:
+                    self._frames.remove(params["sessionId"])
+        elif method == "Page.domContentEventFired" and session_id == self.session_id:
+            self._loaded.set()
+        elif method == "Page.javascriptDialogOpening":
+            self.connection.send("Page.handleJavaScriptDialog", {"accept": True}, session_id=session_id, wait=False)
+        else:
+            self.recorder.handle(method, params, session_id)
+            self.counter.handle(method, params, session_id)
+
+    def navigate(self, url: str, timeout: float = 30) -> None:
+        """Open ``url`` and return at ``DOMContentLoaded``, like the eager page load strategy."""
+        self._loaded.clear()
+        result = self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CdpError(f"Loading {url} failed: {result['errorText']}")
+        if not self._loaded.wait(timeout):
+            raise CdpError(f"Timed out loading {url}")
+
+    def reload(self) -> None:
+        self.send("Page.reload")
+
+    def frames(self) -> list[str]:
+        """Sessions of the iframes attached so far, in the order they appeared."""
+        with self._lock:
+            return list(self._frames)
+
+    def evaluate(self, expression: str, session_id: str | None = None) -> Any:
+        """Value of ``expression`` in the page or in the iframe session ``session_id``."""
+        result = self.send("Runtime.evaluate", {"expression": expression, "returnByValue": True}, session_id)
+        return result.get("result", {}).get("value")
+
+    def click(self, x: float, y: float) -> None:
+        """A real mouse click at page coordinates; it reaches into iframes and counts as a user gesture."""
+        self.send("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": x, "y": y})
+        for event in ("mousePressed", "mouseReleased"):
+            self.send("Input.dispatchMouseEvent", {"type": event, "x": x, "y": y, "button": "left", "clickCount": 1})
+
+    @property
+    def blocked(self) -> int:
+        return self.counter.blocked
+
+    def counts(self) -> dict[str, int]:
+        return self.counter.counts()
+
+    @property
+    def requests_sent(self) -> int:
+        """Requests of any kind the tab and its iframes sent so far."""
+        return self.recorder.sent
+
+    def drain(self, timeout: float = 0) -> list[CapturedRequest]:
+        return self.recorder.drain(timeout)
+
+    def clear(self) -> None:
+        self.recorder.clear()
+
+    def close(self) -> None:
+        """Close the tab and drop its browser context with everything the page stored."""
+        self.connection.remove_listener(self._on_event)
+        for method, params in (
+            ("Target.closeTarget", {"targetId": self.target_id}),
+            ("Target.disposeBrowserContext", {"browserContextId": self.context_id}),
+        ):
+            try:
+                self.connection.send(method, params)
+            except Exception:
+                pass  # the browser is gone, and the tab with it
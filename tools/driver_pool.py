@@ -0,0 +1,137 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+
+@dataclass
+class PooledDriver:
+    driver: Any
+    serial: int
+    startup_time: float
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class DriverPool:
+    """
+    Bounded pool of warm browser drivers shared by the episode workers.
+
+    Drivers are created lazily through ``factory`` (a pool miss), handed out to at most
+    ``max_size`` workers at a time and reset with ``reset`` when they are returned so the
+    next episode starts from a clean page. A driver is recycled (``dispose`` + a fresh one
+    on the next miss) when the worker raised while using it, when ``reset`` fails, or once
+    it has served ``max_uses`` pages.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        reset: Callable[[Any], None],
+        dispose: Callable[[Any], None],
+        max_size: int = 3,
+        max_uses: int = 10,
+    ) -> None:
+        self._factory = factory
+        self._reset = reset
+        self._dispose = dispose
+        self.max_size = max(1, max_size)
+        self.max_uses = max(1, max_uses)
+
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._idle: list[PooledDriver] = []
+        self._closed = False
+        self._serial = 0
+
+        # stats
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.startup_times: dict[int, float] = {}
+
+    @contextmanager
+    def driver(self) -> Iterator[Any]:
+        """Borrow a driver for the duration of the ``with`` block."""
+        self._slots.acquire()
+        entry: PooledDriver | None = None
+        healthy = False
+        try:
+            entry = self._checkout()
+            yield entry.driver
+            healthy = True
+        finally:
+            try:
+                if entry is not None:
+                    self._checkin(entry, healthy)
+            finally:
+                self._slots.release()
+
+    def _checkout(self) -> PooledDriver:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Driver pool is closed")
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop()
+            self.misses += 1
+            self._serial += 1
+            serial = self._serial
+
+        start = time.monotonic()
+        driver = self._factory()
+        startup_time = time.monotonic() - start
+
+        with self._lock:
+            self.startup_times[serial] = startup_time
+        return PooledDriver(driver=driver, serial=serial, startup_time=startup_time)
+
+    def _checkin(self, entry: PooledDriver, healthy: bool) -> None:
+        entry.uses += 1
+        keep = healthy and entry.uses < self.max_uses and not self._closed
+        if keep:
+            try:
+                self._reset(entry.driver)
+            except Exception:
+                keep = False
+
+        if keep:
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(entry)
+                    return
+
+        with self._lock:
+            self.recycled += 1
+        self._safe_dispose(entry)
+
+    def _safe_dispose(self, entry: PooledDriver) -> None:
+        try:
+            self._dispose(entry.driver)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Dispose every idle driver; drivers still borrowed are disposed when returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            self._safe_dispose(entry)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            startup_times = dict(self.startup_times)
+            hits, misses, recycled = self.hits, self.misses, self.recycled
+
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "recycled": recycled,
+            "drivers_started": len(startup_times),
+            "startup_times": startup_times,
+            "avg_startup_time": sum(startup_times.values()) / len(startup_times) if startup_times else 0.0,
+        }
@@ -0,0 +1,121 @@
+import re
+from dataclasses import dataclass, field
+from urllib.parse import urljoin
+
+ATTRIBUTE_RE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+def parse_attributes(line: str) -> dict[str, str]:
+    """Attribute list of an HLS tag (``#TAG:KEY=value,KEY="quoted, value"``) as a dict."""
+    _, _, attributes = line.partition(":")
+    return {key: value.strip('"') for key, value in ATTRIBUTE_RE.findall(attributes)}
+
+
+@dataclass
+class Variant:
+    uri: str
+    bandwidth: int = 0
+    average_bandwidth: int | None = None
+    width: int | None = None
+    height: int | None = None
+    codecs: str | None = None
+    frame_rate: float | None = None
+    audio_group: str | None = None
+
+    @property
+    def bitrate(self) -> int:
+        """Bitrate used for comparisons, preferring the average over the peak bandwidth."""
+        return self.average_bandwidth or self.bandwidth
+
+    def describe(self) -> str:
+        resolution = f"{self.width}x{self.height}" if self.height else "unknown resolution"
+        return f"{resolution} @ {self.bitrate // 1000} kbps"
+
+
+@dataclass
+class MasterPlaylist:
+    url: str
+    variants: list[Variant] = field(default_factory=list)
+    # AUDIO group id -> rendition URIs, for variants that carry their audio separately
+    audio_groups: dict[str, list[str]] = field(default_factory=dict)
+
+    def has_separate_audio(self, variant: Variant) -> bool:
+        return bool(variant.audio_group and self.audio_groups.get(variant.audio_group))
+
+
+def parse_master_playlist(text: str, url: str) -> MasterPlaylist:
+    """
+    Parse the ``#EXT-X-STREAM-INF`` variants of a master playlist.
+
+    A media playlist (segments, no variants) parses to an empty ``variants`` list. Variant and
+    rendition URIs are resolved against ``url``.
+    """
+    playlist = MasterPlaylist(url=url)
+    pending: dict[str, str] | None = None
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+
+        if line.startswith("#EXT-X-STREAM-INF"):
+            pending = parse_attributes(line)
+        elif line.startswith("#EXT-X-MEDIA:"):
+            media = parse_attributes(line)
+            if media.get("TYPE") == "AUDIO" and media.get("URI"):
+                playlist.audio_groups.setdefault(media.get("GROUP-ID", ""), []).append(urljoin(url, media["URI"]))
+        elif not line.startswith("#") and pending is not None:
+            playlist.variants.append(_variant(urljoin(url, line), pending))
+            pending = None
+
+    return playlist
+
+
+def _variant(uri: str, attributes: dict[str, str]) -> Variant:
+    width = height = None
+    resolution = re.fullmatch(r"(\d+)x(\d+)", attributes.get("RESOLUTION", ""))
+    if resolution:
+        width, height = int(resolution.group(1)), int(resolution.group(2))
+
+    average = attributes.get("AVERAGE-BANDWIDTH")
+    frame_rate = attributes.get("FRAME-RATE")
+    return Variant(
+        uri=uri,
+        bandwidth=int(attributes.get("BANDWIDTH") or 0),
+        average_bandwidth=int(average) if average else None,
+        width=width,
+        height=height,
+        codecs=attributes.get("CODECS"),
+        frame_rate=float(frame_rate) if frame_rate else None,
+        audio_group=attributes.get("AUDIO"),
+    )
+
+
+def select_variant(variants: list[Variant], quality: str = "best", max_bitrate: int | None = None) -> Variant | None:
+    """
+    Pick a variant by policy.
+
+    ``quality`` is ``best`` (highest resolution, then bitrate), ``worst``, or a target height
+    such as ``720``/``720p`` (closest height, preferring the lower one on a tie). ``max_bitrate``
+    (bits per second) drops variants above the cap first; if none fit, the lowest-bitrate
+    variant is returned.
+    """
+    if not variants:
+        return None
+
+    candidates = variants
+    if max_bitrate:
+        candidates = [v for v in variants if v.bitrate <= max_bitrate]
+        if not candidates:
+            return min(variants, key=lambda v: v.bitrate)
+
+    quality = (quality or "best").lower().strip()
+    if quality == "worst":
+        return min(candidates, key=lambda v: (v.height or 0, v.bitrate))
+
+    target = re.fullmatch(r"(\d+)p?", quality)
+    if target:
+        height = int(target.group(1))
+        return min(candidates, key=lambda v: (abs((v.height or 0) - height), (v.height or 0) > height, -v.bitrate))
+
+    return max(candidates, key=lambda v: (v.height or 0, v.bitrate))
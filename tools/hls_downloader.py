@@ -0,0 +1,335 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable
+from urllib.parse import urljoin
+
+import requests
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from tools.hls import parse_attributes, parse_master_playlist, select_variant
+from tools.http_client import HttpClient, shared_client
+from tools.resume import clear_state, load_state, save_state
+
+
+class HlsDownloadError(Exception):
+    pass
+
+
+@dataclass
+class SegmentKey:
+    method: str
+    uri: str
+    iv: bytes | None = None
+
+
+@dataclass
+class Segment:
+    uri: str
+    sequence: int
+    duration: float = 0
+    key: SegmentKey | None = None
+    byte_range: tuple[int, int] | None = None  # (offset, length)
+
+
+@dataclass
+class MediaPlaylist:
+    url: str
+    segments: list[Segment] = field(default_factory=list)
+    init_segment: Segment | None = None
+
+    @property
+    def duration(self) -> float:
+        return sum(segment.duration for segment in self.segments)
+
+
+def parse_media_playlist(text: str, url: str) -> MediaPlaylist:
+    """Parse segments, ``#EXT-X-KEY``, ``#EXT-X-MAP`` and ``#EXT-X-BYTERANGE`` of a media playlist."""
+    playlist = MediaPlaylist(url=url)
+    sequence = 0
+    key: SegmentKey | None = None
+    duration = 0.0
+    byte_range: tuple[int, int] | None = None
+    next_offset = 0
+
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+
+        if line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+            sequence = int(line.split(":", 1)[1])
+        elif line.startswith("#EXT-X-KEY:"):
+            attributes = parse_attributes(line)
+            method = attributes.get("METHOD", "NONE")
+            if method == "NONE":
+                key = None
+            elif method == "AES-128":
+                iv = attributes.get("IV")
+                key = SegmentKey(
+                    method=method,
+                    uri=urljoin(url, attributes["URI"]),
+                    iv=bytes.fromhex(iv[2:] if iv.lower().startswith("0x") else iv) if iv else None,
+                )
+            else:
+                raise HlsDownloadError(f"Unsupported encryption {method}")
+        elif line.startswith("#EXT-X-MAP:"):
+            attributes = parse_attributes(line)
+            playlist.init_segment = Segment(uri=urljoin(url, attributes["URI"]), sequence=-1)
+        elif line.startswith("#EXTINF:"):
+            duration = float(line.split(":", 1)[1].split(",", 1)[0] or 0)
+        elif line.startswith("#EXT-X-BYTERANGE:"):
+            length, _, offset = line.split(":", 1)[1].partition("@")
+            start = int(offset) if offset else next_offset
+            byte_range = (start, int(length))
+            next_offset = start + int(length)
+        elif not line.startswith("#"):
+            playlist.segments.append(
+                Segment(uri=urljoin(url, line), sequence=sequence, duration=duration, key=key, byte_range=byte_range)
+            )
+            sequence += 1
+            duration = 0.0
+            byte_range = None
+
+    return playlist
+
+
+def format_size(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.2f}{unit}"
+        size /= 1024
+    return f"{size:.2f}GiB"
+
+
+def finish_download(part: str, location: str, report: Callable[[str], None] | None = None) -> None:
+    """Move a finished ``.part`` file into place, remuxing MPEG-TS to MP4 when ffmpeg is available."""
+    ffmpeg = shutil.which("ffmpeg")
+    with open(part, "rb") as file:
+        is_ts = file.read(1) == b"\x47"
+
+    if location.endswith(".mp4") and is_ts and ffmpeg:
+        if report:
+            report(f"Remuxing {os.path.basename(location)} to MP4")
+        result = subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "mpegts", "-i", part, "-c", "copy",
+             "-bsf:a", "aac_adtstoasc", "-f", "mp4", location],
+            capture_output=True,
+        )
+        if result.returncode == 0:
+            os.remove(part)
+            return
+        if report:
+            report(f"Remux failed, keeping MPEG-TS: {result.stderr.decode(errors='replace').strip()}")
+    os.replace(part, location)
+
+
+class HlsDownloader:
+    """
+    Concurrent HLS downloader.
+
+    Fetches the segments of a media playlist with ``workers`` threads over the shared pooled
+    client, decrypts AES-128 segments and appends them to the output file in playlist order.
+    At most ``window`` segments are in flight or waiting to be written, which bounds memory
+    regardless of the episode length. Each segment is retried ``retries`` times before the
+    download fails with :class:`HlsDownloadError`. MPEG-TS output is remuxed to MP4 with ffmpeg
+    when the target ends in ``.mp4`` and ffmpeg is available.
+
+    Every ``checkpoint_interval`` seconds the number of fragments written is saved next to the
+    output file (see :mod:`tools.resume`). A download that was interrupted continues from the
+    last checkpoint, as long as the playlist still has the same number of fragments.
+    """
+
+    def __init__(
+        self,
+        http: HttpClient | None = None,
+        workers: int = 8,
+        retries: int = 3,
+        window: int | None = None,
+        progress: Callable[[str], None] | None = None,
+        checkpoint_interval: float = 2.0,
+        quality: str = "best",
+        max_bitrate: int | None = None,
+    ) -> None:
+        self.http = http or shared_client()
+        # variant policy for master playlists, see tools.hls.select_variant
+        self.quality = quality
+        self.max_bitrate = max_bitrate
+        self.workers = max(1, workers)
+        self.retries = max(0, retries)
+        self.window = max(self.workers, window or self.workers * 2)
+        self.progress = progress
+        self.checkpoint_interval = checkpoint_interval
+        self._keys: dict[str, bytes] = {}
+        self._keys_lock = threading.Lock()
+
+    def _get(self, url: str, headers: dict[str, str], byte_range: tuple[int, int] | None = None) -> bytes:
+        if byte_range:
+            headers = {**headers, "Range": f"bytes={byte_range[0]}-{byte_range[0] + byte_range[1] - 1}"}
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.http.get(url, headers=headers)
+                response.raise_for_status()
+                content = response.content
+                expected = response.headers.get("Content-Length")
+                # with Content-Encoding the length is that of the compressed body
+                if expected and not response.headers.get("Content-Encoding") and int(expected) != len(content):
+                    raise requests.RequestException(f"Truncated response ({len(content)} of {expected} bytes)")
+                return content
+            except requests.RequestException as e:
+                if attempt == self.retries:
+                    raise HlsDownloadError(f"Failed to fetch {url}: {e}") from e
+                time.sleep(0.5 * 2**attempt)
+        raise HlsDownloadError(f"Failed to fetch {url}")
+
+    def load_playlist(
+        self, url: str, headers: dict[str, str], quality: str | None = None, max_bitrate: int | None = None
+    ) -> MediaPlaylist:
+        """
+        Load the media playlist at ``url``, following a master playlist to the variant chosen by
+        ``quality`` and ``max_bitrate`` (by default those the downloader was created with).
+        """
+        text = self._get(url, headers).decode("utf-8", errors="replace")
+        master = parse_master_playlist(text, url)
+        if master.variants:
+            variant = select_variant(
+                master.variants, quality or self.quality, max_bitrate if max_bitrate is not None else self.max_bitrate
+            )
+            if master.has_separate_audio(variant):  # type: ignore
+                raise HlsDownloadError("Variants with separate audio renditions are not supported")
+            url = variant.uri  # type: ignore
+            text = self._get(url, headers).decode("utf-8", errors="replace")
+
+        playlist = parse_media_playlist(text, url)
+        if not playlist.segments:
+            raise HlsDownloadError(f"No segments in {url}")
+        return playlist
+
+    def _key(self, key: SegmentKey, headers: dict[str, str]) -> bytes:
+        # held while fetching so concurrent segments sharing a key wait for one request
+        with self._keys_lock:
+            cached = self._keys.get(key.uri)
+            if cached is None:
+                cached = self._get(key.uri, headers)
+                if len(cached) != 16:
+                    raise HlsDownloadError(f"Invalid AES-128 key from {key.uri}")
+                self._keys[key.uri] = cached
+            return cached
+
+    def _fetch_segment(self, segment: Segment, headers: dict[str, str]) -> bytes:
+        data = self._get(segment.uri, headers, segment.byte_range)
+        if not segment.key:
+            return data
+
+        # without an explicit IV the media sequence number is the IV
+        iv = segment.key.iv or segment.sequence.to_bytes(16, "big")
+        decryptor = Cipher(algorithms.AES(self._key(segment.key, headers)), modes.CBC(iv)).decryptor()
+        try:
+            unpadder = padding.PKCS7(128).unpadder()
+            return unpadder.update(decryptor.update(data) + decryptor.finalize()) + unpadder.finalize()
+        except ValueError as e:
+            raise HlsDownloadError(f"Could not decrypt segment {segment.sequence}: {e}") from e
+
+    def download(self, url: str, headers: dict[str, str], location: str) -> dict[str, float]:
+        """Download the stream at ``url`` to ``location``; returns size, duration and throughput."""
+        started = time.monotonic()
+        playlist = self.load_playlist(url, headers)
+        segments = ([playlist.init_segment] if playlist.init_segment else []) + playlist.segments
+        total = len(segments)
+
+        part = f"{location}.part"
+        start, written = self._resume_point(location, part, total)
+        resumed_bytes = written
+        last_report = last_checkpoint = 0.0
+        self._report(f"Destination: {location}")
+        if start:
+            self._report(f"Resuming at fragment {start + 1}/{total} ({format_size(written)} already downloaded)")
+
+        try:
+            with open(part, "r+b" if start else "wb") as output, ThreadPoolExecutor(
+                max_workers=self.workers
+            ) as executor:
+                output.truncate(written)
+                output.seek(written)
+                pending: deque[Future[bytes]] = deque()
+                submitted = start
+                for done in range(start + 1, total + 1):
+                    while submitted < total and len(pending) < self.window:
+                        pending.append(executor.submit(self._fetch_segment, segments[submitted], headers))
+                        submitted += 1
+
+                    try:
+                        output.write(pending.popleft().result())
+                    except Exception:
+                        for future in pending:
+                            future.cancel()
+                        raise
+
+                    written = output.tell()
+                    now = time.monotonic()
+                    if now - last_checkpoint >= self.checkpoint_interval:
+                        last_checkpoint = now
+                        self._checkpoint(location, output, playlist.url, total, done)
+                    if now - last_report >= 1 or done == total:
+                        last_report = now
+                        self._report_progress(done, total, written, now - started)
+
+            finish_download(part, location, self._report)
+            clear_state(location)
+        except BaseException:
+            # a checkpointed .part file is kept so the next run continues from it; the state may
+            # exist without fragment progress, the extractor saves the stream there beforehand
+            if os.path.exists(part) and not (load_state(location) or {}).get("completed"):
+                os.remove(part)
+            raise
+
+        elapsed = time.monotonic() - started
+        return {
+            "bytes": written,
+            "segments": total,
+            "duration": playlist.duration,
+            "seconds": elapsed,
+            "throughput": (written - resumed_bytes) / elapsed if elapsed else 0.0,
+        }
+
+    @staticmethod
+    def _resume_point(location: str, part: str, total: int) -> tuple[int, int]:
+        """Fragments and bytes already in ``part`` according to its checkpoint, or ``(0, 0)``."""
+        state = load_state(location) or {}
+        completed, size = state.get("completed", 0), state.get("bytes", 0)
+        if (
+            state.get("segments") != total
+            or not 0 < completed <= total
+            or not os.path.exists(part)
+            or os.path.getsize(part) < size
+        ):
+            return 0, 0
+        return completed, size
+
+    @staticmethod
+    def _checkpoint(location: str, output: BinaryIO, playlist_url: str, total: int, done: int) -> None:
+        # the data must be on disk before the checkpoint claims it
+        output.flush()
+        os.fsync(output.fileno())
+        save_state(location, playlist_url=playlist_url, segments=total, completed=done, bytes=output.tell())
+
+    def _report(self, message: str) -> None:
+        if self.progress:
+            self.progress(message)
+
+    def _report_progress(self, done: int, total: int, written: int, elapsed: float) -> None:
+        speed = written / elapsed if elapsed else 0
+        # same shape as yt-dlp's progress line, so the WebGUI progress parser can read both
+        estimate = written * total / done
+        eta = int((estimate - written) / speed) if speed else 0
+        self._report(
+            f"{done / total * 100:5.1f}% of ~ {format_size(estimate)} at {format_size(speed)}/s "
+            f"ETA {eta // 60:02d}:{eta % 60:02d} (frag {done}/{total})"
+        )
@@ -0,0 +1,181 @@
+import threading
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from tools.pacing import Pacer
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 is optional
+    httpx = None
+
+# ACCEPT_ENCODING lists the codings urllib3 can decode here (br/zstd when Brotli/zstandard are installed)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class Http2Response:
+    """The parts of :class:`requests.Response` the extractors use, on top of an ``httpx`` response."""
+
+    def __init__(self, response: Any) -> None:
+        self._response = response
+        self.status_code: int = response.status_code
+        self.ok = response.status_code < 400
+        self.url = str(response.url)
+        self.headers = response.headers
+        self.content: bytes = response.content
+        self.text: str = response.text
+
+    def json(self) -> Any:
+        return self._response.json()
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)  # type: ignore
+
+
+class HttpClient:
+    """
+    Shared keep-alive HTTP client for every non-browser request.
+
+    All threads share one connection pool per host (up to ``pool_size`` idle connections each),
+    responses are requested compressed, and connection errors plus 429/5xx answers are retried
+    with backoff. Each thread gets its own session on top of the shared pools so cookies are not
+    mutated concurrently. With ``http2=True`` and ``httpx`` installed requests go over HTTP/2
+    instead; without ``httpx`` the flag is ignored. With a ``pacer`` every request waits for its
+    host's turn and the final status of each answer adjusts that host's rate.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 15,
+        retries: int = 3,
+        http2: bool = False,
+        pacer: Pacer | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.pacer = pacer
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.5,
+                status_forcelist=RETRY_STATUSES,
+                allowed_methods=("GET", "HEAD"),
+                raise_on_status=False,
+            ),
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.request_count = 0
+
+        self.http2 = bool(http2 and httpx)
+        self._http2_client = (
+            httpx.Client(
+                http2=True,
+                timeout=timeout,
+                limits=httpx.Limits(max_keepalive_connections=pool_size),
+                transport=httpx.HTTPTransport(http2=True, retries=retries),
+            )
+            if self.http2
+            else None
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            self._local.session = session
+        return session
+
+    @staticmethod
+    def _headers(headers: dict[str, str] | None) -> dict[str, str]:
+        merged = dict(headers or {})
+        # callers used to send identity/none, which only costs bandwidth
+        for key in [k for k in merged if k.lower() == "accept-encoding"]:
+            del merged[key]
+        merged["Accept-Encoding"] = ACCEPT_ENCODING
+        return merged
+
+    def get(
+        self, url: str, headers: dict[str, str] | None = None, timeout: float | None = None, **kwargs: Any
+    ) -> requests.Response | Http2Response:
+        with self._lock:
+            self.request_count += 1
+        if self.pacer:
+            self.pacer.wait(url)
+
+        if self._http2_client is not None:
+            try:
+                response = Http2Response(
+                    self._http2_client.get(
+                        url, headers=self._headers(headers), timeout=timeout or self.timeout, **kwargs
+                    )
+                )
+            except httpx.HTTPError as e:
+                raise requests.ConnectionError(str(e)) from e
+        else:
+            response = self.session.get(
+                url, headers=self._headers(headers), timeout=timeout or self.timeout, **kwargs
+            )
+
+        if self.pacer:
+            self.pacer.observe(url, response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    def stats(self) -> dict[str, Any]:
+        """Connections opened vs requests sent per host, from the urllib3 pools."""
+        hosts: dict[str, dict[str, int]] = {}
+        pools = self.adapter.poolmanager.pools
+        with pools.lock:
+            entries = list(pools._container.items())
+        for key, pool in entries:
+            host = f"{key.key_scheme}://{key.key_host}:{key.key_port}"
+            hosts[host] = {"connections": pool.num_connections, "requests": pool.num_requests}
+
+        connections = sum(h["connections"] for h in hosts.values())
+        sent = sum(h["requests"] for h in hosts.values())
+        return {
+            "requests": self.request_count,
+            "connections": connections,
+            "reused": max(0, sent - connections),
+            "hosts": hosts,
+            "http2": self.http2,
+        }
+
+    def close(self) -> None:
+        self.adapter.close()
+        if self._http2_client is not None:
+            self._http2_client.close()
+
+
+_shared: HttpClient | None = None
+_shared_lock = threading.Lock()
+
+
+def configure(
+    pool_size: int = 10, timeout: float = 15, retries: int = 3, http2: bool = False, pacer: Pacer | None = None
+) -> HttpClient:
+    """Replace the process-wide client, e.g. with the timeouts/retries from the command line."""
+    global _shared
+    with _shared_lock:
+        _shared = HttpClient(pool_size=pool_size, timeout=timeout, retries=retries, http2=http2, pacer=pacer)
+        return _shared
+
+
+def shared_client() -> HttpClient:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpClient()
+        return _shared
@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+from typing import Any
+
+# episode status after each journal event
+EVENT_STATUS = {
+    "resolved": "stream_found",
+    "resolve_failed": "failed",
+    "downloaded": "completed",
+    "download_failed": "failed",
+    "skipped": "skipped",
+    "retry_scheduled": "retrying",
+}
+
+
+class JobJournal:
+    """
+    Append-only JSON-lines journal of what happened to each episode of a season.
+
+    Every resolution and download result is appended (and fsynced) the moment it happens, so
+    the state of a job survives the process dying half way. :meth:`episodes` folds the events
+    into the latest state per episode; :meth:`write_summary` rebuilds the season JSON from it.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, event: str, number: int, **fields: Any) -> None:
+        if event not in EVENT_STATUS:
+            raise ValueError(f"Unknown journal event {event!r}")
+        line = json.dumps({"event": event, "number": number, "time": round(time.time(), 3), **fields})
+        with self._lock, open(self.path, "a") as journal:
+            journal.write(line + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def events(self) -> list[dict[str, Any]]:
+        """Every event in the journal; a line cut off by a crash is ignored."""
+        try:
+            with open(self.path) as journal:
+                lines = journal.readlines()
+        except FileNotFoundError:
+            return []
+
+        events = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and entry.get("event") in EVENT_STATUS and "number" in entry:
+                events.append(entry)
+        return events
+
+    def episodes(self) -> dict[int, dict[str, Any]]:
+        """Latest known state of every journaled episode, keyed by episode number."""
+        state: dict[int, dict[str, Any]] = {}
+        for entry in self.events():
+            event, number, updated = entry.pop("event"), entry["number"], entry.pop("time", None)
+            # a failure replaces the error of an earlier attempt, success clears it
+            episode = {key: value for key, value in state.get(number, {}).items() if key != "error"}
+            if event == "retry_scheduled":
+                # every retry and what caused it stays on record, the error of the attempt too
+                entry.pop("number")
+                episode["retries"] = [*episode.get("retries", []), {**entry, "time": updated}]
+                episode["error"] = entry.get("error")
+            else:
+                episode.update(entry)
+            episode["status"] = EVENT_STATUS[event]
+            episode["updated"] = updated
+            state[number] = episode
+        return state
+
+    def write_summary(self, path: str, header: dict[str, Any], episodes: list[dict[str, Any]]) -> None:
+        """
+        Atomically write ``header`` plus ``episodes`` overlaid with their journaled state to ``path``.
+
+        Journaled episodes that are not in ``episodes`` (e.g. from an earlier run over another
+        range) are kept, so the summary covers everything downloaded into the folder.
+        """
+        journaled = self.episodes()
+        merged = {episode["number"]: {**episode, **journaled.get(episode["number"], {})} for episode in episodes}
+        for number, episode in journaled.items():
+            merged.setdefault(number, episode)
+
+        summary = {**header, "episodes": [merged[number] for number in sorted(merged)]}
+        temp = f"{path}.tmp"
+        with self._lock:
+            with open(temp, "w") as json_file:
+                json.dump(summary, json_file, indent=4)
+                json_file.flush()
+                os.fsync(json_file.fileno())
+            os.replace(temp, path)
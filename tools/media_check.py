@@ -0,0 +1,53 @@
+import os
+import shutil
+import subprocess
+
+# anything smaller is an aborted download rather than an episode
+MIN_EPISODE_SIZE = 1024 * 1024
+# allowed difference between the file and playlist durations: the larger of 2% or 5 seconds
+DURATION_TOLERANCE = 0.02
+DURATION_SLACK = 5.0
+
+
+def probe_duration(path: str) -> float | None:
+    """Container duration of ``path`` in seconds via ffprobe; ``None`` when it cannot be read."""
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        return None
+    try:
+        result = subprocess.run(
+            [ffprobe, "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", path],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        return float(result.stdout.strip())
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+def check_download(path: str, expected_size: int | None = None, expected_duration: float | None = None) -> str | None:
+    """
+    Verify a finished episode file; returns the problem, or ``None`` when it can be kept.
+
+    The size must match the one recorded when the file was downloaded, if known. When ffprobe is
+    installed the file must be readable and, if the playlist duration is known, about as long.
+    """
+    if not os.path.isfile(path):
+        return "missing"
+    size = os.path.getsize(path)
+    if size < MIN_EPISODE_SIZE:
+        return f"only {size} bytes"
+    if expected_size and size != expected_size:
+        return f"size {size} differs from the {expected_size} bytes downloaded"
+
+    if not shutil.which("ffprobe"):
+        return None
+    duration = probe_duration(path)
+    if duration is None:
+        return "ffprobe cannot read the file"
+    if expected_duration:
+        tolerance = max(DURATION_SLACK, expected_duration * DURATION_TOLERANCE)
+        if abs(duration - expected_duration) > tolerance:
+            return f"duration {duration:.0f}s, playlist has {expected_duration:.0f}s"
+    return None
@@ -0,0 +1,154 @@
+import re
+import threading
+import time
+from typing import Callable
+from urllib.parse import urlsplit
+
+# answers that mean the host wants fewer requests from us
+BACKOFF_STATUSES = (403, 429)
+
+_HTTP_ERROR = re.compile(r"HTTP Error (\d{3})")
+
+
+class HostPacer:
+    """
+    Request rate for one host, adjusted additively up and multiplicatively down (AIMD).
+
+    :meth:`wait` spaces requests ``1 / rate`` seconds apart over all threads. Every healthy
+    answer raises the rate by ``increase`` requests per second up to ``max_rate``; a 403, 429 or
+    5xx multiplies it by ``decrease`` down to ``min_rate``.
+    """
+
+    def __init__(
+        self,
+        rate: float = 4.0,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        increase: float = 0.5,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.min_rate = min_rate
+        self.max_rate = max(min_rate, max_rate)
+        self.rate = min(self.max_rate, max(min_rate, rate))
+        self.increase = increase
+        self.decrease = decrease
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next = 0.0
+        self.requests = 0
+        self.backoffs = 0
+
+    @property
+    def interval(self) -> float:
+        return 1 / self.rate
+
+    def wait(self) -> float:
+        """Block until the next request to this host may go out; returns the seconds waited."""
+        with self._lock:
+            now = self._clock()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+            self.requests += 1
+        if slot > now:
+            self._sleep(slot - now)
+        return slot - now
+
+    def observe(self, status: int | None, retry_after: float | None = None) -> None:
+        """Adjust the rate to the answer of a request; ``None`` means no answer was received."""
+        if status is None:
+            return
+        with self._lock:
+            if status in BACKOFF_STATUSES or status >= 500:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.backoffs += 1
+                # nothing goes out before the host said it is ready again
+                pause = retry_after if retry_after is not None else self.interval
+                self._next = max(self._next, self._clock() + pause)
+            elif status < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+
+class Pacer:
+    """
+    One :class:`HostPacer` per host, shared by the HTTP client and the browser workers; yt-dlp reports its errors.
+
+    With ``enabled=False`` nothing is paced and :meth:`rates` stays empty.
+    """
+
+    def __init__(self, enabled: bool = True, **host_options: float) -> None:
+        self.enabled = enabled
+        self.host_options = host_options
+        self._hosts: dict[str, HostPacer] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host(url: str) -> str:
+        return urlsplit(url).hostname or url
+
+    def for_host(self, url: str) -> HostPacer:
+        host = self.host(url)
+        with self._lock:
+            pacer = self._hosts.get(host)
+            if pacer is None:
+                pacer = self._hosts[host] = HostPacer(**self.host_options)
+            return pacer
+
+    def wait(self, url: str) -> float:
+        return self.for_host(url).wait() if self.enabled else 0.0
+
+    def observe(self, url: str, status: int | None, retry_after: str | float | None = None) -> None:
+        if self.enabled:
+            self.for_host(url).observe(status, parse_retry_after(retry_after))
+
+    def rates(self) -> dict[str, float]:
+        """Current requests per second by host."""
+        with self._lock:
+            return {host: pacer.rate for host, pacer in sorted(self._hosts.items())}
+
+    def describe(self) -> str:
+        """One-line summary of the current rates, for the job log."""
+        with self._lock:
+            hosts = sorted(self._hosts.items())
+        return ", ".join(
+            f"{host} {pacer.rate:.1f}/s" + (f" ({pacer.backoffs} backoffs)" if pacer.backoffs else "")
+            for host, pacer in hosts
+        )
+
+
+def parse_retry_after(value: str | float | None) -> float | None:
+    """Seconds from a ``Retry-After`` header; HTTP dates and garbage are ignored."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def status_from_error(message: str) -> int | None:
+    """HTTP status in a yt-dlp error such as ``HTTP Error 429: Too Many Requests``."""
+    match = _HTTP_ERROR.search(message)
+    return int(match.group(1)) if match else None
+
+
+_shared: Pacer | None = None
+_shared_lock = threading.Lock()
+
+
+def configure(enabled: bool = True, max_rate: float = 20.0) -> Pacer:
+    """Replace the process-wide pacer, e.g. with the settings from the command line."""
+    global _shared
+    with _shared_lock:
+        _shared = Pacer(enabled=enabled, max_rate=max_rate)
+        return _shared
+
+
+def shared_pacer() -> Pacer:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Pacer()
+        return _shared
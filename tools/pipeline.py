@@ -0,0 +1,267 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from tools.browser_slots import available_memory_mb
+
+# marks the end of the work for one downloader thread
+_DONE = object()
+
+
+class _Gauge:
+    """Queue depth over time: current, peak and time-weighted average."""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.peak = 0
+        self._area = 0.0
+        self._since = self._started = time.monotonic()
+
+    def change(self, delta: int) -> None:
+        now = time.monotonic()
+        self._area += self.depth * (now - self._since)
+        self._since = now
+        self.depth += delta
+        self.peak = max(self.peak, self.depth)
+
+    def average(self) -> float:
+        now = time.monotonic()
+        area = self._area + self.depth * (now - self._since)
+        return area / (now - self._started) if now > self._started else 0.0
+
+
+class Stage:
+    """Bookkeeping for one pipeline stage: its input queue depth and how busy its workers are."""
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = max(1, workers)
+        self.queued = _Gauge()
+        self.busy = 0
+        self.busy_seconds = 0.0
+        self.processed = 0
+
+    def stats(self, elapsed: float) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "queued": self.queued.depth,
+            "busy": self.busy,
+            "peak_queue": self.queued.peak,
+            "avg_queue": self.queued.average(),
+            "utilisation": self.busy_seconds / (self.workers * elapsed) if elapsed else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Two worker stages connected by a bounded hand-off queue.
+
+    ``resolve`` runs on ``resolvers`` threads and returns ``True`` when the item should be
+    downloaded; ``download`` runs on ``downloaders`` threads and picks an item up as soon as
+    it was resolved. The hand-off queue holds at most ``queue_size`` resolved items, so
+    resolvers stall instead of resolving streams that would expire before a downloader is
+    free. An exception in either stage is passed to ``on_error`` and counts as a failure.
+
+    When a stage fails (``resolve`` returns falsy, ``download`` returns ``False`` or either
+    raises) ``retry(item, stage)`` may return a delay in seconds: the item then goes to the
+    back of the resolve queue once the delay has passed, without holding a worker meanwhile.
+    An exception from ``retry`` gives the item up like a ``None`` delay. ``progress`` is called
+    with :meth:`status` every ``report_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[Any], bool],
+        download: Callable[[Any], None],
+        resolvers: int = 2,
+        downloaders: int = 3,
+        queue_size: int | None = None,
+        on_error: Callable[[Any, Exception], None] | None = None,
+        retry: Callable[[Any, str], float | None] | None = None,
+        progress: Callable[[str], None] | None = None,
+        report_interval: float = 30.0,
+    ) -> None:
+        self._resolve = resolve
+        self._download = download
+        self._on_error = on_error
+        self._retry = retry
+        self.progress = progress
+        self.report_interval = report_interval
+
+        self.resolve_stage = Stage("resolve", resolvers)
+        self.download_stage = Stage("download", downloaders)
+        self._pending: queue.Queue = queue.Queue()
+        self._resolved: queue.Queue = queue.Queue(maxsize=queue_size or self.download_stage.workers)
+        self._lock = threading.Lock()
+        # items neither finished nor given up, including those waiting for a retry
+        self._outstanding = 0
+        self._all_done = threading.Event()
+        self.retries = 0
+        self.waiting_retry = 0
+        self._started = 0.0
+        self._finished = 0.0
+
+    def run(self, items: Iterable[Any]) -> None:
+        """Push ``items`` through both stages and return once every item is done."""
+        self._started = time.monotonic()
+        for item in items:
+            self._pending.put(item)
+            self.resolve_stage.queued.change(1)
+            self._outstanding += 1
+        if not self._outstanding:
+            self._all_done.set()
+
+        resolvers = [
+            threading.Thread(target=self._resolve_worker, name=f"resolve-{i}", daemon=True)
+            for i in range(self.resolve_stage.workers)
+        ]
+        downloaders = [
+            threading.Thread(target=self._download_worker, name=f"download-{i}", daemon=True)
+            for i in range(self.download_stage.workers)
+        ]
+        for thread in resolvers + downloaders:
+            thread.start()
+
+        reporter_stop = threading.Event()
+        reporter = threading.Thread(target=self._report_worker, args=(reporter_stop,), daemon=True)
+        if self.progress:
+            reporter.start()
+
+        try:
+            for thread in resolvers:
+                thread.join()
+            for _ in downloaders:
+                self._resolved.put(_DONE)
+            for thread in downloaders:
+                thread.join()
+        finally:
+            reporter_stop.set()
+            self._finished = time.monotonic()
+
+    def _resolve_worker(self) -> None:
+        while True:
+            try:
+                item = self._pending.get(timeout=0.1)
+            except queue.Empty:
+                # the queue can refill while retries are waiting for their delay
+                if self._all_done.is_set():
+                    return
+                continue
+            with self._lock:
+                self.resolve_stage.queued.change(-1)
+
+            if not self._timed(self.resolve_stage, self._resolve, item):
+                self._failed(item, "resolve")
+                continue
+
+            # blocks while every downloader is busy and the hand-off queue is full
+            self._resolved.put(item)
+            with self._lock:
+                self.download_stage.queued.change(1)
+
+    def _download_worker(self) -> None:
+        while True:
+            item = self._resolved.get()
+            if item is _DONE:
+                return
+            with self._lock:
+                self.download_stage.queued.change(-1)
+            if self._timed(self.download_stage, self._download, item) is False:
+                self._failed(item, "download")
+            else:
+                self._finish()
+
+    def _timed(self, stage: Stage, work: Callable[[Any], Any], item: Any) -> Any:
+        with self._lock:
+            stage.busy += 1
+        started = time.monotonic()
+        try:
+            return work(item)
+        except Exception as e:
+            if self._on_error:
+                self._on_error(item, e)
+            return False
+        finally:
+            with self._lock:
+                stage.busy -= 1
+                stage.busy_seconds += time.monotonic() - started
+                stage.processed += 1
+
+    def _failed(self, item: Any, stage: str) -> None:
+        try:
+            delay = self._retry(item, stage) if self._retry else None
+        except Exception as e:
+            # e.g. a full disk while the retry is recorded; the item is given up, the worker lives on
+            self._give_up(item, e)
+            return
+        if delay is None:
+            self._finish()
+            return
+
+        with self._lock:
+            self.retries += 1
+            self.waiting_retry += 1
+        timer = threading.Timer(delay, self._requeue, args=(item,))
+        timer.daemon = True
+        timer.start()
+
+    def _requeue(self, item: Any) -> None:
+        with self._lock:
+            self.waiting_retry -= 1
+        try:
+            with self._lock:
+                self.resolve_stage.queued.change(1)
+            self._pending.put(item)
+        except Exception as e:
+            self._give_up(item, e)
+
+    def _give_up(self, item: Any, error: Exception) -> None:
+        try:
+            if self._on_error:
+                self._on_error(item, error)
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        with self._lock:
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._all_done.set()
+
+    def _report_worker(self, stop: threading.Event) -> None:
+        while not stop.wait(self.report_interval):
+            self.progress(self.status())
+
+    def status(self) -> str:
+        """Current queue depths and busy workers, e.g. for periodic progress lines."""
+        with self._lock:
+            status = " | ".join(
+                f"{stage.name}: {stage.busy}/{stage.workers} busy, {stage.queued.depth} queued"
+                for stage in (self.resolve_stage, self.download_stage)
+            )
+            if self.waiting_retry:
+                status += f" | {self.waiting_retry} waiting to retry"
+            return status
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        end = self._finished or time.monotonic()
+        elapsed = end - self._started if self._started else 0.0
+        with self._lock:
+            return {stage.name: stage.stats(elapsed) for stage in (self.resolve_stage, self.download_stage)}
+
+
+def workers_for_memory(
+    per_worker_mb: int, maximum: int, memory: Callable[[], int | None] = available_memory_mb
+) -> int:
+    """
+    How many workers needing ``per_worker_mb`` each fit into the available memory (at least 1).
+
+    ``memory`` counts the container's cgroup limit, not only the host's ``MemAvailable``.
+    """
+    available_mb = memory()
+    if available_mb is None:
+        return max(1, min(maximum, (os.cpu_count() or 2) // 2))
+    return max(1, min(maximum, available_mb // per_worker_mb))
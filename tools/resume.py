@@ -0,0 +1,56 @@
+import json
+import os
+import time
+from typing import Any
+
+# checkpoint of an unfinished download, kept next to its output file
+RESUME_SUFFIX = ".resume.json"
+
+
+def resume_path(location: str) -> str:
+    return f"{location}{RESUME_SUFFIX}"
+
+
+def load_state(location: str) -> dict[str, Any] | None:
+    """The checkpoint saved for ``location``, or ``None`` when there is none or it is unreadable."""
+    try:
+        with open(resume_path(location)) as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def save_state(location: str, **fields: Any) -> dict[str, Any]:
+    """
+    Merge ``fields`` into the checkpoint of ``location``.
+
+    The file is replaced atomically, so a crash leaves either the previous or the new checkpoint.
+    """
+    state = {**(load_state(location) or {}), **fields, "updated": time.time()}
+    path = resume_path(location)
+    temp = f"{path}.tmp"
+    with open(temp, "w") as file:
+        json.dump(state, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp, path)
+    return state
+
+
+def clear_state(location: str) -> None:
+    try:
+        os.remove(resume_path(location))
+    except FileNotFoundError:
+        pass
+
+
+def discard_download(location: str) -> None:
+    """Remove the partial files and the checkpoint of a download that will not be resumed."""
+    # .part of the native engine and yt-dlp, .ytdl is yt-dlp's fragment index
+    for path in (f"{location}.part", f"{location}.ytdl"):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    clear_state(location)
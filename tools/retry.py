@@ -0,0 +1,81 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When a failed episode is tried again.
+
+    ``attempts`` counts the first try; retry ``n`` waits ``backoff * 2 ** (n - 1)`` seconds
+    (at most ``max_backoff``), scattered by ``±jitter`` so failed episodes do not all hit the
+    site at the same moment. No retry starts later than ``deadline`` seconds after the first
+    attempt, and a job retries at most ``budget`` times over all its episodes.
+    """
+
+    attempts: int = 3
+    backoff: float = 30.0
+    max_backoff: float = 600.0
+    jitter: float = 0.5
+    deadline: float = 3600.0
+    budget: int = 20
+
+    def delay(self, retry: int, rng: Callable[[], float] = random.random) -> float:
+        base = min(self.max_backoff, self.backoff * 2 ** max(0, retry - 1))
+        return max(0.0, base * (1 + self.jitter * (2 * rng() - 1)))
+
+
+class RetryScheduler:
+    """Tracks attempts per item and the retry budget of a job; thread-safe."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        self.policy = policy or RetryPolicy()
+        self._clock = clock
+        self._rng = rng
+        self._lock = threading.Lock()
+        self._first_attempt: dict[Hashable, float] = {}
+        self._attempts: dict[Hashable, int] = {}
+        self.retries = 0
+        self.given_up: dict[str, int] = {}
+
+    def start(self, key: Hashable) -> None:
+        """Note an attempt on ``key``; the first one starts its deadline."""
+        with self._lock:
+            self._first_attempt.setdefault(key, self._clock())
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+
+    def attempts(self, key: Hashable) -> int:
+        with self._lock:
+            return self._attempts.get(key, 0)
+
+    def schedule(self, key: Hashable) -> tuple[float | None, str]:
+        """
+        Decide whether ``key`` is tried again after a failure.
+
+        Returns the delay before the retry and ``""``, or ``None`` and why it is not retried.
+        """
+        with self._lock:
+            attempts = self._attempts.get(key, 1)
+            elapsed = self._clock() - self._first_attempt.get(key, self._clock())
+            delay = self.policy.delay(attempts, self._rng)
+
+            if attempts >= self.policy.attempts:
+                kind, reason = "attempts", f"{attempts} attempts made"
+            elif self.retries >= self.policy.budget:
+                kind, reason = "budget", f"retry budget of {self.policy.budget} used up"
+            elif elapsed + delay > self.policy.deadline:
+                kind, reason = "deadline", f"deadline of {self.policy.deadline:.0f}s reached"
+            else:
+                self.retries += 1
+                return delay, ""
+
+            self.given_up[kind] = self.given_up.get(kind, 0) + 1
+            return None, reason
@@ -0,0 +1,108 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+CACHED_FIELDS = ("m3u8", "vtt", "all-vtt", "headers", "server")
+
+
+def default_cache_path() -> str:
+    """``stream_cache.db`` in ``CONFIG_DIR`` (``/config``), or the temp dir if that is not writable."""
+    config_dir = Path(os.environ.get("CONFIG_DIR", "/config"))
+    try:
+        config_dir.mkdir(parents=True, exist_ok=True)
+        if os.access(config_dir, os.W_OK):
+            return str(config_dir / "stream_cache.db")
+    except OSError:
+        pass
+    return os.path.join(tempfile.gettempdir(), "stream_cache.db")
+
+
+class StreamCache:
+    """
+    On-disk cache of resolved episode streams.
+
+    Stores the ``m3u8``, subtitle URLs and request headers found for an episode, keyed by
+    episode URL, server and download type, so re-running a job does not have to resolve every
+    episode again. Entries older than ``ttl`` seconds are ignored and removed on lookup.
+    """
+
+    def __init__(self, path: str | None = None, ttl: float = 6 * 3600) -> None:
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS streams (
+                    episode_url TEXT NOT NULL,
+                    server TEXT NOT NULL,
+                    download_type TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (episode_url, server, download_type)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # one short-lived connection per call keeps the cache usable from every worker thread
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _key(episode_url: str, server: str | None, download_type: str) -> tuple[str, str, str]:
+        return episode_url, (server or "").lower().strip(), download_type
+
+    def get(self, episode_url: str, server: str | None, download_type: str) -> dict[str, Any] | None:
+        key = self._key(episode_url, server, download_type)
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT data, created_at FROM streams WHERE episode_url = ? AND server = ? AND download_type = ?",
+                key,
+            ).fetchone()
+            if row and time.time() - row[1] > self.ttl:
+                conn.execute(
+                    "DELETE FROM streams WHERE episode_url = ? AND server = ? AND download_type = ?", key
+                )
+                row = None
+
+            if not row:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, episode_url: str, server: str | None, download_type: str, streams: dict[str, Any]) -> None:
+        data = json.dumps({k: streams[k] for k in CACHED_FIELDS if k in streams})
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO streams VALUES (?, ?, ?, ?, ?)",
+                (*self._key(episode_url, server, download_type), data, time.time()),
+            )
+
+    def evict(self, episode_url: str, server: str | None, download_type: str) -> None:
+        with self._lock, self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM streams WHERE episode_url = ? AND server = ? AND download_type = ?",
+                self._key(episode_url, server, download_type),
+            ).rowcount
+            self.evictions += deleted
+
+    def purge_expired(self) -> int:
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM streams WHERE created_at < ?", (time.time() - self.ttl,)).rowcount
@@ -0,0 +1,94 @@
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+from langdetect import detect as detect_lang
+
+TAG_RE = re.compile(r"<[^>]+>|\{\\[^}]*\}")
+BLOCK_KEYWORDS = ("NOTE", "STYLE", "REGION")
+
+
+def sample_cue_text(vtt: str, max_chars: int = 1500) -> str:
+    """
+    Return up to ``max_chars`` of plain cue text from a WebVTT document.
+
+    Header, NOTE/STYLE/REGION blocks, cue identifiers, timing lines and markup are dropped so
+    language detection only sees the spoken text.
+    """
+    sample: list[str] = []
+    size = 0
+    for block in re.split(r"\r?\n\s*\r?\n", vtt):
+        lines = [line.strip() for line in block.strip().splitlines() if line.strip()]
+        if not lines or lines[0].startswith(("WEBVTT", *BLOCK_KEYWORDS)):
+            continue
+
+        timing = next((i for i, line in enumerate(lines) if "-->" in line), None)
+        if timing is None:
+            continue
+
+        for line in lines[timing + 1:]:
+            text = TAG_RE.sub("", line).strip()
+            if not text:
+                continue
+            sample.append(text)
+            size += len(text) + 1
+            if size >= max_chars:
+                return " ".join(sample)[:max_chars]
+    return " ".join(sample)
+
+
+@dataclass
+class SubtitleInfo:
+    language: str | None
+    sha1: str
+
+
+class SubtitleLanguageCache:
+    """
+    Thread-safe cache from subtitle URI to detected language and content hash.
+
+    Each URI is fetched and classified once per extractor; identical subtitle files served under
+    different URIs reuse the classification of the first one through the content hash.
+    """
+
+    def __init__(self, fetch: Callable[[str, dict[str, str]], bytes], encoding: str = "utf-8") -> None:
+        self._fetch = fetch
+        self.encoding = encoding
+        self._by_uri: dict[str, SubtitleInfo] = {}
+        self._by_hash: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.hits = 0
+
+    def get(self, uri: str) -> SubtitleInfo | None:
+        with self._lock:
+            return self._by_uri.get(uri)
+
+    def language(self, uri: str, headers: dict[str, str]) -> str | None:
+        """Detected language of the subtitle at ``uri``; raises if it cannot be fetched."""
+        with self._lock:
+            info = self._by_uri.get(uri)
+            if info:
+                self.hits += 1
+                return info.language
+
+        content = self._fetch(uri, headers)
+        sha1 = hashlib.sha1(content).hexdigest()
+
+        with self._lock:
+            self.fetches += 1
+            known = sha1 in self._by_hash
+            language = self._by_hash.get(sha1)
+
+        if not known:
+            try:
+                language = detect_lang(sample_cue_text(content.decode(self.encoding, errors="ignore")))
+            except Exception:
+                language = None
+
+        with self._lock:
+            self._by_hash[sha1] = language
+            self._by_uri[uri] = SubtitleInfo(language=language, sha1=sha1)
+        return language
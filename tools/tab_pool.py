@@ -0,0 +1,167 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+
+@dataclass
+class HostBrowser:
+    serial: int
+    browser: Any = None
+    active: int = 0
+    uses: int = 0
+    # no new tabs: it served max_uses tabs, failed to start or failed to open a tab
+    retiring: bool = False
+    ready: threading.Event = field(default_factory=threading.Event)
+
+
+class TabPool:
+    """
+    Episode tabs in one shared browser instead of a browser per episode.
+
+    Up to ``tabs`` workers get a tab at a time. Tabs are opened with ``open_tab(browser)`` in the
+    browser from ``factory`` (started lazily by the first worker) and closed with
+    ``close_tab(tab)`` after use, so every episode starts in a fresh tab. The browser is retired
+    after ``max_uses`` tabs, or as soon as it fails to start or to open a tab; the next worker
+    starts a new one, and a retired browser is disposed once its last tab was closed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        open_tab: Callable[[Any], Any],
+        close_tab: Callable[[Any], None],
+        dispose: Callable[[Any], None],
+        tabs: int = 8,
+        max_uses: int = 100,
+    ) -> None:
+        self._factory = factory
+        self._open_tab = open_tab
+        self._close_tab = close_tab
+        self._dispose = dispose
+        self.tabs = max(1, tabs)
+        self.max_uses = max(1, max_uses)
+
+        self._slots = threading.BoundedSemaphore(self.tabs)
+        self._lock = threading.Lock()
+        self._current: HostBrowser | None = None
+        self._hosts: list[HostBrowser] = []
+        self._closed = False
+        self._serial = 0
+
+        # stats
+        self.tabs_opened = 0
+        self.peak_tabs = 0
+        self.recycled = 0
+        self.startup_times: dict[int, float] = {}
+
+    @contextmanager
+    def tab(self) -> Iterator[Any]:
+        """Borrow a fresh tab for the duration of the ``with`` block."""
+        self._slots.acquire()
+        try:
+            host, start = self._checkout()
+            try:
+                # inside the try, so a browser that fails to start is checked in and disposed too
+                self._start(host, start)
+                tab = self._open(host)
+                try:
+                    yield tab
+                finally:
+                    try:
+                        self._close_tab(tab)
+                    except Exception:
+                        host.retiring = True
+            finally:
+                self._checkin(host)
+        finally:
+            self._slots.release()
+
+    def _checkout(self) -> tuple[HostBrowser, bool]:
+        """Reserve a tab in the current browser; ``True`` when the caller has to start that browser."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Tab pool is closed")
+            host = self._current
+            start = host is None or host.retiring
+            if start:
+                self._serial += 1
+                host = self._current = HostBrowser(serial=self._serial)
+                self._hosts.append(host)
+            host.active += 1
+            host.uses += 1
+            if host.uses >= self.max_uses:
+                host.retiring = True
+            self.peak_tabs = max(self.peak_tabs, sum(h.active for h in self._hosts))
+        return host, start
+
+    def _start(self, host: HostBrowser, start: bool) -> None:
+        if start:
+            started = time.monotonic()
+            try:
+                host.browser = self._factory()
+            except Exception:
+                host.retiring = True
+                raise
+            finally:
+                host.ready.set()
+            with self._lock:
+                self.startup_times[host.serial] = time.monotonic() - started
+        else:
+            host.ready.wait()
+
+    def _open(self, host: HostBrowser) -> Any:
+        if host.browser is None:
+            raise RuntimeError("Browser failed to start")
+        try:
+            tab = self._open_tab(host.browser)
+        except Exception:
+            # usually a crashed browser, the next worker starts a new one
+            host.retiring = True
+            raise
+        with self._lock:
+            self.tabs_opened += 1
+        return tab
+
+    def _checkin(self, host: HostBrowser) -> None:
+        with self._lock:
+            host.active -= 1
+            done = host.active == 0 and (host.retiring or self._closed)
+            if done:
+                self._hosts.remove(host)
+                if host.retiring and host.browser is not None:
+                    self.recycled += 1
+        if done:
+            self._safe_dispose(host)
+
+    def _safe_dispose(self, host: HostBrowser) -> None:
+        if host.browser is None:
+            return
+        try:
+            self._dispose(host.browser)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Dispose browsers without open tabs; the others are disposed when their last tab closes."""
+        with self._lock:
+            self._closed = True
+            idle = [host for host in self._hosts if host.active == 0]
+            for host in idle:
+                self._hosts.remove(host)
+        for host in idle:
+            self._safe_dispose(host)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            startup_times = dict(self.startup_times)
+            return {
+                "tabs": self.tabs,
+                "tabs_opened": self.tabs_opened,
+                "peak_tabs": self.peak_tabs,
+                "recycled": self.recycled,
+                "browsers_started": len(startup_times),
+                "startup_times": startup_times,
+                "avg_startup_time": sum(startup_times.values()) / len(startup_times) if startup_times else 0.0,
+            }
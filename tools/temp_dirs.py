@@ -0,0 +1,97 @@
+import os
+import re
+import shutil
+import tempfile
+import time
+from typing import Callable
+
+from tools.browser_slots import pid_alive, process_started_at
+
+# directories the browsers leave behind: our profiles and selenium-wire stores, chromedriver's scoped dirs
+TEMP_DIR_PREFIXES = ("chrome-profile-", "seleniumwire-", "scoped_dir", ".org.chromium.Chromium.")
+# directories whose owner cannot be told from the name are removed once they are this old
+STALE_AFTER = 6 * 3600
+# largest pid Linux hands out; bigger numbers in a name are thread ids or timestamps
+_PID_MAX = 1 << 22
+
+_LEADING_NUMBER = re.compile(r"(\d+)")
+
+
+def make_temp_dir(prefix: str) -> str:
+    """``mkdtemp`` named ``<prefix><pid>-...`` so :func:`purge_stale_dirs` can tell whose it is."""
+    return tempfile.mkdtemp(prefix=f"{prefix}{os.getpid()}-")
+
+
+def remove_temp_dir(path: str | None) -> None:
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def owner_pid(name: str, prefix: str) -> int | None:
+    """Pid at the start of ``name`` after ``prefix``, ``None`` when there is none."""
+    match = _LEADING_NUMBER.match(name[len(prefix):])
+    if not match:
+        return None
+    pid = int(match.group(1))
+    return pid if 0 < pid < _PID_MAX else None
+
+
+def _size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def purge_stale_dirs(
+    roots: list[str] | None = None,
+    prefixes: tuple[str, ...] = TEMP_DIR_PREFIXES,
+    max_age: float = STALE_AFTER,
+    clock: Callable[[], float] = time.time,
+    alive: Callable[[int], bool] = pid_alive,
+    started_at: Callable[[int], float | None] = process_started_at,
+) -> tuple[int, int]:
+    """
+    Remove browser temp dirs left behind by crashed or killed runs; returns ``(dirs, bytes)`` freed.
+
+    A directory named after a pid is kept while that process runs and the directory is not older
+    than the process, which catches pids reused after a container restart. Directories without
+    a pid in their name are removed once they were not touched for ``max_age`` seconds.
+    """
+    roots = roots if roots is not None else [tempfile.gettempdir()]
+    removed = freed = 0
+    for root in roots:
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            continue
+        for entry in entries:
+            prefix = next((p for p in prefixes if entry.name.startswith(p)), None)
+            if prefix is None or not entry.is_dir(follow_symlinks=False):
+                continue
+            try:
+                modified = entry.stat(follow_symlinks=False).st_mtime
+            except OSError:
+                continue
+
+            pid = owner_pid(entry.name, prefix)
+            if pid is None:
+                stale = clock() - modified > max_age
+            elif not alive(pid):
+                stale = True
+            else:
+                started = started_at(pid)
+                stale = started is not None and modified < started
+            if not stale:
+                continue
+
+            size = _size(entry.path)
+            shutil.rmtree(entry.path, ignore_errors=True)
+            if not os.path.exists(entry.path):
+                removed += 1
+                freed += size
+    return removed, freed
@@ -0,0 +1,135 @@
+import argparse
+import re
+import shutil
+from argparse import Namespace
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+from colorama import Fore
+
+# aria2c refuses more than 16 connections per server
+MAX_ARIA_CONNECTIONS = 16
+
+_warned_missing_aria = False
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+@dataclass(frozen=True)
+class TuningProfile:
+    """yt-dlp download tuning; sizes are in bytes, ``None`` keeps yt-dlp's default."""
+
+    fragment_concurrency: int = 1
+    # bytes per second for each download, fragments included
+    rate_limit: int | None = None
+    buffer_size: int | None = None
+    http_chunk_size: int | None = None
+    retries: int = 10
+    fragment_retries: int = 10
+    socket_timeout: float = 60
+
+
+TUNING_PROFILES = {
+    # one fragment at a time, like the fixed settings before profiles existed
+    "polite": TuningProfile(fragment_concurrency=1),
+    "balanced": TuningProfile(fragment_concurrency=4),
+    "fast-lan": TuningProfile(
+        fragment_concurrency=16,
+        buffer_size=1024**2,
+        http_chunk_size=10 * 1024**2,
+        socket_timeout=20,
+    ),
+}
+DEFAULT_PROFILE = "balanced"
+
+
+def aria_size(value: str) -> str:
+    """argparse type for aria2c sizes such as ``1M`` or ``512K``."""
+    if not re.fullmatch(r"\d+[KkMm]?", value):
+        raise argparse.ArgumentTypeError(f"invalid size '{value}', expected e.g. 1M or 512K")
+    return value.upper()
+
+
+def byte_size(value: str) -> int:
+    """argparse type for byte sizes such as ``64K``, ``10M`` or ``1048576``."""
+    match = re.fullmatch(r"(\d+)([KkMmGg]?)", value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size '{value}', expected e.g. 10M or 64K")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+
+
+def aria2c_options(connections: int = 16, split: int = 16, min_split_size: str = "1M") -> dict[str, Any]:
+    """
+    yt-dlp options that hand downloads to aria2c.
+
+    Plain files are split into ``split`` pieces of at least ``min_split_size`` over up to
+    ``connections`` connections; HLS fragment lists are fetched by aria2c in parallel. yt-dlp
+    still reports progress through its own ``[download]`` lines, so log parsing is unchanged.
+    """
+    connections = min(MAX_ARIA_CONNECTIONS, max(1, connections))
+    return {
+        "external_downloader": {"default": "aria2c"},
+        "external_downloader_args": {
+            "aria2c": [
+                f"--max-connection-per-server={connections}",
+                f"--split={max(1, split)}",
+                f"--max-concurrent-downloads={max(1, split)}",
+                f"--min-split-size={min_split_size}",
+            ]
+        },
+    }
+
+
+def downloader_options(args: Namespace) -> dict[str, Any]:
+    """External downloader options for the ``--aria*`` arguments; empty when aria2c is off or missing."""
+    global _warned_missing_aria
+
+    if not getattr(args, "aria", False):
+        return {}
+    if not shutil.which("aria2c"):
+        if not _warned_missing_aria:
+            _warned_missing_aria = True
+            print(f"{Fore.LIGHTYELLOW_EX}aria2c is not installed, downloading with yt-dlp's own downloader")
+        return {}
+
+    return aria2c_options(
+        connections=getattr(args, "aria_connections", None) or 16,
+        split=getattr(args, "aria_split", None) or 16,
+        min_split_size=getattr(args, "aria_min_split_size", None) or "1M",
+    )
+
+
+def tuning_profile(args: Namespace) -> TuningProfile:
+    """The ``--ytdlp-profile`` preset with any individually given ``--fragment-concurrency`` etc. applied."""
+    profile = TUNING_PROFILES[getattr(args, "ytdlp_profile", None) or DEFAULT_PROFILE]
+    overrides = {
+        field: getattr(args, field)
+        for field in ("fragment_concurrency", "rate_limit", "buffer_size", "http_chunk_size")
+        if getattr(args, field, None) is not None
+    }
+    return replace(profile, **overrides)
+
+
+def tuning_options(args: Namespace) -> dict[str, Any]:
+    """yt-dlp options for the selected tuning profile."""
+    profile = tuning_profile(args)
+    options: dict[str, Any] = {
+        "concurrent_fragment_downloads": max(1, profile.fragment_concurrency),
+        "retries": profile.retries,
+        "fragment_retries": profile.fragment_retries,
+        "socket_timeout": profile.socket_timeout,
+    }
+    if profile.rate_limit:
+        options["ratelimit"] = profile.rate_limit
+    if profile.buffer_size:
+        options["buffersize"] = profile.buffer_size
+    if profile.http_chunk_size:
+        options["http_chunk_size"] = profile.http_chunk_size
+    return options
+
+
+def describe_profile(args: Namespace) -> str:
+    """One-line summary of the effective tuning, for the job log."""
+    name = getattr(args, "ytdlp_profile", None) or DEFAULT_PROFILE
+    values = ", ".join(f"{key}={value}" for key, value in asdict(tuning_profile(args)).items() if value is not None)
+    return f"yt-dlp profile {name}: {values}"
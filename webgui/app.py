@@ -390,6 +390,24 @@ async def cancel_job(job_id: int, user: str = Depends(get_current_user)):
     return {"status": "canceled"}
 
 
+@app.post("/api/jobs/{job_id}/pause")
+async def pause_job(job_id: int, user: str = Depends(get_current_user)):
+    """Pause a job; downloads continue from where they stopped when it is resumed."""
+    success = await worker.pause_job(job_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Job not found or not pausable")
+    return {"status": "paused"}
+
+
+@app.post("/api/jobs/{job_id}/resume")
+async def resume_job(job_id: int, user: str = Depends(get_current_user)):
+    """Queue a paused job again."""
+    success = await worker.resume_job(job_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Job not found or not paused")
+    return {"status": "queued"}
+
+
 @app.post("/api/jobs/delete-all")
 async def delete_all_jobs(user: str = Depends(get_current_user)):
     """Delete all jobs except running ones."""
@@ -502,7 +520,9 @@ async def job_events(job_id: int, user: str = Depends(get_current_user)):
                         last_episodes = current_episodes_json
 
                 # Stop streaming if job is finished
-                if job["status"] in (JobStatus.SUCCESS.value, JobStatus.FAILED.value, JobStatus.CANCELED.value):
+                if job["status"] in (
+                    JobStatus.SUCCESS.value, JobStatus.FAILED.value, JobStatus.CANCELED.value, JobStatus.PAUSED.value
+                ):
                     yield {
                         "event": "complete",
                         "data": json.dumps({"status": job["status"]}),
@@ -17,6 +17,7 @@ class JobStatus(str, Enum):
     SUCCESS = "success"
     FAILED = "failed"
     CANCELED = "canceled"
+    PAUSED = "paused"
 
 
 class JobStage(str, Enum):
@@ -264,6 +265,21 @@ class Database:
         # Mark all incomplete episodes as failed
         await self.cancel_job_episodes(job_id)
 
+    async def pause_job(self, job_id: int):
+        """Mark a stopped job as paused; its episodes keep their state for resuming."""
+        await self.update_job(job_id, status=JobStatus.PAUSED.value, pid=None)
+
+    async def requeue_job(self, job_id: int, progress_text: Optional[str] = None):
+        """Put a paused or interrupted job back into the queue; the next run resumes its downloads."""
+        await self.update_job(
+            job_id,
+            status=JobStatus.QUEUED.value,
+            pid=None,
+            finished_at=None,
+            error_message=None,
+            progress_text=progress_text,
+        )
+
     async def get_active_jobs(self) -> List[Dict[str, Any]]:
         """Get all queued or running jobs."""
         async with aiosqlite.connect(self.db_path) as db:
@@ -7,6 +7,7 @@ This is a thin wrapper that doesn't contain provider-specific logic.
 import argparse
 import asyncio
 import json
+import signal
 import subprocess
 import sys
 import re
@@ -17,6 +18,11 @@ from typing import Optional, Dict
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from webgui.database import Database, JobStage, STAGE_PROGRESS, EpisodeStatus
+from tools.aria2_rpc import Aria2RpcError, download_statuses, rpc_client
+from tools.hls_downloader import format_size
+
+# main.py exits with this code when it is stopped by SIGTERM or Ctrl+C
+INTERRUPTED_EXIT_CODE = 130
 
 
 async def emit_progress(db: Database, job_id: int, percent: int, stage: str, text: str = ""):
@@ -34,6 +40,46 @@ def write_to_episode_log(episode_log_files: Dict[int, object], ep_num: Optional[
             pass  # File might be closed or invalid
 
 
+async def poll_aria2_progress(db: Database, aria2_dirs: Dict[str, Dict], active_episodes: Dict[int, Dict],
+                              interval: float = 2.0):
+    """Update episode progress from the aria2 daemon for segments the job queued over RPC."""
+    client = rpc_client()
+    while True:
+        await asyncio.sleep(interval)
+        if not aria2_dirs:
+            continue
+
+        try:
+            statuses = await asyncio.to_thread(download_statuses, client)
+        except Aria2RpcError:
+            continue
+
+        for directory, entry in list(aria2_dirs.items()):
+            ep_num = entry["episode"]
+            if ep_num not in active_episodes:
+                del aria2_dirs[directory]
+                continue
+
+            # finished segments are dropped from the daemon, so whatever is still listed is outstanding
+            outstanding = [s for s in statuses if s.get("dir") == directory and s.get("status") != "complete"]
+            total = entry["total"]
+            done = max(0, total - len(outstanding))
+            percent = round(done / total * 100, 1) if total else 0.0
+            speed = sum(int(s.get("downloadSpeed", 0)) for s in outstanding)
+
+            await db.update_episode(
+                active_episodes[ep_num]["id"],
+                status=EpisodeStatus.DOWNLOAD_VIDEO.value,
+                progress_percent=int(30 + (percent / 100) * 60),
+                stage_data={
+                    "percent": percent,
+                    "size": f"{total} segments",
+                    "speed": f"{format_size(speed)}/s",
+                    "frag": f"{done}/{total}",
+                },
+            )
+
+
 async def run_with_progress(job_id: int, db_path: str, command: list):
     """Run command and emit episode-specific progress based on output patterns."""
     db = Database(db_path)
@@ -44,6 +90,7 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
     episode_log_files: Dict[int, object] = {}  # episode_number -> open file handle
     last_episode_searching: Optional[int] = None  # Track last episode that started searching (for ambiguous patterns)
     last_ytdlp_episode: Optional[int] = None  # Track which episode YT-DLP is currently downloading
+    aria2_dirs: Dict[str, Dict] = {}  # aria2 fragment directory -> {"episode": number, "total": segments}
     total_episodes = 0
     completed_episodes = 0
 
@@ -55,6 +102,7 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
     ansi_escape = re.compile(r'\x1b\[[0-9;]*m')
 
     current_stage = JobStage.INIT
+    aria2_poller: Optional[asyncio.Task] = None
     await emit_progress(db, job_id, STAGE_PROGRESS[JobStage.INIT], JobStage.INIT.value, "Starting download")
 
     try:
@@ -67,8 +115,15 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
             bufsize=1,
         )
 
-        # Stream output and detect episode progress
-        for line in iter(process.stdout.readline, ""):
+        # Pause/cancel terminate this wrapper; pass it on so the downloader saves its checkpoints
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, process.terminate)
+
+        # aria2 RPC downloads report progress through the daemon instead of the console
+        aria2_poller = asyncio.create_task(poll_aria2_progress(db, aria2_dirs, active_episodes))
+
+        # Stream output and detect episode progress; reading in a thread keeps the poller running
+        while True:
+            line = await asyncio.to_thread(process.stdout.readline)
             if not line:
                 break
 
@@ -100,7 +155,7 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
 
                 # Create per-episode log file
                 episode_log_path = job_log_dir / f"job_{job_id}_episode_{ep_num}.log"
-                episode_log_files[ep_num] = open(episode_log_path, "w", buffering=1)  # Line buffered
+                episode_log_files[ep_num] = open(episode_log_path, "a", buffering=1)  # Line buffered
 
                 # Update database with log file path
                 await db.update_episode(
@@ -122,6 +177,57 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
                     f"Episode {ep_num}: Finding stream..."
                 )
 
+            # Pattern: "Skipping Episode X - Title: already downloaded" - verified file from an earlier run
+            episode_skipped_match = re.search(
+                r"Skipping\s+Episode\s+(\d+)\s+-\s+(.+?):\s+already downloaded", clean_line, re.IGNORECASE
+            )
+            if episode_skipped_match:
+                ep_num = int(episode_skipped_match.group(1))
+                episode = await db.find_episode_by_number(job_id, ep_num)
+                if not episode:
+                    episode_id = await db.create_episode(job_id, ep_num, episode_skipped_match.group(2).strip())
+                    total_episodes += 1
+                else:
+                    episode_id = episode["id"]
+                episode_map[ep_num] = episode_id
+                await db.update_episode(
+                    episode_id,
+                    status=EpisodeStatus.COMPLETE.value,
+                    progress_percent=100,
+                    stage_data={"skipped": True}
+                )
+                completed_episodes += 1
+
+            # Pattern: "Episode X: Queued, waiting for a browser slot" - all browsers on the host are busy
+            browser_queued_match = re.search(r"Episode\s+(\d+):\s+Queued, waiting for a browser slot", clean_line)
+            if browser_queued_match:
+                ep_num = int(browser_queued_match.group(1))
+                if ep_num in active_episodes:
+                    write_to_episode_log(episode_log_files, ep_num, clean_line)
+                    await db.update_episode(
+                        active_episodes[ep_num]["id"],
+                        status=EpisodeStatus.PENDING.value,
+                        stage_data={"queued": "browser slot"}
+                    )
+                    await emit_progress(
+                        db, job_id,
+                        STAGE_PROGRESS[JobStage.DOWNLOAD],
+                        JobStage.DOWNLOAD.value,
+                        f"Episode {ep_num}: Queued for a browser slot"
+                    )
+
+            # Pattern: "Episode X: Browser ready in Ns" - the episode got its browser
+            browser_ready_match = re.search(r"Episode\s+(\d+):\s+Browser ready", clean_line)
+            if browser_ready_match:
+                ep_num = int(browser_ready_match.group(1))
+                if ep_num in active_episodes:
+                    write_to_episode_log(episode_log_files, ep_num, clean_line)
+                    await db.update_episode(
+                        active_episodes[ep_num]["id"],
+                        status=EpisodeStatus.GET_STREAM.value,
+                        stage_data={}
+                    )
+
             # Pattern: "Episode X: Starting download..." - explicit episode download start
             episode_download_start = re.search(r"Episode\s+(\d+):\s+Starting download", clean_line, re.IGNORECASE)
             if episode_download_start:
@@ -191,6 +297,14 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
                     last_episode_searching = None
                 continue
 
+            # Pattern: "Episode X: Page loaded in Ns, play clicked (selector) Ns later" - player started
+            player_started_match = re.search(r"Episode\s+(\d+):\s+Page loaded in .+play clicked", clean_line)
+            if player_started_match:
+                ep_num = int(player_started_match.group(1))
+                if ep_num in active_episodes:
+                    write_to_episode_log(episode_log_files, ep_num, clean_line)
+                    await db.update_episode(active_episodes[ep_num]["id"], progress_percent=15)
+
             # Pattern: Clicked play button (stream found)
             if last_episode_searching is not None and re.search(r"Clicked play button:|Found MASTER m3u8:", clean_line):
                 ep_num = last_episode_searching
@@ -203,9 +317,22 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
                         stage_data={}
                     )
 
-            # Pattern: YT-DLP download progress
+            # Pattern: segments queued on the aria2 daemon
+            # [HLS] Queued 300 of 300 segments on aria2 (/downloads/.../s01e06 - Title.mp4.aria2-frags)
+            aria2_queued_match = re.search(r"Queued\s+\d+\s+of\s+(\d+)\s+segments\s+on\s+aria2\s+\((.+)\)", clean_line)
+            if aria2_queued_match:
+                ep_match = re.search(r"s\d+e(\d+)", aria2_queued_match.group(2), re.IGNORECASE)
+                if ep_match and int(ep_match.group(1)) in active_episodes:
+                    ep_num = int(ep_match.group(1))
+                    aria2_dirs[aria2_queued_match.group(2)] = {
+                        "episode": ep_num,
+                        "total": int(aria2_queued_match.group(1)),
+                    }
+                    write_to_episode_log(episode_log_files, ep_num, clean_line)
+
+            # Pattern: YT-DLP / native HLS engine download progress
             # [YT-DLP] Destination: /downloads/.../s01e06 - Title.mp4
-            yt_dlp_dest_match = re.search(r"\[YT-DLP\]\s+Destination:\s+(.+)", clean_line)
+            yt_dlp_dest_match = re.search(r"\[(?:YT-DLP|HLS)\]\s+Destination:\s+(.+)", clean_line)
             if yt_dlp_dest_match:
                 dest_path = yt_dlp_dest_match.group(1).strip()
                 # Extract episode number from filename pattern like "s01e06"
@@ -232,7 +359,7 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
             # Pattern: YT-DLP progress percentage with details
             # [YT-DLP]  45.2% of ~ 165.16MiB at 7.25MiB/s ETA 00:27 (frag 19/311)
             yt_dlp_progress_match = re.search(
-                r"\[YT-DLP\]\s+(\d+(?:\.\d+)?)\s*%\s+of\s+~?\s+([\d.]+\w+)\s+at\s+([\d.]+\w+/s)\s+ETA\s+([\d:]+)\s+\(frag\s+(\d+)/(\d+)\)",
+                r"\[(?:YT-DLP|HLS)\]\s+(\d+(?:\.\d+)?)\s*%\s+of\s+~?\s+([\d.]+\w+)\s+at\s+([\d.]+\w+/s)\s+ETA\s+([\d:]+)\s+\(frag\s+(\d+)/(\d+)\)",
                 clean_line
             )
             if yt_dlp_progress_match and last_ytdlp_episode is not None:
@@ -320,6 +447,8 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
                             del episode_log_files[ep_num]
                         del active_episodes[ep_num]
 
+        aria2_poller.cancel()
+
         # Wait for completion
         return_code = process.wait()
 
@@ -376,6 +505,9 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
             else:
                 # All episodes genuinely completed
                 await emit_progress(db, job_id, 100, JobStage.DONE.value, "All episodes downloaded")
+        elif return_code == INTERRUPTED_EXIT_CODE:
+            # Stopped by pause/cancel/restart; episodes keep their state for the next run
+            print("Stopped, partial downloads are kept for resuming", flush=True)
         else:
             print(f"PROGRESS: {json.dumps({'percent': 0, 'stage': 'failed', 'text': f'Exit code {return_code}'})}", flush=True)
 
@@ -390,6 +522,8 @@ async def run_with_progress(job_id: int, db_path: str, command: list):
         return return_code
 
     except Exception as e:
+        if aria2_poller:
+            aria2_poller.cancel()
         print(f"PROGRESS: {json.dumps({'percent': 0, 'stage': 'failed', 'text': str(e)})}", flush=True)
         # Mark all active episodes as failed
         for ep_num, episode_data in active_episodes.items():
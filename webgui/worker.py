@@ -19,11 +19,24 @@ from .database import Database, JobStatus, JobStage, STAGE_PROGRESS
 
 logger = logging.getLogger("webgui.worker")
 
+# jobs running at once; their browsers are limited host-wide by tools.browser_slots
+MAX_CONCURRENT_JOBS = int(os.environ.get("MAX_CONCURRENT_JOBS", 3))
+
 # Whitelist of allowed command-line arguments
 ALLOWED_ARGS = {
     '--ep-from', '--ep-to', '--season', '--download-type',
     '--server', '--no-subtitles', '--aria', '--quality',
-    '--sub-lang', '--dub-lang', '--format'
+    '--sub-lang', '--dub-lang', '--format', '--capture-backend', '--resolver',
+    '--stream-cache-ttl', '--http-timeout', '--http-retries', '--http2',
+    '--max-bitrate', '--engine', '--hls-concurrency',
+    '--aria-connections', '--aria-split', '--aria-min-split-size', '--aria-rpc',
+    '--ytdlp-profile', '--fragment-concurrency', '--rate-limit', '--buffer-size',
+    '--http-chunk-size', '--resolve-workers', '--download-workers',
+    '--skip-existing', '--no-skip-existing', '--episode-retries', '--retry-backoff',
+    '--episode-deadline', '--retry-budget', '--adaptive-pacing', '--no-adaptive-pacing',
+    '--max-request-rate', '--browser-slots', '--capture-deadline', '--subtitle-grace',
+    '--capture-idle-refresh', '--block-requests', '--no-block-requests', '--block-types',
+    '--block-patterns', '--resolve-mode'
 }
 
 
@@ -89,7 +102,11 @@ class JobWorker:
         return validated
 
     async def cleanup_orphaned_jobs(self):
-        """Clean up jobs that were left in 'running' state from previous crashes."""
+        """Re-queue jobs that were left in 'running' state by a restart or crash.
+
+        Their finished episodes are skipped and interrupted downloads continue from their
+        checkpoints when the job runs again.
+        """
         try:
             # Get all jobs that are marked as running
             jobs = await self.db.get_active_jobs()
@@ -97,17 +114,13 @@ class JobWorker:
 
             for job in jobs:
                 if job["status"] == JobStatus.RUNNING.value:
-                    # Mark as failed since no process is actually running for it
-                    await self.db.finish_job(
-                        job["id"],
-                        False,
-                        "Job was interrupted by worker restart/crash"
-                    )
+                    # No process is running for it anymore, run it again
+                    await self.db.requeue_job(job["id"], "Resuming after worker restart")
                     orphaned_count += 1
-                    logger.warning(f"Cleaned up orphaned job {job['id']}")
+                    logger.warning(f"Re-queued orphaned job {job['id']}")
 
             if orphaned_count > 0:
-                logger.info(f"Cleaned up {orphaned_count} orphaned job(s)")
+                logger.info(f"Re-queued {orphaned_count} orphaned job(s)")
 
         except Exception as e:
             logger.error(f"Error cleaning up orphaned jobs: {e}", exc_info=True)
@@ -141,7 +154,7 @@ class JobWorker:
 
         # Start queued jobs
         for job in jobs:
-            if job["status"] == JobStatus.QUEUED.value and len(self.active_processes) < 3:
+            if job["status"] == JobStatus.QUEUED.value and len(self.active_processes) < MAX_CONCURRENT_JOBS:
                 # Try to atomically claim this job (prevents race conditions)
                 if await self.db.claim_job(job["id"]):
                     # Successfully claimed, execute it
@@ -213,7 +226,8 @@ class JobWorker:
             # Ensure log directory exists
             log_file.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(log_file, "w") as f:
+            # Appended to, so a resumed job keeps the log of its earlier runs
+            with open(log_file, "a") as f:
                 f.write(f"Job {job_id} started at {datetime.utcnow().isoformat()}\n")
                 f.write(f"Command: {' '.join(process.args)}\n")
                 f.write("-" * 80 + "\n")
@@ -240,6 +254,12 @@ class JobWorker:
             if job_id in self.active_processes:
                 del self.active_processes[job_id]
 
+            # Paused and canceled jobs were stopped on purpose and already have their status
+            job = await self.db.get_job(job_id)
+            if job and job["status"] in (JobStatus.PAUSED.value, JobStatus.CANCELED.value):
+                logger.info(f"Job {job_id} stopped ({job['status']})")
+                return
+
             # Update job status
             if return_code == 0:
                 await self.db.finish_job(job_id, True)
@@ -289,39 +309,67 @@ class JobWorker:
     async def cancel_job(self, job_id: int) -> bool:
         """Cancel a running job."""
         if job_id not in self.active_processes:
-            # Check if job is queued
+            # Check if job is queued or paused
             job = await self.db.get_job(job_id)
-            if job and job["status"] == JobStatus.QUEUED.value:
+            if job and job["status"] in (JobStatus.QUEUED.value, JobStatus.PAUSED.value):
                 await self.db.cancel_job(job_id)
                 return True
             return False
 
-        process = self.active_processes[job_id]
-
         try:
-            # Try graceful termination first
-            process.terminate()
-
-            # Wait up to 5 seconds
-            try:
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                # Force kill
-                process.kill()
-                process.wait()
-
-            logger.info(f"Job {job_id} canceled")
             await self.db.cancel_job(job_id)
+            await self._stop_process(job_id)
+            logger.info(f"Job {job_id} canceled")
+            return True
 
-            if job_id in self.active_processes:
-                del self.active_processes[job_id]
+        except Exception as e:
+            logger.error(f"Error canceling job {job_id}: {e}", exc_info=True)
+            return False
 
+    async def pause_job(self, job_id: int) -> bool:
+        """Stop a running job, keeping its partial downloads and checkpoints for :meth:`resume_job`."""
+        if job_id not in self.active_processes:
+            # A queued job is paused before it starts
+            job = await self.db.get_job(job_id)
+            if job and job["status"] == JobStatus.QUEUED.value:
+                await self.db.pause_job(job_id)
+                return True
+            return False
+
+        try:
+            await self.db.pause_job(job_id)
+            await self._stop_process(job_id)
+            logger.info(f"Job {job_id} paused")
             return True
 
         except Exception as e:
-            logger.error(f"Error canceling job {job_id}: {e}", exc_info=True)
+            logger.error(f"Error pausing job {job_id}: {e}", exc_info=True)
             return False
 
+    async def resume_job(self, job_id: int) -> bool:
+        """Queue a paused job again; it continues from the episodes and fragments already on disk."""
+        job = await self.db.get_job(job_id)
+        if not job or job["status"] != JobStatus.PAUSED.value:
+            return False
+        await self.db.requeue_job(job_id, "Resuming")
+        logger.info(f"Job {job_id} resumed")
+        return True
+
+    async def _stop_process(self, job_id: int, timeout: float = 15):
+        """Terminate a job's process; SIGTERM lets the downloader save its checkpoints first."""
+        process = self.active_processes.pop(job_id, None)
+        if process is None:
+            return
+
+        # Try graceful termination first
+        process.terminate()
+        try:
+            await asyncio.to_thread(process.wait, timeout)
+        except subprocess.TimeoutExpired:
+            # Force kill
+            process.kill()
+            await asyncio.to_thread(process.wait)
+
     async def rotate_logs(self, max_files: int = 100):
         """Rotate old log files to prevent unlimited growth."""
         try: